@@ -0,0 +1,5 @@
+import sys
+
+from neo_data_pipeline.cli import main
+
+sys.exit(main())
@@ -0,0 +1,213 @@
+import heapq
+import json
+from collections import Counter
+from datetime import date
+from itertools import count
+
+from neo_data_pipeline.writer import atomic_output
+
+
+class StreamingAggregator:
+    """
+    Summarizes processed records in a single pass, with constant memory.
+
+    Records flow through `wrap` on their way to the writer, so the summary is
+    computed while the output is written instead of reading the output back.
+    Category counts, the hazardous count and the velocity range are running
+    accumulators, and the closest approaches are kept in a bounded heap of
+    `top_n` records. The same accumulators are also kept per window of
+    `window_days` approach days, counted from 1970-01-01 so that the windows
+    of separate runs line up.
+
+    Records read back from an output file are accepted too: numeric fields given
+    as strings are parsed, and the hazardous flag may be the string "True".
+
+    Attributes:
+        top_n (int): The number of closest approaches kept.
+        window_days (int): The number of approach days summarized together in each window.
+        rows (int): The number of records seen.
+        hazardous (int): The number of potentially hazardous records seen.
+        diameter_categories (Counter): The number of records of each diameter category.
+        proximity_categories (Counter): The number of records of each proximity category.
+        min_speed (float): The lowest velocity seen in m/s, or None.
+        max_speed (float): The highest velocity seen in m/s, or None.
+        windows (dict): The rows, hazardous count and velocity range of each window, keyed by the ordinal of
+            its first date.
+    """
+
+    CLOSEST_FIELDS = (
+        "Id",
+        "Nome",
+        "Data de Aproximação",
+        "Distância da Terra (km)",
+        "Velocidade (m/s)",
+        "Potencialmente Perigoso",
+    )
+
+    EPOCH = date(1970, 1, 1)
+
+    def __init__(self, top_n=10, window_days=7):
+        """
+        Initialize the StreamingAggregator.
+
+        Args:
+            top_n (int, optional): The number of closest approaches kept. Defaults to 10.
+            window_days (int, optional): The number of approach days summarized together in each window.
+                Defaults to 7, the span of a feed request.
+        """
+        self.top_n = top_n
+        self.window_days = window_days
+        self.rows = 0
+        self.hazardous = 0
+        self.diameter_categories = Counter()
+        self.proximity_categories = Counter()
+        self.min_speed = None
+        self.max_speed = None
+        self.windows = {}
+        # A max-heap on distance, through negated keys, of the closest approaches so far.
+        self._closest = []
+        self._sequence = count()
+
+    def add(self, record):
+        """
+        Adds a record to the summary.
+
+        Args:
+            record (NeoRecord or dict): The processed NEO information.
+        """
+        self.rows += 1
+        hazardous = self._flag(record.get("Potencialmente Perigoso"))
+        if hazardous:
+            self.hazardous += 1
+        self.diameter_categories[record.get("Categoria Diâmetro") or None] += 1
+        self.proximity_categories[record.get("Categoria Proximidade") or None] += 1
+        speed = self._number(record.get("Velocidade (m/s)"))
+        if speed is not None:
+            if self.min_speed is None or speed < self.min_speed:
+                self.min_speed = speed
+            if self.max_speed is None or speed > self.max_speed:
+                self.max_speed = speed
+        window = self._window(record.get("Data de Aproximação"))
+        if window is not None:
+            stats = self.windows.get(window)
+            if stats is None:
+                stats = self.windows[window] = {
+                    "rows": 0,
+                    "hazardous": 0,
+                    "min_speed": None,
+                    "max_speed": None,
+                }
+            stats["rows"] += 1
+            stats["hazardous"] += hazardous
+            if speed is not None:
+                if stats["min_speed"] is None or speed < stats["min_speed"]:
+                    stats["min_speed"] = speed
+                if stats["max_speed"] is None or speed > stats["max_speed"]:
+                    stats["max_speed"] = speed
+        distance = self._number(record.get("Distância da Terra (km)"))
+        if distance is not None and self.top_n > 0:
+            # The sequence number breaks ties, so records themselves are never compared.
+            key = (-distance, -next(self._sequence))
+            if len(self._closest) < self.top_n or key > self._closest[0][:2]:
+                closest = {field: record.get(field) for field in self.CLOSEST_FIELDS}
+                closest["Distância da Terra (km)"] = distance
+                closest["Velocidade (m/s)"] = speed
+                closest["Potencialmente Perigoso"] = hazardous
+                if len(self._closest) < self.top_n:
+                    heapq.heappush(self._closest, key + (closest,))
+                else:
+                    heapq.heapreplace(self._closest, key + (closest,))
+
+    def update(self, records):
+        """
+        Adds records to the summary.
+
+        Args:
+            records (iterable): The processed NEO information, or the rows of an output file.
+        """
+        for record in records:
+            self.add(record)
+
+    @staticmethod
+    def _number(value):
+        if value is None or value == "":
+            return None
+        return float(value)
+
+    @staticmethod
+    def _flag(value):
+        return value if isinstance(value, bool) else value == "True"
+
+    def _window(self, approach_date):
+        if approach_date is None or approach_date == "":
+            return None
+        if not isinstance(approach_date, date):
+            approach_date = date.fromisoformat(str(approach_date)[:10])
+        offset = (approach_date - self.EPOCH).days % self.window_days
+        return approach_date.toordinal() - offset
+
+    def wrap(self, records):
+        """
+        Adds records to the summary as they are consumed.
+
+        Args:
+            records (iterable): The processed NEO information.
+
+        Yields:
+            The records, unchanged.
+        """
+        for record in records:
+            self.add(record)
+            yield record
+
+    def closest(self):
+        """
+        Returns the closest approaches seen.
+
+        Returns:
+            list of dict: The CLOSEST_FIELDS of the `top_n` closest records, closest first. Ties keep feed order.
+        """
+        return [record for _, _, record in sorted(self._closest, reverse=True)]
+
+    def summary(self):
+        """
+        Returns the summary of the records seen.
+
+        Returns:
+            dict: The number of rows, the counts per diameter and proximity category, the hazardous count and
+                share, the velocity range, the closest approaches, and the rows, hazardous count and share and
+                velocity range of each window, in date order.
+        """
+        return {
+            "rows": self.rows,
+            "diameter_categories": dict(self.diameter_categories),
+            "proximity_categories": dict(self.proximity_categories),
+            "hazardous": self.hazardous,
+            "hazardous_share": self.hazardous / self.rows if self.rows else None,
+            "min_speed": self.min_speed,
+            "max_speed": self.max_speed,
+            "closest": self.closest(),
+            "windows": [
+                {
+                    "start": date.fromordinal(start).isoformat(),
+                    "end": date.fromordinal(start + self.window_days - 1).isoformat(),
+                    "rows": stats["rows"],
+                    "hazardous": stats["hazardous"],
+                    "hazardous_share": stats["hazardous"] / stats["rows"],
+                    "min_speed": stats["min_speed"],
+                    "max_speed": stats["max_speed"],
+                }
+                for start, stats in sorted(self.windows.items())
+            ],
+        }
+
+    def save(self, path):
+        """
+        Atomically writes the summary as JSON.
+
+        Args:
+            path (str): The path of the summary file.
+        """
+        with atomic_output(path) as temp_path:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(self.summary(), f, indent=2, ensure_ascii=False)
@@ -1,6 +1,17 @@
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from itertools import islice
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from neo_data_pipeline.feed_parser import iter_feed
+from neo_data_pipeline.manifest import RunManifest
+from neo_data_pipeline.rate_limiter import RateLimiter, RetryPolicy
 
 
 class NasaNeoApiClient:
@@ -12,18 +23,281 @@ class NasaNeoApiClient:
 
     Attributes:
         api_key (str): The API key for accessing NASA's NEO API.
+        orbit_cache (OrbitCache): An optional persistent cache of orbit class types.
+        timeout (float or tuple): The connect and read timeouts, in seconds, of every request.
+        base_url (str): The root URL of the API.
+        rate_limiter (RateLimiter): The token bucket throttling every request.
+        retry_policy (RetryPolicy): The policy deciding which failed requests are retried.
+        snapshot_store (SnapshotStore): An optional store recording every raw response.
+        session (requests.Session): The pooled keep-alive session used for every request.
+        requests_sent (int): The number of HTTP requests sent, including retries.
+        bytes_downloaded (int): The total size of the response bodies received.
+        orbit_index (dict): The orbit class types prefetched from the browse endpoint, keyed by NEO id.
+        http_cache (HttpCache): An optional cache of response bodies revalidated with conditional requests.
+        concurrency_limiter (AdaptiveConcurrencyLimiter): An optional adaptive limit on the orbit lookup
+            requests in flight.
     """
 
     BASE_URL = "https://api.nasa.gov/neo/rest/v1"
+    FEED_WINDOW_DAYS = 7
+    BROWSE_PAGE_SIZE = 20
 
-    def __init__(self, api_key):
+    def __init__(
+        self,
+        api_key,
+        orbit_cache=None,
+        pool_size=10,
+        timeout=(5, 30),
+        base_url=None,
+        rate_limiter=None,
+        retry_policy=None,
+        snapshot_store=None,
+        http_cache=None,
+        concurrency_limiter=None,
+    ):
         """
         Initialize the NasaNeoApiClient.
 
         Args:
             api_key (str): The API key for accessing NASA's NEO API.
+            orbit_cache (OrbitCache, optional): A cache consulted before requesting orbit types. Defaults to None.
+            pool_size (int, optional): The number of connections kept alive for reuse. It should match the number
+                of concurrent workers issuing requests. Defaults to 10.
+            timeout (float or tuple, optional): The connect and read timeouts, in seconds. Defaults to (5, 30).
+            base_url (str, optional): The root URL of the API. Defaults to BASE_URL.
+            rate_limiter (RateLimiter, optional): A token bucket, possibly shared with other clients.
+                Defaults to a new RateLimiter sized for NASA's hourly quota.
+            retry_policy (RetryPolicy, optional): The policy deciding which failed requests are retried.
+                Defaults to a new RetryPolicy.
+            snapshot_store (SnapshotStore, optional): A store recording every raw feed and NEO response for
+                offline replay. Defaults to None.
+            http_cache (HttpCache, optional): A cache of response bodies, reused while fresh and revalidated
+                with conditional requests once stale. Streamed feeds are not cached. Defaults to None.
+            concurrency_limiter (AdaptiveConcurrencyLimiter, optional): An adaptive limit on the orbit lookup
+                requests in flight. Only requests actually sent take a slot, so lookups answered by the orbit
+                index or a cache neither wait for the limiter nor skew its latency samples. Defaults to None.
         """
         self.api_key = api_key
+        self.base_url = base_url or self.BASE_URL
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.snapshot_store = snapshot_store
+        self.http_cache = http_cache
+        self.concurrency_limiter = concurrency_limiter
+        self.orbit_cache = orbit_cache
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.requests_sent = 0
+        self.bytes_downloaded = 0
+        self.orbit_index = {}
+        self._stats_lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Closes the pooled connections of the client.
+        """
+        self.session.close()
+
+    def _get(self, url, params, stream=False, headers=None, limited=False):
+        """
+        Sends a rate-limited GET request, retrying transient failures.
+
+        Connection errors, timeouts, HTTP 429 and 5xx responses are retried with
+        jittered exponential backoff. A Retry-After header pauses every request
+        sharing the rate limiter for the requested time instead. A limited request
+        also holds a slot of the concurrency limiter, and reports its duration and
+        whether it was retried or failed on a transient error.
+
+        Args:
+            url (str): The URL to request.
+            params (dict): The query string parameters.
+            stream (bool, optional): Whether the body of the successful response is left to be
+                downloaded by the caller. Defaults to False.
+            headers (dict, optional): Additional request headers. Defaults to None.
+            limited (bool, optional): Whether the request goes through the concurrency limiter, if any.
+                Defaults to False.
+
+        Returns:
+            requests.Response: The successful response.
+
+        Raises:
+            requests.exceptions.HTTPError: If the response status is unsuccessful and not retried.
+            requests.exceptions.RequestException: For other request-related issues.
+        """
+        limiter = self.concurrency_limiter if limited else None
+        if limiter is None:
+            return self._send(url, params, stream, headers)
+        ticket = limiter.acquire()
+        start = time.perf_counter()
+        outcome = {"pushback": True}
+        try:
+            return self._send(url, params, stream, headers, outcome)
+        finally:
+            limiter.release(ticket, time.perf_counter() - start, outcome["pushback"])
+
+    def _send(self, url, params, stream, headers, outcome=None):
+        """
+        Sends a GET request like `_get`, recording in outcome whether the API pushed back.
+
+        Args:
+            url (str): The URL to request.
+            params (dict): The query string parameters.
+            stream (bool): Whether the body of the successful response is left to be downloaded by the caller.
+            headers (dict): Additional request headers, or None.
+            outcome (dict, optional): Its "pushback" key is set to False when the request succeeded, or failed
+                on a non-transient error, without any retry. Defaults to None.
+
+        Returns:
+            requests.Response: The successful response.
+
+        Raises:
+            requests.exceptions.HTTPError: If the response status is unsuccessful and not retried.
+            requests.exceptions.RequestException: For other request-related issues.
+        """
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire()
+            try:
+                response = self.session.get(
+                    url,
+                    params=params,
+                    timeout=self.timeout,
+                    stream=stream,
+                    headers=headers,
+                )
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                self._record_response(0)
+                if not self.retry_policy.should_retry(None, attempt):
+                    raise
+                delay = self.retry_policy.backoff(attempt)
+            else:
+                self._record_response(0 if stream else len(response.content))
+                self.rate_limiter.update_from_headers(response.headers)
+                if not self.retry_policy.should_retry(response.status_code, attempt):
+                    if outcome is not None:
+                        outcome["pushback"] = attempt > 0 or (
+                            response.status_code == 429 or response.status_code >= 500
+                        )
+                    response.raise_for_status()
+                    return response
+                response.close()
+                delay = self.retry_policy.parse_retry_after(
+                    response.headers.get("Retry-After")
+                )
+                if delay is None:
+                    delay = self.retry_policy.backoff(attempt)
+                else:
+                    self.rate_limiter.pause(delay)
+            self.rate_limiter.record_retry()
+            time.sleep(delay)
+            attempt += 1
+
+    def _get_json(self, url, params, limited=False):
+        """
+        Sends a GET request through the HTTP cache and decodes its JSON body.
+
+        Without an HTTP cache, this is a plain request. Otherwise a fresh cached body is
+        returned without any request, and a stale one is revalidated with a conditional
+        request and reused if the API answers 304 Not Modified.
+
+        Args:
+            url (str): The URL to request.
+            params (dict): The query string parameters.
+            limited (bool, optional): Whether the request goes through the concurrency limiter, if any.
+                Defaults to False.
+
+        Returns:
+            The decoded JSON body.
+
+        Raises:
+            requests.exceptions.HTTPError: If the response status is unsuccessful and not retried.
+            requests.exceptions.RequestException: For other request-related issues.
+        """
+        if self.http_cache is None:
+            return self._get(url, params, limited=limited).json()
+        key = self.http_cache.key(url, params)
+        cached = self.http_cache.get(key)
+        if cached is not None and cached.fresh:
+            return json.loads(cached.body)
+        response = self._get(
+            url,
+            params,
+            headers=self.http_cache.conditional_headers(cached) or None,
+            limited=limited,
+        )
+        if response.status_code == 304 and cached is not None:
+            self.http_cache.revalidate(key, cached)
+            return json.loads(cached.body)
+        self.http_cache.put(
+            key,
+            response.content,
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+        )
+        return response.json()
+
+    def _record_response(self, size):
+        with self._stats_lock:
+            self.requests_sent += 1
+            self.bytes_downloaded += size
+
+    def _iter_body(self, response, chunk_size):
+        with response:
+            for chunk in response.iter_content(chunk_size):
+                with self._stats_lock:
+                    self.bytes_downloaded += len(chunk)
+                yield chunk
+
+    @staticmethod
+    def extract_orbit_type(payload):
+        """
+        Extracts the orbit class type from the response of the NEO lookup endpoint.
+
+        Args:
+            payload (dict): The decoded response of the /neo/{id} endpoint.
+
+        Returns:
+            str, None: The orbit class type of the NEO, or None if not available.
+        """
+        return (
+            payload.get("orbital_data", {})
+            .get("orbit_class", {})
+            .get("orbit_class_type")
+        )
+
+    @staticmethod
+    def record_orbit_type(snapshot_store, neo_id, orbit_type):
+        """
+        Records an orbit type resolved without a lookup request, so a replay finds it.
+
+        Orbit types answered by the orbit index or the orbit cache have no response of
+        their own, so a minimal lookup response carrying the orbit type is recorded in
+        its place. NEOs whose lookup response is already recorded are left untouched.
+
+        Args:
+            snapshot_store (SnapshotStore): The store recording the run, or None.
+            neo_id (str): The ID of the near earth object.
+            orbit_type (str): The orbit class type of the NEO.
+        """
+        key = f"neo/{neo_id}"
+        if snapshot_store is None or key in snapshot_store:
+            return
+        snapshot_store.put(
+            key,
+            {
+                "id": str(neo_id),
+                "orbital_data": {"orbit_class": {"orbit_class_type": orbit_type}},
+            },
+        )
 
     @staticmethod
     def validate_dates(start_date, end_date):
@@ -48,6 +322,34 @@ class NasaNeoApiClient:
             )
         return start_date, end_date
 
+    @classmethod
+    def split_date_range(cls, start_date, end_date):
+        """
+        Splits a date range into consecutive windows accepted by the feed endpoint.
+
+        Args:
+            start_date (str): The start date in YYYY-MM-DD format.
+            end_date (str): The end date in YYYY-MM-DD format.
+
+        Returns:
+            list of tuple: The (start_date, end_date) pairs of each window, in chronological order.
+
+        Raises:
+            ValueError: If end_date is before start_date.
+        """
+        start = datetime.strptime(start_date, "%Y-%m-%d")
+        end = datetime.strptime(end_date, "%Y-%m-%d")
+        if end < start:
+            raise ValueError("The end_date must not be before the start_date.")
+        windows = []
+        while start <= end:
+            window_end = min(start + timedelta(days=cls.FEED_WINDOW_DAYS - 1), end)
+            windows.append(
+                (start.strftime("%Y-%m-%d"), window_end.strftime("%Y-%m-%d"))
+            )
+            start = window_end + timedelta(days=1)
+        return windows
+
     def fetch_neo_data(self, start_date, end_date):
         """
         Fetches data about near earth objects from NASA's NEO API.
@@ -64,20 +366,263 @@ class NasaNeoApiClient:
             requests.exceptions.RequestException: For other request-related issues.
         """
         self.validate_dates(start_date, end_date)
-        url = f"{self.BASE_URL}/feed"
+        url = f"{self.base_url}/feed"
+        params = {
+            "start_date": start_date,
+            "end_date": end_date,
+            "api_key": self.api_key,
+        }
+        neo_data = self._get_json(url, params).get("near_earth_objects")
+        if self.snapshot_store is not None:
+            for date, neos in (neo_data or {}).items():
+                self.snapshot_store.put(f"feed/{date}", neos)
+        return neo_data
+
+    def fetch_neo_data_range(self, start_date, end_date, max_workers=4):
+        """
+        Fetches near earth object data for an arbitrary date range.
+
+        The range is split into 7-day windows which are fetched concurrently
+        and merged into a single dictionary.
+
+        Args:
+            start_date (str): The start date in YYYY-MM-DD format.
+            end_date (str): The end date in YYYY-MM-DD format.
+            max_workers (int, optional): The maximum number of windows fetched at once. Defaults to 4.
+
+        Returns:
+            dict: A dictionary containing data about near earth objects, keyed by date.
+
+        Raises:
+            ValueError: If end_date is before start_date.
+            requests.exceptions.HTTPError: If any HTTP request returned an unsuccessful status code.
+            requests.exceptions.RequestException: For other request-related issues.
+        """
+        windows = self.split_date_range(start_date, end_date)
+        neo_data = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for window_data in executor.map(
+                lambda window: self.fetch_neo_data(*window), windows
+            ):
+                neo_data.update(window_data or {})
+        return neo_data
+
+    def stream_neo_data(self, start_date, end_date, chunk_size=65536):
+        """
+        Streams data about near earth objects from NASA's NEO API.
+
+        The response body is parsed incrementally as it is downloaded, so each NEO is
+        yielded as soon as it is received instead of once the whole response is decoded.
+
+        Args:
+            start_date (str): The start date in YYYY-MM-DD format.
+            end_date (str): The end date in YYYY-MM-DD format.
+            chunk_size (int, optional): The number of bytes read from the connection at once.
+                Defaults to 65536.
+
+        Yields:
+            tuple: The date and data of each NEO, in feed order.
+
+        Raises:
+            ValueError: If the dates are more than 7 days apart or the response is malformed.
+            requests.exceptions.HTTPError: If the HTTP request returned an unsuccessful status code.
+            requests.exceptions.RequestException: For other request-related issues.
+        """
+        self.validate_dates(start_date, end_date)
+        url = f"{self.base_url}/feed"
         params = {
             "start_date": start_date,
             "end_date": end_date,
             "api_key": self.api_key,
         }
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        return response.json().get("near_earth_objects")
+        response = self._get(url, params, stream=True)
+        recorded_date, recorded, recorded_dates = None, [], set()
+        for date, neo in iter_feed(self._iter_body(response, chunk_size)):
+            if self.snapshot_store is not None:
+                if date != recorded_date:
+                    if recorded_date is not None:
+                        self.snapshot_store.put(f"feed/{recorded_date}", recorded)
+                    recorded_date, recorded = date, []
+                    recorded_dates.add(date)
+                recorded.append(neo)
+            yield date, neo
+        if self.snapshot_store is not None:
+            if recorded_date is not None:
+                self.snapshot_store.put(f"feed/{recorded_date}", recorded)
+            # Dates without any NEO yield nothing, so they are recorded empty here.
+            for date in RunManifest.date_range(start_date, end_date):
+                if date not in recorded_dates:
+                    self.snapshot_store.put(f"feed/{date}", [])
+
+    def stream_neo_data_range(self, start_date, end_date, chunk_size=65536):
+        """
+        Streams near earth object data for an arbitrary date range.
+
+        The range is split into 7-day windows which are streamed one after the other.
+
+        Args:
+            start_date (str): The start date in YYYY-MM-DD format.
+            end_date (str): The end date in YYYY-MM-DD format.
+            chunk_size (int, optional): The number of bytes read from the connection at once.
+                Defaults to 65536.
+
+        Yields:
+            tuple: The date and data of each NEO, in feed order.
+
+        Raises:
+            ValueError: If end_date is before start_date or a response is malformed.
+            requests.exceptions.HTTPError: If any HTTP request returned an unsuccessful status code.
+            requests.exceptions.RequestException: For other request-related issues.
+        """
+        for window_start, window_end in self.split_date_range(start_date, end_date):
+            yield from self.stream_neo_data(window_start, window_end, chunk_size)
+
+    def fetch_browse_page(self, page, size=BROWSE_PAGE_SIZE):
+        """
+        Fetches a page of the NEO catalog from the browse endpoint.
+
+        Args:
+            page (int): The zero-based page number.
+            size (int, optional): The number of NEOs per page. Defaults to BROWSE_PAGE_SIZE, the API's maximum.
+
+        Returns:
+            dict: The decoded page, with its NEOs under "near_earth_objects" and the pagination under "page".
+
+        Raises:
+            requests.exceptions.HTTPError: If the HTTP request returned an unsuccessful status code.
+            requests.exceptions.RequestException: For other request-related issues.
+        """
+        url = f"{self.base_url}/neo/browse"
+        params = {
+            "page": page,
+            "size": size,
+            "api_key": self.api_key,
+        }
+        return self._get_json(url, params)
+
+    def _index_browse_page(self, payload):
+        index = {}
+        for neo in payload.get("near_earth_objects") or []:
+            if self.snapshot_store is not None:
+                self.snapshot_store.put(f"neo/{neo['id']}", neo)
+            index[str(neo["id"])] = self.extract_orbit_type(neo)
+        return index
+
+    def iter_browse_pages(self, max_pages=None, max_workers=4):
+        """
+        Walks the pages of the browse endpoint.
+
+        The first page is fetched to learn the number of pages, and the others are
+        fetched concurrently, at most twice max_workers ahead of the consumer. Pages
+        not started yet are cancelled when the consumer stops early.
+
+        Args:
+            max_pages (int, optional): The maximum number of pages fetched. Defaults to None, which walks
+                the whole catalog.
+            max_workers (int, optional): The maximum number of pages fetched at once. Defaults to 4.
+
+        Yields:
+            dict: The decoded pages, in page order.
+
+        Raises:
+            requests.exceptions.HTTPError: If any HTTP request returned an unsuccessful status code.
+            requests.exceptions.RequestException: For other request-related issues.
+        """
+        first_page = self.fetch_browse_page(0)
+        total_pages = first_page.get("page", {}).get("total_pages", 1)
+        if max_pages is not None:
+            total_pages = min(total_pages, max_pages)
+        yield first_page
+        pages = iter(range(1, total_pages))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = deque(
+                executor.submit(self.fetch_browse_page, page)
+                for page in islice(pages, max_workers * 2)
+            )
+            try:
+                while pending:
+                    payload = pending.popleft().result()
+                    page = next(pages, None)
+                    if page is not None:
+                        pending.append(executor.submit(self.fetch_browse_page, page))
+                    yield payload
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def prefetch_orbit_types(self, max_pages=None, max_workers=4, neo_ids=None):
+        """
+        Builds or refreshes the orbit index by walking the pages of the browse endpoint.
+
+        Each page carries the orbital data of many NEOs, so the orbit types of a whole
+        feed are resolved with a few large requests instead of one request per NEO.
+        The orbit cache, when configured, is updated as well.
+
+        Args:
+            max_pages (int, optional): The maximum number of pages fetched. Defaults to None, which walks
+                the whole catalog.
+            max_workers (int, optional): The maximum number of pages fetched at once. Defaults to 4.
+            neo_ids (iterable of str, optional): The IDs of the NEOs looked for. When given, the walk stops
+                as soon as every one of them is indexed. Defaults to None, which walks max_pages pages.
+
+        Returns:
+            int: The number of NEOs indexed.
+
+        Raises:
+            requests.exceptions.HTTPError: If any HTTP request returned an unsuccessful status code.
+            requests.exceptions.RequestException: For other request-related issues.
+        """
+        index = {}
+        remaining = None if neo_ids is None else {str(neo_id) for neo_id in neo_ids}
+        pages = self.iter_browse_pages(max_pages, max_workers)
+        for payload in pages:
+            page_index = self._index_browse_page(payload)
+            index.update(page_index)
+            if remaining is not None:
+                remaining.difference_update(page_index)
+                if not remaining:
+                    pages.close()
+                    break
+        self.orbit_index.update(index)
+        if self.orbit_cache is not None:
+            self.orbit_cache.put_many(index.items())
+        return len(index)
+
+    def stream_browse_neos(self, max_pages=None, max_workers=4):
+        """
+        Streams the NEOs of the catalog from the browse endpoint, with their full approach history.
+
+        The orbit index and the orbit cache are filled from the same pages, so the
+        NEOs streamed need no orbit lookup.
+
+        Args:
+            max_pages (int, optional): The maximum number of pages fetched. Defaults to None, which walks
+                the whole catalog.
+            max_workers (int, optional): The maximum number of pages fetched at once. Defaults to 4.
+
+        Yields:
+            tuple: None, as catalog entries have no feed date, and the data of each NEO, in catalog order.
+
+        Raises:
+            requests.exceptions.HTTPError: If any HTTP request returned an unsuccessful status code.
+            requests.exceptions.RequestException: For other request-related issues.
+        """
+        for payload in self.iter_browse_pages(max_pages, max_workers):
+            index = self._index_browse_page(payload)
+            self.orbit_index.update(index)
+            if self.orbit_cache is not None:
+                self.orbit_cache.put_many(index.items())
+            for neo in payload.get("near_earth_objects") or []:
+                yield None, neo
 
     def fetch_neo_orbit_type(self, neo_id):
         """
         Fetches the orbit type of a specific NEO from NASA's API.
 
+        The orbit index built by `prefetch_orbit_types` is consulted first. When an
+        orbit cache is configured, it is consulted next and updated with the fetched
+        orbit type. When recording, the orbit type is recorded whatever its source.
+
         Args:
             neo_id (str): The ID of the near earth object.
 
@@ -88,15 +633,20 @@ class NasaNeoApiClient:
             requests.exceptions.HTTPError: If the HTTP request returned an unsuccessful status code.
             requests.exceptions.RequestException: For other request-related issues.
         """
-        url = f"{self.BASE_URL}/neo/{neo_id}"
+        orbit_type = self.orbit_index.get(str(neo_id))
+        if orbit_type is None and self.orbit_cache is not None:
+            orbit_type = self.orbit_cache.get(neo_id)
+        if orbit_type is not None:
+            self.record_orbit_type(self.snapshot_store, neo_id, orbit_type)
+            return orbit_type
+        url = f"{self.base_url}/neo/{neo_id}"
         params = {
             "api_key": self.api_key,
         }
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        return (
-            response.json()
-            .get("orbital_data", {})
-            .get("orbit_class", {})
-            .get("orbit_class_type")
-        )
+        payload = self._get_json(url, params, limited=True)
+        if self.snapshot_store is not None:
+            self.snapshot_store.put(f"neo/{neo_id}", payload)
+        orbit_type = self.extract_orbit_type(payload)
+        if self.orbit_cache is not None:
+            self.orbit_cache.put(neo_id, orbit_type)
+        return orbit_type
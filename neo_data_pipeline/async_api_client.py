@@ -0,0 +1,223 @@
+import asyncio
+import json
+
+import aiohttp
+
+from neo_data_pipeline.api_client import NasaNeoApiClient
+from neo_data_pipeline.rate_limiter import RateLimiter, RetryPolicy
+
+
+class AsyncNasaNeoApiClient:
+    """
+    Asynchronous client for NASA's Near Earth Object (NEO) API.
+
+    This is the asyncio counterpart of NasaNeoApiClient for orbit lookups. Its HTTP
+    session is opened when entering the client with `async with` and closed on exit,
+    so the same client can be reused across event loops. The orbit cache, HTTP cache
+    and snapshot store are synchronous, so they are accessed from worker threads
+    through `asyncio.to_thread` rather than blocking the event loop.
+
+    Attributes:
+        api_key (str): The API key for accessing NASA's NEO API.
+        orbit_cache (OrbitCache): An optional persistent cache of orbit class types.
+        max_connections (int): The maximum number of simultaneous connections.
+        timeout (float): The total timeout, in seconds, of every request.
+        base_url (str): The root URL of the API.
+        rate_limiter (RateLimiter): The token bucket throttling every request.
+        retry_policy (RetryPolicy): The policy deciding which failed requests are retried.
+        snapshot_store (SnapshotStore): An optional store recording every raw response.
+        requests_sent (int): The number of HTTP requests sent, including retries.
+        bytes_downloaded (int): The total size of the response bodies received.
+        orbit_index (dict): Orbit class types known in advance, keyed by NEO id, consulted before any request.
+        http_cache (HttpCache): An optional cache of response bodies revalidated with conditional requests.
+    """
+
+    BASE_URL = NasaNeoApiClient.BASE_URL
+
+    def __init__(
+        self,
+        api_key,
+        orbit_cache=None,
+        max_connections=100,
+        timeout=30,
+        base_url=None,
+        rate_limiter=None,
+        retry_policy=None,
+        snapshot_store=None,
+        http_cache=None,
+    ):
+        """
+        Initialize the AsyncNasaNeoApiClient.
+
+        Args:
+            api_key (str): The API key for accessing NASA's NEO API.
+            orbit_cache (OrbitCache, optional): A cache consulted before requesting orbit types. Defaults to None.
+            max_connections (int, optional): The maximum number of simultaneous connections. Defaults to 100.
+            timeout (float, optional): The total timeout, in seconds, of every request. Defaults to 30.
+            base_url (str, optional): The root URL of the API. Defaults to BASE_URL.
+            rate_limiter (RateLimiter, optional): A token bucket, possibly shared with other clients.
+                Defaults to a new RateLimiter sized for NASA's hourly quota.
+            retry_policy (RetryPolicy, optional): The policy deciding which failed requests are retried.
+                Defaults to a new RetryPolicy.
+            snapshot_store (SnapshotStore, optional): A store recording every raw NEO response for offline
+                replay. Defaults to None.
+            http_cache (HttpCache, optional): A cache of response bodies, served while fresh and revalidated
+                with conditional requests once stale. Defaults to None.
+        """
+        self.api_key = api_key
+        self.orbit_cache = orbit_cache
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.base_url = base_url or self.BASE_URL
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.snapshot_store = snapshot_store
+        self.requests_sent = 0
+        self.bytes_downloaded = 0
+        self.orbit_index = {}
+        self.http_cache = http_cache
+        self._session = None
+
+    async def __aenter__(self):
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.max_connections),
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """
+        Closes the HTTP session of the client.
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _get_json(self, url, params):
+        """
+        Sends a GET request through the HTTP cache and decodes its JSON body.
+
+        Without an HTTP cache, this is a plain request. Otherwise a fresh cached body is
+        returned without any request, and a stale one is revalidated with a conditional
+        request and reused if the API answers 304 Not Modified.
+
+        Args:
+            url (str): The URL to request.
+            params (dict): The query string parameters.
+
+        Returns:
+            dict: The decoded JSON body of the successful response.
+
+        Raises:
+            aiohttp.ClientResponseError: If the response status is unsuccessful and not retried.
+            aiohttp.ClientError: For other request-related issues.
+        """
+        if self.http_cache is None:
+            _, _, body = await self._get(url, params)
+            return json.loads(body)
+        key = self.http_cache.key(url, params)
+        cached = await asyncio.to_thread(self.http_cache.get, key)
+        if cached is not None and cached.fresh:
+            return json.loads(cached.body)
+        status, headers, body = await self._get(
+            url, params, self.http_cache.conditional_headers(cached) or None
+        )
+        if status == 304 and cached is not None:
+            await asyncio.to_thread(self.http_cache.revalidate, key, cached)
+            return json.loads(cached.body)
+        await asyncio.to_thread(
+            self.http_cache.put,
+            key,
+            body,
+            headers.get("ETag"),
+            headers.get("Last-Modified"),
+        )
+        return json.loads(body)
+
+    async def _get(self, url, params, headers=None):
+        """
+        Sends a rate-limited GET request, retrying transient failures.
+
+        Args:
+            url (str): The URL to request.
+            params (dict): The query string parameters.
+            headers (dict, optional): Additional request headers. Defaults to None.
+
+        Returns:
+            tuple: The status, headers and body of the successful response.
+
+        Raises:
+            aiohttp.ClientResponseError: If the response status is unsuccessful and not retried.
+            aiohttp.ClientError: For other request-related issues.
+        """
+        attempt = 0
+        while True:
+            wait = self.rate_limiter.reserve()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self.requests_sent += 1
+            try:
+                async with self._session.get(
+                    url, params=params, headers=headers
+                ) as response:
+                    body = await response.read()
+                    self.bytes_downloaded += len(body)
+                    self.rate_limiter.update_from_headers(response.headers)
+                    if not self.retry_policy.should_retry(response.status, attempt):
+                        response.raise_for_status()
+                        return response.status, response.headers, body
+                    delay = self.retry_policy.parse_retry_after(
+                        response.headers.get("Retry-After")
+                    )
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if not self.retry_policy.should_retry(None, attempt):
+                    raise
+                delay = None
+            if delay is None:
+                delay = self.retry_policy.backoff(attempt)
+            else:
+                self.rate_limiter.pause(delay)
+            self.rate_limiter.record_retry()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def fetch_neo_orbit_type(self, neo_id):
+        """
+        Fetches the orbit type of a specific NEO from NASA's API.
+
+        Args:
+            neo_id (str): The ID of the near earth object.
+
+        Returns:
+            str, None: The orbit class type of the NEO, or None if not available.
+
+        Raises:
+            aiohttp.ClientResponseError: If the HTTP request returned an unsuccessful status code.
+            aiohttp.ClientError: For other request-related issues.
+        """
+        orbit_type = self.orbit_index.get(str(neo_id))
+        if orbit_type is None and self.orbit_cache is not None:
+            orbit_type = await asyncio.to_thread(self.orbit_cache.get, neo_id)
+        if orbit_type is not None:
+            if self.snapshot_store is not None:
+                await asyncio.to_thread(
+                    NasaNeoApiClient.record_orbit_type,
+                    self.snapshot_store,
+                    neo_id,
+                    orbit_type,
+                )
+            return orbit_type
+        url = f"{self.base_url}/neo/{neo_id}"
+        params = {
+            "api_key": self.api_key,
+        }
+        payload = await self._get_json(url, params)
+        if self.snapshot_store is not None:
+            await asyncio.to_thread(self.snapshot_store.put, f"neo/{neo_id}", payload)
+        orbit_type = NasaNeoApiClient.extract_orbit_type(payload)
+        if self.orbit_cache is not None:
+            await asyncio.to_thread(self.orbit_cache.put, neo_id, orbit_type)
+        return orbit_type
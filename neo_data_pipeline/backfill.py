@@ -0,0 +1,311 @@
+import heapq
+import json
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+from neo_data_pipeline.dead_letters import DeadLetterFile
+from neo_data_pipeline.pipeline import DataPipeline
+from neo_data_pipeline.rate_limiter import SharedRateLimiter
+from neo_data_pipeline.writer import atomic_output
+
+_rate_limiter = None
+
+
+def _init_worker(rate_limiter):
+    global _rate_limiter
+    _rate_limiter = rate_limiter
+
+
+def _run_shard(api_key, shard_start, shard_end, part_filename, pipeline_options):
+    """
+    Runs the pipeline of one shard in a worker process.
+
+    Args:
+        api_key (str): The NASA API key.
+        shard_start (str): The start date of the shard in YYYY-MM-DD format.
+        shard_end (str): The end date of the shard in YYYY-MM-DD format.
+        part_filename (str): The part file the rows of the shard are written to, sorted for the merge.
+        pipeline_options (dict): The keyword arguments of the DataPipeline.
+
+    Returns:
+        dict: The metrics of the shard, as returned by PipelineMetrics.to_dict.
+
+    Raises:
+        RuntimeError: If the pipeline run failed.
+    """
+    with DataPipeline(
+        api_key, rate_limiter=_rate_limiter, **pipeline_options
+    ) as pipeline:
+        metrics = pipeline.run(shard_start, shard_end, part_filename)
+        if not metrics.counters.get("succeeded"):
+            raise RuntimeError(f"Shard {shard_start} to {shard_end} failed.")
+        ShardedBackfill.sort_part(pipeline.writer, part_filename)
+    return metrics.to_dict()
+
+
+class BackfillCheckpoint:
+    """
+    The record of the completed shards of a backfill, persisted as JSON.
+
+    Attributes:
+        path (str): The path of the checkpoint file.
+        shards (dict): The part filename of each completed shard, keyed by "start/end".
+    """
+
+    def __init__(self, path):
+        """
+        Initialize the BackfillCheckpoint, loading the file if it exists.
+
+        Args:
+            path (str): The path of the checkpoint file.
+        """
+        self.path = path
+        self.shards = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.shards = json.load(f).get("shards", {})
+
+    @staticmethod
+    def key(shard_start, shard_end):
+        """
+        Builds the checkpoint key of a shard.
+
+        Args:
+            shard_start (str): The start date of the shard in YYYY-MM-DD format.
+            shard_end (str): The end date of the shard in YYYY-MM-DD format.
+
+        Returns:
+            str: The key of the shard.
+        """
+        return f"{shard_start}/{shard_end}"
+
+    def is_done(self, shard_start, shard_end):
+        """
+        Checks whether a shard is completed and its part file still exists.
+
+        Args:
+            shard_start (str): The start date of the shard in YYYY-MM-DD format.
+            shard_end (str): The end date of the shard in YYYY-MM-DD format.
+
+        Returns:
+            bool: Whether the shard can be skipped.
+        """
+        part = self.shards.get(self.key(shard_start, shard_end))
+        return part is not None and os.path.exists(part)
+
+    def add(self, shard_start, shard_end, part_filename):
+        """
+        Marks a shard as completed and saves the checkpoint.
+
+        Args:
+            shard_start (str): The start date of the shard in YYYY-MM-DD format.
+            shard_end (str): The end date of the shard in YYYY-MM-DD format.
+            part_filename (str): The part file holding the rows of the shard.
+        """
+        self.shards[self.key(shard_start, shard_end)] = part_filename
+        with atomic_output(self.path) as temp_path:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({"shards": self.shards}, f, indent=2, sort_keys=True)
+
+
+class ShardedBackfill:
+    """
+    Runs very large backfills as date-range shards spread over a process pool.
+
+    Each worker process runs its own DataPipeline on one shard and writes its own
+    part file, while all of them draw from a single SharedRateLimiter. Completed
+    shards are recorded in a checkpoint next to the output, so a rerun after a
+    failure only runs the failed shards. Each worker sorts its part by approach date
+    and Id, so once every shard is done the parts are streamed through a k-way
+    merge into a single sorted output without loading them in memory. The failed
+    orbit lookups of every part are merged into the `<output>.failed.json` read by
+    `repair`.
+
+    Attributes:
+        api_key (str): The NASA API key.
+        processes (int): The number of worker processes.
+        shard_days (int): The number of days of each shard.
+        rate_limiter (SharedRateLimiter): The request budget shared by every worker.
+        pipeline_options (dict): The keyword arguments of each worker's DataPipeline.
+        writer (Writer): The writer of the part files and the merged output.
+    """
+
+    SORT_FIELDS = ("Data de Aproximação", "Id")
+
+    def __init__(
+        self, api_key, processes=None, shard_days=30, rate_limiter=None, **options
+    ):
+        """
+        Initialize the ShardedBackfill.
+
+        Args:
+            api_key (str): The NASA API key.
+            processes (int, optional): The number of worker processes. Defaults to the number of CPUs.
+            shard_days (int, optional): The number of days of each shard. Defaults to 30.
+            rate_limiter (SharedRateLimiter, optional): The request budget shared by every worker.
+                Defaults to a new SharedRateLimiter sized for NASA's hourly quota.
+            **options: Keyword arguments passed to each worker's DataPipeline, such as max_workers,
+                orbit_cache_path or output_format.
+
+        Raises:
+            ValueError: If a snapshot_dir is set without replay, as concurrent processes would overwrite
+                each other's snapshot index.
+        """
+        if options.get("snapshot_dir") and not options.get("replay"):
+            raise ValueError("Recording snapshots is not supported in a backfill.")
+        self.api_key = api_key
+        self.processes = processes or os.cpu_count()
+        self.shard_days = shard_days
+        self.rate_limiter = rate_limiter or SharedRateLimiter()
+        self.pipeline_options = options
+        self.writer = DataPipeline.create_writer(options.get("output_format", "csv"))
+
+    def split_shards(self, start_date, end_date):
+        """
+        Splits a date range into consecutive shards of `shard_days` days.
+
+        Args:
+            start_date (str): The start date in YYYY-MM-DD format.
+            end_date (str): The end date in YYYY-MM-DD format.
+
+        Returns:
+            list of tuple: The (start_date, end_date) pairs of each shard, in chronological order.
+
+        Raises:
+            ValueError: If end_date is before start_date.
+        """
+        start = datetime.strptime(start_date, "%Y-%m-%d")
+        end = datetime.strptime(end_date, "%Y-%m-%d")
+        if end < start:
+            raise ValueError("The end_date must not be before the start_date.")
+        shards = []
+        while start <= end:
+            shard_end = min(start + timedelta(days=self.shard_days - 1), end)
+            shards.append((start.strftime("%Y-%m-%d"), shard_end.strftime("%Y-%m-%d")))
+            start = shard_end + timedelta(days=1)
+        return shards
+
+    def run(self, start_date, end_date, output_filename=None):
+        """
+        Runs the backfill of a date range.
+
+        Args:
+            start_date (str): The start date in YYYY-MM-DD format.
+            end_date (str): The end date in YYYY-MM-DD format.
+            output_filename (str, optional): The name of the merged output file. Defaults to "neo_data"
+                with the extension of the output format.
+
+        Returns:
+            dict: The metrics of each shard run by this call keyed by "start/end", and the list of
+                failed shards. The output is only written when no shard failed.
+        """
+        if output_filename is None:
+            output_filename = "neo_data" + self.writer.extension
+        parts_dir = output_filename + ".parts"
+        os.makedirs(parts_dir, exist_ok=True)
+        checkpoint = BackfillCheckpoint(os.path.join(parts_dir, "checkpoint.json"))
+        shards = self.split_shards(start_date, end_date)
+        parts = [
+            os.path.join(parts_dir, f"{shard_start}_{shard_end}{self.writer.extension}")
+            for shard_start, shard_end in shards
+        ]
+        results = {"shards": {}, "failed": []}
+
+        with ProcessPoolExecutor(
+            max_workers=self.processes,
+            initializer=_init_worker,
+            initargs=(self.rate_limiter,),
+        ) as executor:
+            futures = {
+                executor.submit(
+                    _run_shard,
+                    self.api_key,
+                    shard_start,
+                    shard_end,
+                    part,
+                    self.pipeline_options,
+                ): (shard_start, shard_end, part)
+                for (shard_start, shard_end), part in zip(shards, parts)
+                if not checkpoint.is_done(shard_start, shard_end)
+            }
+            for future in as_completed(futures):
+                shard_start, shard_end, part = futures[future]
+                key = checkpoint.key(shard_start, shard_end)
+                try:
+                    results["shards"][key] = future.result()
+                except Exception as e:
+                    print(f"Shard {key} failed: {e}")
+                    results["failed"].append(key)
+                else:
+                    checkpoint.add(shard_start, shard_end, part)
+
+        if results["failed"]:
+            print(
+                f"{len(results['failed'])} of {len(shards)} shards failed, "
+                "rerun the backfill to retry them"
+            )
+            return results
+        self.merge(parts, output_filename)
+        self.merge_dead_letters(parts, output_filename)
+        shutil.rmtree(parts_dir)
+        print(f"Data successfully saved to {output_filename}")
+        return results
+
+    @staticmethod
+    def merge_dead_letters(parts, output_filename):
+        """
+        Replaces the dead-letter file of the output with the failed orbit lookups of the part files.
+
+        Args:
+            parts (list of str): The part files whose `<part>.failed.json` are merged.
+            output_filename (str): The name of the merged output file.
+
+        Returns:
+            DeadLetterFile: The dead letters of the output, removed from disk when no lookup failed.
+        """
+        dead_letters = DeadLetterFile(output_filename + ".failed.json")
+        dead_letters.failed = {}
+        for part in parts:
+            dead_letters.failed.update(DeadLetterFile(part + ".failed.json").failed)
+        dead_letters.save()
+        return dead_letters
+
+    @classmethod
+    def _sort_key(cls, row):
+        return tuple(str(row.get(field)) for field in cls.SORT_FIELDS)
+
+    @classmethod
+    def sort_part(cls, writer, part_filename):
+        """
+        Rewrites a part file sorted by approach date and Id, holding only that part in memory.
+
+        Args:
+            writer (Writer): The writer of the part file.
+            part_filename (str): The part file to sort, rewritten atomically.
+        """
+        writer.save(
+            sorted(writer.iter_rows(part_filename), key=cls._sort_key),
+            list(DataPipeline.FIELDNAMES),
+            part_filename,
+        )
+
+    def merge(self, parts, output_filename):
+        """
+        Merges sorted part files into a single output sorted by approach date and Id.
+
+        The parts are streamed, so only one record per part is held in memory.
+
+        Args:
+            parts (list of str): The part files to merge, each sorted by `sort_part`.
+            output_filename (str): The name of the merged output file, written atomically.
+        """
+        self.writer.save(
+            heapq.merge(
+                *(self.writer.iter_rows(part) for part in parts),
+                key=self._sort_key,
+            ),
+            list(DataPipeline.FIELDNAMES),
+            output_filename,
+        )
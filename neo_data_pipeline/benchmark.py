@@ -0,0 +1,239 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from neo_data_pipeline.concurrency_limiter import parse_workers
+from neo_data_pipeline.mock_server import MockNasaServer
+from neo_data_pipeline.pipeline import DataPipeline
+from neo_data_pipeline.rate_limiter import RateLimiter, RetryPolicy
+
+
+def percentile(values, q):
+    """
+    Computes a percentile using the nearest-rank method.
+
+    Args:
+        values (list of float): The observed values.
+        q (float): The percentile, between 0 and 100.
+
+    Returns:
+        float, None: The percentile of the values, or None if there are none.
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+def run_scenario(
+    feed_size,
+    max_workers,
+    latency=0.0,
+    error_rate=0.0,
+    rate_limit=None,
+    output_format="csv",
+):
+    """
+    Runs the pipeline once against a local mock of the API and measures it.
+
+    The run goes through `DataPipeline.run`, so the feed fetch, the writer of the
+    output format and the run metrics are part of it. It is timed without memory
+    tracing, whose allocation hooks would slow it down, and peak memory is
+    measured by a second, traced run of the same scenario. Lookup latencies time
+    the orbit lookup requests themselves, retries and rate limiting included, but
+    not the time a lookup queued for a worker or a concurrency slot, so fixed and
+    "auto" worker counts are measured alike.
+
+    Args:
+        feed_size (int): The number of NEOs returned by the feed.
+        max_workers (int or str): The number of orbit lookups performed concurrently, or "auto" for an
+            AdaptiveConcurrencyLimiter.
+        latency (float, optional): The delay, in seconds, added to every mock response. Defaults to 0.
+        error_rate (float, optional): The share of mock requests failed with HTTP 500. Defaults to 0.
+        rate_limit (int, optional): The number of mock requests allowed per second. Defaults to None.
+        output_format (str, optional): The format of the output file, as accepted by DataPipeline.
+            Defaults to "csv".
+
+    Returns:
+        dict: The scenario parameters with the rows written, rows per second, p50 and p99 lookup
+            latencies in milliseconds, peak traced memory in bytes, the stage times of the run and mock
+            request counts by status. With "auto" workers, the decisions of the limiter are included too.
+    """
+    with MockNasaServer(
+        neos_per_day=feed_size,
+        latency=latency,
+        error_rate=error_rate,
+        rate_limit=rate_limit,
+    ) as server, tempfile.TemporaryDirectory() as temp_dir:
+        latencies = []
+        with _scenario_pipeline(server, max_workers, output_format) as data_pipeline:
+            send = data_pipeline.api_client._send
+            lookup_prefix = f"{server.base_url}/neo/"
+
+            def timed_send(url, *args, **kwargs):
+                if not url.startswith(lookup_prefix) or url.endswith("/browse"):
+                    return send(url, *args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return send(url, *args, **kwargs)
+                finally:
+                    latencies.append(time.perf_counter() - start)
+
+            data_pipeline.api_client._send = timed_send
+            start = time.perf_counter()
+            metrics = _run_quietly(data_pipeline, os.path.join(temp_dir, "timed"))
+            elapsed = time.perf_counter() - start
+            limiter = data_pipeline.concurrency_limiter
+        request_counts = dict(server.request_counts)
+
+        with _scenario_pipeline(server, max_workers, output_format) as data_pipeline:
+            tracemalloc.start()
+            try:
+                _run_quietly(data_pipeline, os.path.join(temp_dir, "traced"))
+                _, peak_memory = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+    rows = metrics.counters["rows_written"]
+    result = {
+        "feed_size": feed_size,
+        "max_workers": max_workers,
+        "latency": latency,
+        "error_rate": error_rate,
+        "rate_limit": rate_limit,
+        "output_format": output_format,
+        "succeeded": bool(metrics.counters["succeeded"]),
+        "rows": rows,
+        "seconds": elapsed,
+        "rows_per_second": rows / elapsed if elapsed else None,
+        "lookup_p50_ms": _milliseconds(percentile(latencies, 50)),
+        "lookup_p99_ms": _milliseconds(percentile(latencies, 99)),
+        "peak_memory_bytes": peak_memory,
+        "stages": metrics.stages,
+        "requests": {str(status): n for status, n in request_counts.items()},
+    }
+    if limiter is not None:
+        result["concurrency"] = limiter.stats()
+    return result
+
+
+def _scenario_pipeline(server, max_workers, output_format):
+    data_pipeline = DataPipeline(
+        "benchmark",
+        max_workers=max_workers,
+        output_format=output_format,
+        base_url=server.base_url,
+        rate_limiter=RateLimiter(rate=None),
+    )
+    data_pipeline.api_client.retry_policy = RetryPolicy(
+        max_retries=10, backoff_factor=0.01, max_backoff=1
+    )
+    return data_pipeline
+
+
+def _run_quietly(data_pipeline, output_stem):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return data_pipeline.run(
+            "2024-01-01", "2024-01-01", output_stem + data_pipeline.writer.extension
+        )
+
+
+def _milliseconds(seconds):
+    return None if seconds is None else seconds * 1000
+
+
+def run_benchmark(
+    feed_sizes,
+    worker_counts,
+    latency=0.0,
+    error_rate=0.0,
+    rate_limit=None,
+    output_format="csv",
+):
+    """
+    Runs every combination of feed size and worker count.
+
+    Args:
+        feed_sizes (list of int): The numbers of NEOs returned by the feed.
+        worker_counts (list): The numbers of orbit lookups performed concurrently, or "auto".
+        latency (float, optional): The delay, in seconds, added to every mock response. Defaults to 0.
+        error_rate (float, optional): The share of mock requests failed with HTTP 500. Defaults to 0.
+        rate_limit (int, optional): The number of mock requests allowed per second. Defaults to None.
+        output_format (str, optional): The format of the output file. Defaults to "csv".
+
+    Yields:
+        dict: The measurements of each scenario, as returned by run_scenario.
+    """
+    for feed_size in feed_sizes:
+        for max_workers in worker_counts:
+            yield run_scenario(
+                feed_size, max_workers, latency, error_rate, rate_limit, output_format
+            )
+
+
+def build_parser(parser=None):
+    """
+    Builds the command line parser of the benchmark.
+
+    Args:
+        parser (argparse.ArgumentParser, optional): The parser to add the arguments to. Defaults to a new parser.
+
+    Returns:
+        argparse.ArgumentParser: The parser.
+    """
+    if parser is None:
+        parser = argparse.ArgumentParser(
+            description="Benchmark the pipeline against a local mock of NASA's NEO API."
+        )
+    parser.add_argument(
+        "--feed-sizes", type=int, nargs="+", default=[100, 1000], metavar="N"
+    )
+    parser.add_argument(
+        "--workers", type=parse_workers, nargs="+", default=[5, 10, 20, "auto"]
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.02, help="seconds added per response"
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="share of HTTP 500 responses"
+    )
+    parser.add_argument(
+        "--rate-limit", type=int, default=None, help="requests allowed per second"
+    )
+    parser.add_argument(
+        "--output-format", choices=DataPipeline.OUTPUT_FORMATS, default="csv"
+    )
+    return parser
+
+
+def main(argv=None, out=None):
+    """
+    Runs the benchmark and prints one JSON object per scenario.
+
+    Args:
+        argv (list of str, optional): The command line arguments. Defaults to sys.argv.
+        out (file, optional): The stream the results are written to. Defaults to sys.stdout.
+    """
+    args = build_parser().parse_args(argv)
+    out = out or sys.stdout
+    for result in run_benchmark(
+        args.feed_sizes,
+        args.workers,
+        args.latency,
+        args.error_rate,
+        args.rate_limit,
+        args.output_format,
+    ):
+        out.write(json.dumps(result) + "\n")
+        out.flush()
+
+
+if __name__ == "__main__":
+    main()
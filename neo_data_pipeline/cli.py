@@ -0,0 +1,162 @@
+import argparse
+import sys
+
+from neo_data_pipeline.concurrency_limiter import parse_workers
+
+# Subcommands handled by the main function of their own module, which parses the remaining arguments.
+FORWARDED_COMMANDS = {
+    "benchmark": ("neo_data_pipeline.benchmark", "Benchmark against a local mock API."),
+    "query": ("neo_data_pipeline.neo_store", "Query a SQLite NEO store."),
+    "daemon": ("neo_data_pipeline.daemon", "Run as a resident, scheduled service."),
+}
+COMMANDS = ("fetch", "replay", "repair") + tuple(FORWARDED_COMMANDS)
+
+
+def _add_output_arguments(parser):
+    parser.add_argument("--output", help="output file, neo_data.<format> by default")
+    # The formats of DataPipeline.OUTPUT_FORMATS, repeated to keep the pipeline unloaded.
+    parser.add_argument(
+        "--output-format", choices=("csv", "parquet", "sqlite"), default="csv"
+    )
+    parser.add_argument(
+        "--workers",
+        type=parse_workers,
+        default=10,
+        help="concurrent lookups, or 'auto' to adapt them to the API",
+    )
+    parser.add_argument("--orbit-cache", help="path of the orbit type cache")
+
+
+def _add_run_arguments(parser):
+    parser.add_argument("start_date", help="YYYY-MM-DD")
+    parser.add_argument("end_date", help="YYYY-MM-DD")
+    _add_output_arguments(parser)
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="only process dates missing from the output",
+    )
+    parser.add_argument("--columnar", action="store_true")
+    parser.add_argument("--metrics-path")
+    parser.add_argument(
+        "--metrics-format", choices=("json", "prometheus"), default="json"
+    )
+    parser.add_argument(
+        "--summary-top-n", type=int, help="write a summary with N closest approaches"
+    )
+
+
+def build_parser():
+    """
+    Builds the command line parser.
+
+    Only argparse is imported here, so `--help` and usage errors return without
+    loading the pipeline, `requests` or any other heavy module.
+
+    Returns:
+        argparse.ArgumentParser: The parser.
+    """
+    parser = argparse.ArgumentParser(
+        prog="neo_data_pipeline",
+        description="Fetch, process and store Near Earth Object data from NASA's API.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    fetch = commands.add_parser("fetch", help="Fetch and process a date range.")
+    fetch.add_argument("api_key")
+    _add_run_arguments(fetch)
+    fetch.add_argument(
+        "--snapshot-dir", help="record every raw response into this store"
+    )
+    fetch.add_argument("--http-cache", help="path of the HTTP response cache")
+    fetch.add_argument("--stream-feed", action="store_true")
+    fetch.add_argument("--prefetch-orbits", action="store_true")
+    fetch.add_argument(
+        "--prefetch-pages",
+        type=int,
+        help="maximum number of browse pages prefetched (default: 50)",
+    )
+    fetch.add_argument("--base-url", help="root URL of the API, e.g. a proxy")
+
+    replay = commands.add_parser(
+        "replay", help="Process a date range offline from recorded snapshots."
+    )
+    replay.add_argument("snapshot_dir")
+    _add_run_arguments(replay)
+
+    repair = commands.add_parser(
+        "repair", help="Retry the failed orbit lookups of an output."
+    )
+    repair.add_argument("api_key")
+    _add_output_arguments(repair)
+    repair.add_argument("--base-url", help="root URL of the API, e.g. a proxy")
+
+    for name, (_, description) in FORWARDED_COMMANDS.items():
+        commands.add_parser(name, help=description, add_help=False)
+    return parser
+
+
+def _run(args):
+    from neo_data_pipeline.pipeline import DataPipeline
+
+    options = {
+        "max_workers": args.workers,
+        "output_format": args.output_format,
+        "orbit_cache_path": args.orbit_cache,
+    }
+    if args.command == "repair":
+        with DataPipeline(args.api_key, base_url=args.base_url, **options) as pipeline:
+            return 1 if pipeline.repair(args.output)["failed"] else 0
+
+    options.update(
+        columnar=args.columnar,
+        metrics_path=args.metrics_path,
+        metrics_format=args.metrics_format,
+        summary_top_n=args.summary_top_n,
+    )
+    if args.command == "replay":
+        api_key = None
+        options.update(snapshot_dir=args.snapshot_dir, replay=True)
+    else:
+        api_key = args.api_key
+        options.update(
+            snapshot_dir=args.snapshot_dir,
+            http_cache_path=args.http_cache,
+            stream_feed=args.stream_feed,
+            prefetch_orbits=args.prefetch_orbits,
+            prefetch_pages=args.prefetch_pages,
+            base_url=args.base_url,
+        )
+    with DataPipeline(api_key, **options) as pipeline:
+        metrics = pipeline.run(
+            args.start_date, args.end_date, args.output, incremental=args.incremental
+        )
+    return 0 if metrics.counters.get("succeeded") else 1
+
+
+def main(argv=None):
+    """
+    Runs a subcommand.
+
+    Args:
+        argv (list of str, optional): The command line arguments. Defaults to sys.argv.
+
+    Returns:
+        int: The exit status, 0 on success.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    parser = build_parser()
+    args, remaining = parser.parse_known_args(argv)
+    if args.command in FORWARDED_COMMANDS:
+        from importlib import import_module
+
+        module = import_module(FORWARDED_COMMANDS[args.command][0])
+        status = module.main(argv[argv.index(args.command) + 1 :])
+        return status or 0
+    if remaining:
+        parser.error(f"unrecognized arguments: {' '.join(remaining)}")
+    return _run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
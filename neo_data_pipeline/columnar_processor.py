@@ -0,0 +1,298 @@
+from itertools import islice
+
+import numpy as np
+
+from neo_data_pipeline.processor import Processor
+from neo_data_pipeline.record import NeoRecord
+
+
+class ColumnarProcessor(Processor):
+    """
+    A processor computing the derived fields of NEO data in bulk with NumPy.
+
+    The feed is consumed in batches which are extracted into typed NumPy columns.
+    Speed conversion, diameter and proximity categorization and date
+    standardization are then computed on whole columns at once. The records
+    produced are identical to the ones built by Processor.
+
+    In `all_approaches` mode, every entry of `close_approach_data` is extracted
+    instead of only the first one, and one record is produced per approach. The
+    approaches are filtered on whole columns by orbiting body and epoch window,
+    which matters for the browse and lookup payloads listing the full history of
+    each NEO.
+
+    Attributes:
+        batch_size (int): The number of NEOs extracted into columns at once.
+        all_approaches (bool): Whether one record is produced per close approach.
+        orbiting_bodies (tuple of str): The bodies whose approaches are kept in all_approaches mode, or None
+            for every body.
+        epoch_window (tuple): The first and last approach dates, in YYYY-MM-DD format, kept in all_approaches
+            mode. Either bound may be None.
+    """
+
+    DIAMETER_BINS = np.array([0.1, 0.5])
+    DIAMETER_LABELS = np.array(["Pequeno", "Médio", "Grande"], dtype=object)
+    PROXIMITY_BINS = np.array([1000000, 5000000], dtype=np.float64)
+    PROXIMITY_LABELS = np.array(["Muito Próximo", "Próximo", "Distante"], dtype=object)
+    DEFAULT_BATCH_SIZE = 10000
+
+    def __init__(
+        self,
+        max_workers=10,
+        window=None,
+        ordered=True,
+        batch_size=DEFAULT_BATCH_SIZE,
+        all_approaches=False,
+        orbiting_bodies=("Earth",),
+        epoch_window=(None, None),
+    ):
+        """
+        Initialize the ColumnarProcessor.
+
+        Args:
+            max_workers (int, optional): The number of orbit lookups performed concurrently. Defaults to 10.
+            window (int, optional): The maximum number of records waiting for their orbit lookup.
+                Defaults to four times max_workers.
+            ordered (bool, optional): Whether records are yielded in feed order. Defaults to True.
+            batch_size (int, optional): The number of NEOs extracted into columns at once, which bounds memory
+                in all_approaches mode too. The first records are only yielded once a whole batch has been
+                read, so streamed feeds call for a batch no larger than the window. Defaults to 10000.
+            all_approaches (bool, optional): Whether one record is produced per close approach rather than
+                per NEO. Defaults to False.
+            orbiting_bodies (tuple of str, optional): The bodies whose approaches are kept in all_approaches
+                mode, or None for every body. Defaults to ("Earth",).
+            epoch_window (tuple, optional): The first and last approach dates, in YYYY-MM-DD format, kept in
+                all_approaches mode. Defaults to (None, None), which keeps every date.
+        """
+        super().__init__(max_workers=max_workers, window=window, ordered=ordered)
+        self.batch_size = batch_size
+        self.all_approaches = all_approaches
+        self.orbiting_bodies = orbiting_bodies
+        self.epoch_window = epoch_window
+
+    @staticmethod
+    def categorize(values, bins, labels):
+        """
+        Categorizes an array of values by binning them.
+
+        Args:
+            values (numpy.ndarray): The values to categorize.
+            bins (numpy.ndarray): The ascending upper bounds, exclusive, of every category but the last.
+            labels (numpy.ndarray): The label of each category.
+
+        Returns:
+            numpy.ndarray: The label of each value.
+        """
+        return labels[np.searchsorted(bins, values, side="right")]
+
+    @staticmethod
+    def standardize_dates(epochs_ms):
+        """
+        Standardizes an array of epoch timestamps to ISO dates.
+
+        Args:
+            epochs_ms (numpy.ndarray): The epoch timestamps in milliseconds, as datetime64[ms].
+
+        Returns:
+            numpy.ndarray: The dates in ISO format (YYYY-MM-DD), or None for missing timestamps.
+        """
+        dates = np.datetime_as_string(epochs_ms.astype("datetime64[D]"), unit="D")
+        return np.where(np.isnat(epochs_ms), None, dates.astype(object))
+
+    def build_records(self, neos):
+        """
+        Builds the processed records of a batch of NEOs, without their orbit type.
+
+        Args:
+            neos (list of dict): The NEO data as returned by the feed endpoint.
+
+        Returns:
+            list of NeoRecord: The processed NEO information, with the orbit type set to None.
+        """
+        epochs = []
+        speeds_kmh = []
+        distances = []
+        diameters_min = []
+        diameters_max = []
+        for neo in neos:
+            approach_data = (
+                neo.get("close_approach_data")[0]
+                if neo.get("close_approach_data")
+                else None
+            )
+            if approach_data:
+                epoch = approach_data.get("epoch_date_close_approach")
+                epochs.append("NaT" if epoch is None else int(epoch))
+                speeds_kmh.append(
+                    float(
+                        approach_data.get("relative_velocity", {}).get(
+                            "kilometers_per_hour", 0
+                        )
+                    )
+                )
+                distances.append(
+                    float(approach_data.get("miss_distance", {}).get("kilometers", 0))
+                )
+            else:
+                epochs.append("NaT")
+                speeds_kmh.append(0.0)
+                distances.append(0.0)
+            kilometers = neo.get("estimated_diameter", {}).get("kilometers", {})
+            diameters_min.append(kilometers.get("estimated_diameter_min"))
+            diameters_max.append(kilometers.get("estimated_diameter_max"))
+
+        columns = self._derive(
+            np.array(epochs, dtype="datetime64[ms]"),
+            np.array(speeds_kmh, dtype=np.float64),
+            np.array(distances, dtype=np.float64),
+            np.array([value or 0.0 for value in diameters_max], dtype=np.float64),
+        )
+        return [
+            self._record(neo, diameters_min[i], diameters_max[i], columns, i, None)
+            for i, neo in enumerate(neos)
+        ]
+
+    def _derive(self, epochs, speeds_kmh, distances, diameter_values):
+        """
+        Computes the derived fields of whole columns.
+
+        Args:
+            epochs (numpy.ndarray): The approach timestamps, as datetime64[ms].
+            speeds_kmh (numpy.ndarray): The approach velocities in km/h, 0 when missing.
+            distances (numpy.ndarray): The miss distances in km, 0 when missing.
+            diameter_values (numpy.ndarray): The maximum diameters in km, 0 when missing.
+
+        Returns:
+            tuple of list: The approach dates, velocities in m/s, distances and diameter and proximity
+                categories, with None for missing values.
+        """
+        return (
+            self.standardize_dates(epochs).tolist(),
+            np.where(speeds_kmh != 0, speeds_kmh * 1000 / 3600, None).tolist(),
+            np.where(distances != 0, distances, None).tolist(),
+            np.where(
+                diameter_values != 0,
+                self.categorize(
+                    diameter_values, self.DIAMETER_BINS, self.DIAMETER_LABELS
+                ),
+                None,
+            ).tolist(),
+            np.where(
+                distances != 0,
+                self.categorize(distances, self.PROXIMITY_BINS, self.PROXIMITY_LABELS),
+                None,
+            ).tolist(),
+        )
+
+    @staticmethod
+    def _record(neo, diameter_min, diameter_max, columns, i, orbiting_body):
+        approach_dates, speeds_ms, distances, diameter_categories, proximity = columns
+        return NeoRecord(
+            neo.get("id"),
+            neo.get("name"),
+            approach_dates[i],
+            diameter_min,
+            diameter_max,
+            speeds_ms[i],
+            distances[i],
+            diameter_categories[i],
+            proximity[i],
+            neo.get("is_potentially_hazardous_asteroid"),
+            None,
+            orbiting_body,
+        )
+
+    def approach_mask(self, epochs, bodies):
+        """
+        Selects the approaches matching `orbiting_bodies` and `epoch_window`.
+
+        Args:
+            epochs (numpy.ndarray): The approach timestamps, as datetime64[ms].
+            bodies (numpy.ndarray): The orbiting body of each approach.
+
+        Returns:
+            numpy.ndarray: A boolean mask of the approaches to keep. Approaches without a timestamp are
+                dropped when a window is set.
+        """
+        mask = np.ones(len(epochs), dtype=bool)
+        if self.orbiting_bodies is not None:
+            mask &= np.isin(bodies, list(self.orbiting_bodies))
+        first_date, last_date = self.epoch_window
+        if first_date is not None:
+            mask &= epochs >= np.datetime64(first_date, "ms")
+        if last_date is not None:
+            mask &= epochs < np.datetime64(last_date, "D") + np.timedelta64(1, "D")
+        return mask
+
+    def build_approach_records(self, neos):
+        """
+        Builds one processed record per close approach of a batch of NEOs, without their orbit type.
+
+        Args:
+            neos (list of dict): The NEO data, with any number of entries in `close_approach_data`.
+
+        Returns:
+            list of NeoRecord: The processed information of every approach kept by `approach_mask`, grouped by
+                NEO in input order, with its orbiting body and the orbit type set to None.
+        """
+        owners = []
+        epochs = []
+        speeds_kmh = []
+        distances = []
+        bodies = []
+        for index, neo in enumerate(neos):
+            for approach in neo.get("close_approach_data") or ():
+                epoch = approach.get("epoch_date_close_approach")
+                owners.append(index)
+                epochs.append("NaT" if epoch is None else int(epoch))
+                speeds_kmh.append(
+                    approach.get("relative_velocity", {}).get("kilometers_per_hour", 0)
+                )
+                distances.append(approach.get("miss_distance", {}).get("kilometers", 0))
+                bodies.append(approach.get("orbiting_body"))
+
+        epochs = np.array(epochs, dtype="datetime64[ms]")
+        bodies = np.array(bodies, dtype=object)
+        mask = self.approach_mask(epochs, bodies)
+        owners = np.array(owners, dtype=np.intp)[mask]
+        # The API sends numbers as strings, parsed here in bulk for the kept approaches only.
+        speeds_kmh = np.array(speeds_kmh, dtype=np.str_)[mask].astype(np.float64)
+        distances = np.array(distances, dtype=np.str_)[mask].astype(np.float64)
+        kilometers = [
+            neo.get("estimated_diameter", {}).get("kilometers", {}) for neo in neos
+        ]
+        diameters_min = [value.get("estimated_diameter_min") for value in kilometers]
+        diameters_max = [value.get("estimated_diameter_max") for value in kilometers]
+        diameter_values = np.array(
+            [value or 0.0 for value in diameters_max], dtype=np.float64
+        )[owners]
+
+        columns = self._derive(epochs[mask], speeds_kmh, distances, diameter_values)
+        bodies = bodies[mask].tolist()
+        return [
+            self._record(
+                neos[owner],
+                diameters_min[owner],
+                diameters_max[owner],
+                columns,
+                i,
+                bodies[i],
+            )
+            for i, owner in enumerate(owners.tolist())
+        ]
+
+    def _prepare(self, neos):
+        neos = iter(neos)
+        while True:
+            batch = list(islice(neos, self.batch_size))
+            if not batch:
+                return
+            if self.all_approaches:
+                records = self.build_approach_records(batch)
+            else:
+                records = self.build_records(batch)
+            for record in records:
+                yield record.id, record
+
+    def _complete(self, prepared, orbit_type):
+        return prepared._replace(orbit_type=orbit_type)
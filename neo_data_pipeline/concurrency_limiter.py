@@ -0,0 +1,215 @@
+import argparse
+import threading
+import time
+from collections import deque
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    An adaptive limit on the number of orbit lookup requests in flight, tuned by AIMD.
+
+    Every request sent takes a slot with `acquire` and gives it back with
+    `release`, reporting its latency and whether the API pushed back, i.e. the
+    request was retried after a 429, a 5xx or a connection error, or failed on
+    one. Lookups answered from a cache never take a slot, so they do not dilute
+    the latency samples. The limit follows additive increase, multiplicative
+    decrease:
+
+    - once a full round of `limit` requests has completed while the limit was
+      reached, and the short-term average latency is within `growth_tolerance`
+      of the long-term average, the limit grows by one, or doubles until the
+      first decrease or latency rise so that a cold start ramps up quickly;
+    - between the two tolerances, the limit holds;
+    - on pushback, or when the short-term average latency exceeds
+      `latency_tolerance` times the long-term average, the limit is multiplied
+      by `backoff`. Requests queued behind a local rate limit count as slow, so
+      the limit also shrinks as the quota runs out.
+
+    The long-term average drops as soon as requests get faster, so it tracks the
+    latency of an uncongested API instead of drifting up under sustained load.
+
+    Requests started before a decrease are not counted towards the next one, as
+    they report the congestion that caused it.
+
+    Attributes:
+        limit (int): The current number of requests allowed in flight.
+        min_limit (int): The lowest limit allowed.
+        max_limit (int): The highest limit allowed.
+        backoff (float): The factor applied to the limit on a decrease.
+        latency_tolerance (float): The ratio of short-term to long-term latency considered congested.
+        growth_tolerance (float): The highest ratio of short-term to long-term latency the limit grows at.
+        in_flight (int): The number of requests holding a slot.
+        latency (float): The short-term moving average of the request latency, in seconds, or None.
+        baseline_latency (float): The long-term moving average of the request latency, in seconds, or None.
+        history (deque): The last HISTORY_SIZE decisions, as (monotonic time, new limit, reason) tuples with
+            reason "increase", "latency" or "pushback".
+    """
+
+    SHORT_SMOOTHING = 0.3
+    LONG_SMOOTHING = 0.02
+    HISTORY_SIZE = 100
+
+    def __init__(
+        self,
+        initial=4,
+        min_limit=1,
+        max_limit=64,
+        backoff=0.7,
+        latency_tolerance=1.5,
+        growth_tolerance=1.2,
+    ):
+        """
+        Initialize the AdaptiveConcurrencyLimiter.
+
+        Args:
+            initial (int, optional): The starting limit. Defaults to 4.
+            min_limit (int, optional): The lowest limit allowed. Defaults to 1.
+            max_limit (int, optional): The highest limit allowed, which also sizes the worker pool. Defaults
+                to 64.
+            backoff (float, optional): The factor applied to the limit on a decrease, between 0 and 1.
+                Defaults to 0.7.
+            latency_tolerance (float, optional): The ratio of short-term to long-term latency considered
+                congested. Defaults to 1.5.
+            growth_tolerance (float, optional): The highest ratio of short-term to long-term latency the limit
+                grows at. Defaults to 1.2.
+
+        Raises:
+            ValueError: If the limits are not ordered as 1 <= min_limit <= initial <= max_limit, or backoff
+                is not between 0 and 1.
+        """
+        if not 1 <= min_limit <= initial <= max_limit:
+            raise ValueError(
+                "Limits must satisfy 1 <= min_limit <= initial <= max_limit."
+            )
+        if not 0 < backoff < 1:
+            raise ValueError("backoff must be between 0 and 1.")
+        self.limit = initial
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.growth_tolerance = growth_tolerance
+        self.in_flight = 0
+        self.latency = None
+        self.baseline_latency = None
+        self.history = deque(maxlen=self.HISTORY_SIZE)
+        self._completed = 0
+        self._slow_start = True
+        # The number of decreases so far, which tells lookups started before the last decrease apart.
+        self._epoch = 0
+        self._condition = threading.Condition()
+        self.reset_stats()
+
+    def reset_stats(self):
+        """
+        Resets the decision counters, keeping the learned limit and latencies.
+        """
+        with self._condition:
+            self._lowest = self._highest = self.limit
+            self._decisions = {"increase": 0, "latency": 0, "pushback": 0}
+
+    def acquire(self):
+        """
+        Waits for a slot below the limit and takes it.
+
+        Returns:
+            int: The ticket of the slot, passed back to `release`.
+        """
+        with self._condition:
+            while self.in_flight >= self.limit:
+                self._condition.wait()
+            self.in_flight += 1
+            return self._epoch
+
+    def release(self, ticket, latency, pushback=False):
+        """
+        Gives back a slot and adjusts the limit from the outcome of the request.
+
+        Args:
+            ticket (int): The ticket returned by `acquire`.
+            latency (float): The duration of the request, retries included, in seconds.
+            pushback (bool, optional): Whether the API pushed back during the request. Defaults to False.
+        """
+        with self._condition:
+            saturated = self.in_flight >= self.limit
+            self.in_flight -= 1
+            self._completed += 1
+            if self.latency is None:
+                self.latency = self.baseline_latency = latency
+            else:
+                self.latency += self.SHORT_SMOOTHING * (latency - self.latency)
+                self.baseline_latency = min(
+                    self.latency,
+                    self.baseline_latency
+                    + self.LONG_SMOOTHING * (latency - self.baseline_latency),
+                )
+            congested = self.latency > self.baseline_latency * self.latency_tolerance
+            headroom = self.latency <= self.baseline_latency * self.growth_tolerance
+            if pushback or congested:
+                if ticket == self._epoch:
+                    self._epoch += 1
+                    self._slow_start = False
+                    self._change(
+                        max(self.min_limit, int(self.limit * self.backoff)),
+                        "pushback" if pushback else "latency",
+                    )
+            elif not headroom:
+                self._slow_start = False
+            elif saturated and self._completed >= self.limit:
+                step = self.limit if self._slow_start else 1
+                self._change(min(self.max_limit, self.limit + step), "increase")
+            self._condition.notify_all()
+
+    def _change(self, limit, reason):
+        self._completed = 0
+        if limit == self.limit:
+            return
+        self.limit = limit
+        self._lowest = min(self._lowest, limit)
+        self._highest = max(self._highest, limit)
+        self._decisions[reason] += 1
+        self.history.append((time.monotonic(), limit, reason))
+
+    def stats(self):
+        """
+        Returns the decisions taken since the last reset.
+
+        Returns:
+            dict: The current, lowest and highest limits, and the number of increases and of decreases caused
+                by latency and by pushback.
+        """
+        with self._condition:
+            return {
+                "limit": self.limit,
+                "lowest": self._lowest,
+                "highest": self._highest,
+                "increases": self._decisions["increase"],
+                "latency_decreases": self._decisions["latency"],
+                "pushback_decreases": self._decisions["pushback"],
+            }
+
+
+def parse_workers(value):
+    """
+    Parses a worker count given on the command line.
+
+    Args:
+        value (str): A positive number of workers, or "auto" for an adaptive limit.
+
+    Returns:
+        int or str: The number of workers, or "auto".
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is neither "auto" nor a positive integer.
+    """
+    if value == "auto":
+        return value
+    try:
+        workers = int(value)
+    except ValueError:
+        workers = 0
+    if workers < 1:
+        raise argparse.ArgumentTypeError(
+            f"expected a positive number of workers or 'auto', got {value!r}"
+        )
+    return workers
@@ -1,24 +1,88 @@
 import csv
 
+from neo_data_pipeline.record import NeoRecord
+from neo_data_pipeline.writer import Writer, atomic_output
 
-class CsvWriter:
+
+class CsvWriter(Writer):
     """
     A utility class for writing data to a CSV file.
 
     This class provides methods to save data to a CSV file with specified fieldnames.
     """
 
+    extension = ".csv"
+
     @staticmethod
     def save_to_csv(data, fieldnames, filename="neo_data.csv"):
         """
         Save data to a CSV file with specified fieldnames.
 
+        The file is written under a temporary name and moved into place once complete.
+        When the fieldnames are the NeoRecord headers, or their leading part, records
+        are written positionally without a per-field lookup, and dictionaries are
+        converted to records first.
+
         Args:
-            data (iterable): An iterable (e.g., list, generator) of dictionaries containing the data to be written.
-            fieldnames (list of str): A list of strings representing the header names for the CSV file.
+            data (iterable): An iterable (e.g., list, generator) of NeoRecords or dictionaries containing the
+                data to be written.
+            fieldnames (list of str): A list of strings representing the header names for the CSV file. Other
+                fields are left out, like the orbiting body outside of all_approaches runs.
             filename (str, optional): The name of the file to which the data will be written. Defaults to "neo_data.csv".
         """
-        with open(filename, "w", newline="", encoding="utf-8") as f:
-            dict_writer = csv.DictWriter(f, fieldnames=fieldnames)
-            dict_writer.writeheader()
-            dict_writer.writerows(data)
+        with atomic_output(filename) as temp_path:
+            with open(temp_path, "w", newline="", encoding="utf-8") as f:
+                width = len(fieldnames)
+                if tuple(fieldnames) == NeoRecord.HEADERS[:width]:
+                    records = (
+                        row if isinstance(row, NeoRecord) else NeoRecord.from_dict(row)
+                        for row in data
+                    )
+                    if width < len(NeoRecord.HEADERS):
+                        records = (record[:width] for record in records)
+                    csv_writer = csv.writer(f)
+                    csv_writer.writerow(fieldnames)
+                    csv_writer.writerows(records)
+                else:
+                    dict_writer = csv.DictWriter(
+                        f, fieldnames=fieldnames, extrasaction="ignore"
+                    )
+                    dict_writer.writeheader()
+                    dict_writer.writerows(data)
+
+    def save(self, data, fieldnames, filename):
+        """
+        Save data to a CSV file with specified fieldnames.
+
+        Args:
+            data (iterable): An iterable (e.g., list, generator) of NeoRecords or dictionaries containing the
+                data to be written.
+            fieldnames (list of str): A list of strings representing the header names for the CSV file.
+            filename (str): The name of the file to which the data will be written.
+        """
+        self.save_to_csv(data, fieldnames, filename)
+
+    def read(self, filename):
+        """
+        Reads back the rows of a CSV file.
+
+        Args:
+            filename (str): The name of the CSV file to read.
+
+        Returns:
+            list of dict: The rows of the file, with every value as a string.
+        """
+        return list(self.iter_rows(filename))
+
+    def iter_rows(self, filename):
+        """
+        Streams back the rows of a CSV file, one line at a time.
+
+        Args:
+            filename (str): The name of the CSV file to read.
+
+        Yields:
+            dict: The rows of the file, with every value as a string.
+        """
+        with open(filename, newline="", encoding="utf-8") as f:
+            yield from csv.DictReader(f)
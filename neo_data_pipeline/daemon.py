@@ -0,0 +1,326 @@
+import argparse
+import json
+import queue
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from neo_data_pipeline.concurrency_limiter import parse_workers
+from neo_data_pipeline.pipeline import DataPipeline
+
+
+class PipelineDaemon:
+    """
+    A resident service running a DataPipeline on a schedule.
+
+    The daemon keeps a single pipeline, and with it the pooled connections and the
+    orbit and HTTP caches, warm across cycles. Every `interval` seconds it runs an
+    incremental ingestion of the last `lookback_days` days, so only dates missing
+    from the output manifest are fetched. A local HTTP endpoint reports the status
+    of the daemon on `GET /status` and queues a run on `POST /run`, optionally for
+    the `start_date` and `end_date` given in the query string. Runs never overlap.
+
+    Attributes:
+        pipeline (DataPipeline): The pipeline run by the daemon.
+        output_filename (str): The output the runs are merged into.
+        interval (float): The number of seconds between scheduled runs.
+        lookback_days (int): The number of days before today ingested by scheduled runs.
+        host (str): The interface the HTTP endpoint listens on.
+        port (int): The port of the HTTP endpoint, 0 for a free port.
+        base_url (str): The root URL of the running HTTP endpoint.
+    """
+
+    def __init__(
+        self,
+        pipeline,
+        output_filename=None,
+        interval=3600,
+        lookback_days=1,
+        host="127.0.0.1",
+        port=8000,
+    ):
+        """
+        Initialize the PipelineDaemon.
+
+        Args:
+            pipeline (DataPipeline): The pipeline run by the daemon. It is closed when the daemon stops.
+            output_filename (str, optional): The output the runs are merged into. Defaults to "neo_data" with
+                the extension of the pipeline's output format.
+            interval (float, optional): The number of seconds between scheduled runs. Defaults to one hour.
+            lookback_days (int, optional): The number of days before today ingested by scheduled runs.
+                Defaults to 1.
+            host (str, optional): The interface the HTTP endpoint listens on. Defaults to "127.0.0.1".
+            port (int, optional): The port of the HTTP endpoint, 0 for a free port. Defaults to 8000.
+        """
+        self.pipeline = pipeline
+        self.output_filename = output_filename or (
+            "neo_data" + pipeline.writer.extension
+        )
+        self.interval = interval
+        self.lookback_days = lookback_days
+        self.host = host
+        self.port = port
+        self.base_url = None
+        self._requests = queue.Queue()
+        self._run_lock = threading.Lock()
+        self._status_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._status = {
+            "state": "idle",
+            "runs": 0,
+            "failures": 0,
+            "last_range": None,
+            "last_started_at": None,
+            "last_finished_at": None,
+            "last_metrics": None,
+            "next_run_at": None,
+        }
+        self._server = None
+        self._threads = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def default_range(self):
+        """
+        Returns the date range of a scheduled run.
+
+        Returns:
+            tuple: The start and end dates, in YYYY-MM-DD format, of the last `lookback_days` days up to today
+                in UTC.
+        """
+        today = datetime.now(timezone.utc).date()
+        start = today - timedelta(days=self.lookback_days)
+        return start.isoformat(), today.isoformat()
+
+    def run_once(self, start_date=None, end_date=None):
+        """
+        Runs one incremental ingestion, waiting for any run in progress to finish first.
+
+        Args:
+            start_date (str, optional): The start date in YYYY-MM-DD format. Defaults to the scheduled range.
+            end_date (str, optional): The end date in YYYY-MM-DD format. Defaults to the scheduled range.
+
+        Returns:
+            PipelineMetrics: The metrics of the run.
+        """
+        default_start, default_end = self.default_range()
+        date_range = [start_date or default_start, end_date or default_end]
+        with self._run_lock:
+            with self._status_lock:
+                self._status["state"] = "running"
+                self._status["last_range"] = date_range
+                self._status["last_started_at"] = time.time()
+            metrics = self.pipeline.run(
+                date_range[0], date_range[1], self.output_filename, incremental=True
+            )
+            with self._status_lock:
+                self._status["state"] = "idle"
+                self._status["runs"] += 1
+                if not metrics.counters.get("succeeded"):
+                    self._status["failures"] += 1
+                self._status["last_finished_at"] = time.time()
+                self._status["last_metrics"] = metrics.to_dict()
+        return metrics
+
+    def trigger(self, start_date=None, end_date=None):
+        """
+        Queues a run, performed as soon as the daemon is idle.
+
+        Args:
+            start_date (str, optional): The start date in YYYY-MM-DD format. Defaults to the scheduled range.
+            end_date (str, optional): The end date in YYYY-MM-DD format. Defaults to the scheduled range.
+        """
+        self._requests.put((start_date, end_date))
+
+    def status(self):
+        """
+        Returns the status of the daemon.
+
+        Returns:
+            dict: The state ("idle" or "running"), the number of runs and failed runs, the range, start and
+                end times and metrics of the last run, the time of the next scheduled run and the number of
+                queued runs.
+        """
+        with self._status_lock:
+            status = dict(self._status)
+        status["queued"] = self._requests.qsize()
+        return status
+
+    def _schedule(self):
+        next_run_at = time.time()
+        while not self._stopping.is_set():
+            with self._status_lock:
+                self._status["next_run_at"] = next_run_at
+            try:
+                date_range = self._requests.get(
+                    timeout=max(0.0, next_run_at - time.time())
+                )
+            except queue.Empty:
+                date_range = (None, None)
+                next_run_at = time.time() + self.interval
+            if self._stopping.is_set():
+                return
+            self.run_once(*date_range)
+
+    def _handle(self, handler, method):
+        url = urlparse(handler.path)
+        if method == "GET" and url.path == "/status":
+            self._respond(handler, 200, self.status())
+        elif method == "POST" and url.path == "/run":
+            query = parse_qs(url.query)
+            start_date = query.get("start_date", [None])[0]
+            end_date = query.get("end_date", [None])[0]
+            try:
+                for value in (start_date, end_date):
+                    if value is not None:
+                        datetime.strptime(value, "%Y-%m-%d")
+            except ValueError:
+                self._respond(handler, 400, {"error": "dates must be YYYY-MM-DD"})
+                return
+            self.trigger(start_date, end_date)
+            self._respond(handler, 202, {"queued": self._requests.qsize()})
+        else:
+            self._respond(handler, 404, {"error": "not found"})
+
+    @staticmethod
+    def _respond(handler, status, payload):
+        body = json.dumps(payload).encode()
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def start(self):
+        """
+        Starts the scheduler and the HTTP endpoint in background threads. The first run starts immediately.
+        """
+        daemon = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                daemon._handle(self, "GET")
+
+            def do_POST(self):
+                daemon._handle(self, "POST")
+
+            def log_message(self, format, *args):
+                pass
+
+        self._stopping.clear()
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.base_url = f"http://{self.host}:{self._server.server_address[1]}"
+        self._threads = [
+            threading.Thread(
+                target=self._server.serve_forever,
+                kwargs={"poll_interval": 0.05},
+                daemon=True,
+            ),
+            threading.Thread(target=self._schedule, daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        """
+        Stops the HTTP endpoint and the scheduler, waits for the run in progress and closes the pipeline.
+        """
+        self._stopping.set()
+        self._requests.put((None, None))
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        self.pipeline.close()
+
+    def serve_forever(self):
+        """
+        Runs the daemon until interrupted with Ctrl+C.
+        """
+        self.start()
+        print(f"NEO pipeline daemon listening on {self.base_url}")
+        try:
+            while not self._stopping.wait(1):
+                pass
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+
+def build_parser(parser=None):
+    """
+    Builds the command line parser of the daemon.
+
+    Args:
+        parser (argparse.ArgumentParser, optional): The parser to add the arguments to. Defaults to a new parser.
+
+    Returns:
+        argparse.ArgumentParser: The parser.
+    """
+    if parser is None:
+        parser = argparse.ArgumentParser(
+            description="Run the NEO pipeline as a resident, scheduled service."
+        )
+    parser.add_argument("api_key")
+    parser.add_argument("--output", help="output merged into by every run")
+    parser.add_argument(
+        "--output-format", choices=DataPipeline.OUTPUT_FORMATS, default="csv"
+    )
+    parser.add_argument(
+        "--interval", type=float, default=3600, help="seconds between runs"
+    )
+    parser.add_argument("--lookback-days", type=int, default=1)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--workers",
+        type=parse_workers,
+        default=10,
+        help="concurrent lookups, or 'auto' to adapt them across runs",
+    )
+    parser.add_argument("--orbit-cache", help="path of the orbit type cache")
+    parser.add_argument("--http-cache", help="path of the HTTP response cache")
+    return parser
+
+
+def main(argv=None):
+    """
+    Runs the daemon until interrupted.
+
+    Args:
+        argv (list of str, optional): The command line arguments. Defaults to sys.argv.
+    """
+    args = build_parser().parse_args(argv)
+    pipeline = DataPipeline(
+        args.api_key,
+        output_format=args.output_format,
+        max_workers=args.workers,
+        orbit_cache_path=args.orbit_cache,
+        http_cache_path=args.http_cache,
+    )
+    PipelineDaemon(
+        pipeline,
+        args.output,
+        interval=args.interval,
+        lookback_days=args.lookback_days,
+        host=args.host,
+        port=args.port,
+    ).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import json
+import os
+
+from neo_data_pipeline.writer import atomic_output
+
+
+class DeadLetterFile:
+    """
+    A record of the orbit lookups that failed while producing an output file.
+
+    The file is stored as JSON next to the output, and lists the NEO ids whose
+    rows were written with a pending orbit type, along with the last error of
+    each. It lets a repair pass retry only those lookups.
+
+    Attributes:
+        path (str): The path to the JSON file.
+        failed (dict): The last error message of each failed NEO id.
+    """
+
+    def __init__(self, path):
+        """
+        Initialize the DeadLetterFile, loading it from disk if it exists.
+
+        Args:
+            path (str): The path to the JSON file.
+        """
+        self.path = path
+        self.failed = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.failed = {
+                    letter["id"]: letter["error"] for letter in json.load(f)["failed"]
+                }
+
+    def __len__(self):
+        return len(self.failed)
+
+    def add(self, dead_letters):
+        """
+        Records failed lookups, replacing the previous error of the same ids.
+
+        Args:
+            dead_letters (iterable of dict): The id and error of each failed lookup.
+        """
+        for letter in dead_letters:
+            self.failed[str(letter["id"])] = letter["error"]
+
+    def remove(self, neo_ids):
+        """
+        Forgets lookups that no longer fail.
+
+        Args:
+            neo_ids (iterable of str): The ids of the NEOs.
+        """
+        for neo_id in neo_ids:
+            self.failed.pop(str(neo_id), None)
+
+    def save(self):
+        """
+        Atomically writes the file to disk, or removes it when no lookup is failed.
+        """
+        if not self.failed:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            return
+        with atomic_output(self.path) as temp_path:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "failed": [
+                            {"id": neo_id, "error": error}
+                            for neo_id, error in sorted(self.failed.items())
+                        ]
+                    },
+                    f,
+                    indent=2,
+                )
@@ -0,0 +1,167 @@
+import codecs
+import json
+
+
+class FeedStreamParser:
+    """
+    An incremental parser of the feed endpoint's response body.
+
+    Chunks of the body are fed as they are downloaded, and every NEO of the
+    `near_earth_objects` object is returned as soon as it is fully received,
+    without decoding the whole response first. Only the NEO currently being
+    received is buffered, so memory stays bounded by the size of one NEO rather
+    than the size of the response. Keys outside `near_earth_objects` are skipped.
+    """
+
+    FEED_KEY = '"near_earth_objects"'
+    _WHITESPACE = " \t\n\r"
+
+    def __init__(self):
+        """
+        Initialize the FeedStreamParser.
+        """
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._state = "seek"
+        self._date = None
+
+    def feed(self, chunk):
+        """
+        Feeds a chunk of the response body.
+
+        Args:
+            chunk (bytes): The next chunk of the body.
+
+        Returns:
+            list of tuple: The (date, neo) pairs completed by the chunk, in feed order.
+
+        Raises:
+            ValueError: If the body is not a valid feed response.
+        """
+        self._buffer += self._decoder.decode(chunk)
+        items = list(self._parse())
+        if self._pos:
+            self._buffer = self._buffer[self._pos :]
+            self._pos = 0
+        return items
+
+    def close(self):
+        """
+        Signals the end of the response body.
+
+        Raises:
+            ValueError: If the body ended before the `near_earth_objects` object was complete.
+        """
+        self._decoder.decode(b"", final=True)
+        if self._state in ("date", "neos"):
+            raise ValueError("The feed response ended unexpectedly.")
+
+    def _skip(self, pos, separators=""):
+        while pos < len(self._buffer) and self._buffer[pos] in (
+            self._WHITESPACE + separators
+        ):
+            pos += 1
+        return pos
+
+    def _consume(self, pos, tokens):
+        """
+        Consumes single-character tokens separated by whitespace.
+
+        Args:
+            pos (int): The offset to start from.
+            tokens (str): The expected tokens, in order.
+
+        Returns:
+            int, None: The offset after the last token, or None if the buffer ends first.
+
+        Raises:
+            ValueError: If an unexpected character is found.
+        """
+        for token in tokens:
+            pos = self._skip(pos)
+            if pos >= len(self._buffer):
+                return None
+            if self._buffer[pos] != token:
+                raise ValueError(
+                    f"Malformed feed response: expected {token!r}, found {self._buffer[pos]!r}."
+                )
+            pos += 1
+        return pos
+
+    def _parse(self):
+        while True:
+            if self._state == "seek":
+                index = self._buffer.find(self.FEED_KEY, self._pos)
+                if index < 0:
+                    # Keep enough of the tail to match a key split across chunks.
+                    self._pos = max(self._pos, len(self._buffer) - len(self.FEED_KEY))
+                    return
+                end = self._consume(index + len(self.FEED_KEY), ":{")
+                if end is None:
+                    self._pos = index
+                    return
+                self._pos = end
+                self._state = "date"
+            elif self._state == "date":
+                self._pos = self._skip(self._pos, ",")
+                if self._pos >= len(self._buffer):
+                    return
+                char = self._buffer[self._pos]
+                if char == "}":
+                    self._pos += 1
+                    self._state = "done"
+                    continue
+                if char != '"':
+                    raise ValueError(
+                        f"Malformed feed response: expected a date, found {char!r}."
+                    )
+                try:
+                    date, end = self._json.raw_decode(self._buffer, self._pos)
+                except json.JSONDecodeError:
+                    # The date is not fully received yet.
+                    return
+                end = self._consume(end, ":[")
+                if end is None:
+                    return
+                self._pos = end
+                self._date = date
+                self._state = "neos"
+            elif self._state == "neos":
+                self._pos = self._skip(self._pos, ",")
+                if self._pos >= len(self._buffer):
+                    return
+                if self._buffer[self._pos] == "]":
+                    self._pos += 1
+                    self._state = "date"
+                    continue
+                try:
+                    neo, end = self._json.raw_decode(self._buffer, self._pos)
+                except json.JSONDecodeError:
+                    # The NEO is not fully received yet.
+                    return
+                self._pos = end
+                yield self._date, neo
+            else:
+                self._pos = len(self._buffer)
+                return
+
+
+def iter_feed(chunks):
+    """
+    Parses a feed response body incrementally.
+
+    Args:
+        chunks (iterable of bytes): The chunks of the response body, as they are downloaded.
+
+    Yields:
+        tuple: The date and data of each NEO of the feed, in feed order.
+
+    Raises:
+        ValueError: If the body is not a valid feed response.
+    """
+    parser = FeedStreamParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    parser.close()
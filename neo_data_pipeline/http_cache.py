@@ -0,0 +1,259 @@
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from urllib.parse import urlencode
+
+CachedResponse = namedtuple(
+    "CachedResponse", ["body", "etag", "last_modified", "fresh"]
+)
+
+
+class HttpCache:
+    """
+    A persistent cache of HTTP response bodies and their validators.
+
+    Responses younger than `max_age` seconds are served without any request. Older
+    responses are revalidated with a conditional request carrying their ETag and
+    Last-Modified validators, and reused when the server answers 304 Not Modified.
+    Bodies are stored in a SQLite database, and the least recently used responses
+    are evicted once their total size exceeds `max_bytes`. Reads only note their
+    access time in memory; the notes are written in batches of TOUCH_BATCH_SIZE,
+    before any eviction and on close.
+
+    Attributes:
+        path (str): The path to the SQLite database file.
+        max_age (float): The number of seconds a response is served without revalidation.
+        max_bytes (int): The maximum total size of the cached bodies.
+        hits (int): The number of responses served from the cache without a request.
+        revalidations (int): The number of stale responses confirmed by a 304 answer.
+        misses (int): The number of requests with no cached response.
+        evictions (int): The number of responses removed to respect `max_bytes`.
+        bytes_saved (int): The total size of the bodies served from the cache.
+    """
+
+    DEFAULT_MAX_AGE = 60 * 60
+    DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+    TOUCH_BATCH_SIZE = 1000
+
+    def __init__(
+        self,
+        path="http_cache.sqlite3",
+        max_age=DEFAULT_MAX_AGE,
+        max_bytes=DEFAULT_MAX_BYTES,
+    ):
+        """
+        Initialize the HttpCache, creating the database if needed.
+
+        Args:
+            path (str, optional): The path to the SQLite database file. Defaults to "http_cache.sqlite3".
+            max_age (float, optional): The number of seconds a response is served without revalidation.
+                Defaults to one hour.
+            max_bytes (int, optional): The maximum total size of the cached bodies. Defaults to 256 MiB.
+        """
+        self.path = path
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_saved = 0
+        self._lock = threading.Lock()
+        # The access times of the reads not written yet, keyed by cache key.
+        self._touches = {}
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS http_cache ("
+            "key TEXT PRIMARY KEY, "
+            "body BLOB NOT NULL, "
+            "etag TEXT, "
+            "last_modified TEXT, "
+            "size INTEGER NOT NULL, "
+            "stored_at REAL NOT NULL, "
+            "accessed_at REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS http_cache_accessed_at "
+            "ON http_cache (accessed_at)"
+        )
+        self._connection.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM http_cache"
+            ).fetchone()[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @staticmethod
+    def key(url, params):
+        """
+        Builds the cache key of a request.
+
+        The API key is left out, so responses survive a change of key.
+
+        Args:
+            url (str): The URL of the request.
+            params (dict): The query string parameters of the request.
+
+        Returns:
+            str: The cache key.
+        """
+        query = sorted((k, str(v)) for k, v in params.items() if k != "api_key")
+        return f"{url}?{urlencode(query)}"
+
+    def get(self, key):
+        """
+        Looks up the cached response of a request.
+
+        Args:
+            key (str): The cache key of the request.
+
+        Returns:
+            CachedResponse, None: The cached body, its validators and whether it is still fresh,
+                or None if the request is not cached.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT body, etag, last_modified, stored_at FROM http_cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            body, etag, last_modified, stored_at = row
+            self._touches[key] = now
+            if len(self._touches) >= self.TOUCH_BATCH_SIZE:
+                self._write_touches()
+                self._connection.commit()
+            fresh = now - stored_at <= self.max_age
+            if fresh:
+                self.hits += 1
+                self.bytes_saved += len(body)
+            return CachedResponse(bytes(body), etag, last_modified, fresh)
+
+    def _write_touches(self):
+        if self._touches:
+            self._connection.executemany(
+                "UPDATE http_cache SET accessed_at = MAX(accessed_at, ?) WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self._touches.items()],
+            )
+            self._touches = {}
+
+    def _total_size(self):
+        cursor = self._connection.execute(
+            "SELECT COALESCE(SUM(length(body)), 0) FROM http_cache"
+        )
+        return cursor.fetchone()[0]
+
+    @staticmethod
+    def conditional_headers(cached):
+        """
+        Builds the headers of a conditional request revalidating a cached response.
+
+        Args:
+            cached (CachedResponse): The cached response, or None.
+
+        Returns:
+            dict: The If-None-Match and If-Modified-Since headers available for the response.
+        """
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+        return headers
+
+    def revalidate(self, key, cached):
+        """
+        Marks a cached response as confirmed by a 304 answer, making it fresh again.
+
+        Args:
+            key (str): The cache key of the request.
+            cached (CachedResponse): The cached response.
+        """
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "UPDATE http_cache SET stored_at = ?, accessed_at = ? WHERE key = ?",
+                (now, now, key),
+            )
+            self._connection.commit()
+            self.revalidations += 1
+            self.bytes_saved += len(cached.body)
+
+    def put(self, key, body, etag=None, last_modified=None):
+        """
+        Stores the response of a request, evicting old responses if the cache is full.
+
+        The total size is computed inside the transaction, so processes sharing the
+        file never evict more responses than there are.
+
+        Args:
+            key (str): The cache key of the request.
+            body (bytes): The body of the response. Bodies larger than `max_bytes` are not cached.
+            etag (str, optional): The ETag header of the response. Defaults to None.
+            last_modified (str, optional): The Last-Modified header of the response. Defaults to None.
+        """
+        if len(body) > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO http_cache VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, body, etag, last_modified, len(body), now, now),
+            )
+            self._write_touches()
+            excess = self._total_size() - self.max_bytes
+            if excess > 0:
+                evicted = []
+                for oldest_key, size in self._connection.execute(
+                    "SELECT key, size FROM http_cache WHERE key != ? ORDER BY accessed_at",
+                    (key,),
+                ):
+                    if excess <= 0:
+                        break
+                    evicted.append((oldest_key,))
+                    excess -= size
+                self._connection.executemany(
+                    "DELETE FROM http_cache WHERE key = ?", evicted
+                )
+                self.evictions += len(evicted)
+            self._connection.commit()
+
+    def stats(self):
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict: The total size of the cached bodies, hits, revalidations, misses, evictions and bytes saved.
+        """
+        with self._lock:
+            size = self._total_size()
+        return {
+            "bytes": size,
+            "hits": self.hits,
+            "revalidations": self.revalidations,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "bytes_saved": self.bytes_saved,
+        }
+
+    def close(self):
+        """
+        Writes the pending access times and closes the underlying database connection.
+        """
+        with self._lock:
+            self._write_touches()
+            self._connection.commit()
+            self._connection.close()
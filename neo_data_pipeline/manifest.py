@@ -0,0 +1,92 @@
+import json
+import os
+from datetime import datetime, timedelta
+
+from neo_data_pipeline.writer import atomic_output
+
+
+class RunManifest:
+    """
+    A record of the dates already ingested into an output file.
+
+    The manifest is stored as a JSON file next to the output, and lets
+    incremental runs fetch only the dates that are still missing.
+
+    Attributes:
+        path (str): The path to the JSON manifest file.
+        dates (set of str): The ingested dates in YYYY-MM-DD format.
+    """
+
+    def __init__(self, path):
+        """
+        Initialize the RunManifest, loading it from disk if it exists.
+
+        Args:
+            path (str): The path to the JSON manifest file.
+        """
+        self.path = path
+        self.dates = set()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.dates = set(json.load(f).get("dates", []))
+
+    @staticmethod
+    def date_range(start_date, end_date):
+        """
+        Lists every date between start_date and end_date, both included.
+
+        Args:
+            start_date (str): The start date in YYYY-MM-DD format.
+            end_date (str): The end date in YYYY-MM-DD format.
+
+        Returns:
+            list of str: The dates in YYYY-MM-DD format.
+        """
+        start = datetime.strptime(start_date, "%Y-%m-%d")
+        end = datetime.strptime(end_date, "%Y-%m-%d")
+        return [
+            (start + timedelta(days=offset)).strftime("%Y-%m-%d")
+            for offset in range((end - start).days + 1)
+        ]
+
+    def missing_ranges(self, start_date, end_date):
+        """
+        Groups the dates not yet ingested into consecutive ranges.
+
+        Args:
+            start_date (str): The start date in YYYY-MM-DD format.
+            end_date (str): The end date in YYYY-MM-DD format.
+
+        Returns:
+            list of tuple: The (start_date, end_date) pairs of each missing range, in chronological order.
+        """
+        ranges = []
+        for day in self.date_range(start_date, end_date):
+            if day in self.dates:
+                continue
+            previous = (
+                datetime.strptime(day, "%Y-%m-%d") - timedelta(days=1)
+            ).strftime("%Y-%m-%d")
+            if ranges and ranges[-1][1] == previous:
+                ranges[-1] = (ranges[-1][0], day)
+            else:
+                ranges.append((day, day))
+        return ranges
+
+    def add(self, start_date, end_date):
+        """
+        Marks every date between start_date and end_date as ingested.
+
+        Args:
+            start_date (str): The start date in YYYY-MM-DD format.
+            end_date (str): The end date in YYYY-MM-DD format.
+        """
+        self.dates.update(self.date_range(start_date, end_date))
+
+    def save(self):
+        """
+        Atomically writes the manifest to disk.
+        """
+        with atomic_output(self.path) as temp_path:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({"dates": sorted(self.dates)}, f, indent=2)
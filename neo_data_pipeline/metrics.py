@@ -0,0 +1,173 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+from neo_data_pipeline.writer import atomic_output
+
+
+class PipelineMetrics:
+    """
+    The measurements of a single pipeline run.
+
+    Stages record wall time in seconds, while counters record request counts,
+    retries, cache statistics, bytes downloaded, rows written and other values.
+
+    Attributes:
+        stages (dict): The wall time of each stage, in seconds.
+        counters (dict): The value of each counter.
+        started_at (float): The UNIX timestamp of the start of the run.
+    """
+
+    def __init__(self):
+        """
+        Initialize empty PipelineMetrics.
+        """
+        self.stages = {}
+        self.counters = {}
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+
+    def add_stage_time(self, name, seconds):
+        """
+        Adds wall time to a stage.
+
+        Args:
+            name (str): The name of the stage.
+            seconds (float): The time to add, in seconds.
+        """
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Times the enclosed block as part of a stage.
+
+        Args:
+            name (str): The name of the stage.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage_time(name, time.perf_counter() - start)
+
+    def time_iterator(self, name, iterable):
+        """
+        Times how long each item of an iterable takes to be produced.
+
+        Args:
+            name (str): The name of the stage the production time is added to.
+            iterable (iterable): The iterable to time.
+
+        Yields:
+            The items of the iterable.
+        """
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.add_stage_time(name, time.perf_counter() - start)
+                return
+            self.add_stage_time(name, time.perf_counter() - start)
+            yield item
+
+    def increment(self, name, value=1):
+        """
+        Increments a counter.
+
+        Args:
+            name (str): The name of the counter.
+            value (int or float, optional): The amount to add. Defaults to 1.
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def set(self, name, value):
+        """
+        Sets a counter to a value.
+
+        Args:
+            name (str): The name of the counter.
+            value (int or float): The value of the counter.
+        """
+        with self._lock:
+            self.counters[name] = value
+
+    def to_dict(self):
+        """
+        Returns the metrics as a dictionary.
+
+        Returns:
+            dict: The start timestamp, the stage times and the counters.
+        """
+        with self._lock:
+            return {
+                "started_at": self.started_at,
+                "stages": dict(self.stages),
+                "counters": dict(self.counters),
+            }
+
+    def to_json_line(self):
+        """
+        Serializes the metrics as a single line of JSON.
+
+        Returns:
+            str: The JSON line, with a trailing newline.
+        """
+        return json.dumps(self.to_dict(), sort_keys=True) + "\n"
+
+    def to_prometheus(self, prefix="neo_pipeline"):
+        """
+        Serializes the metrics in the Prometheus text exposition format.
+
+        Args:
+            prefix (str, optional): The prefix of every metric name. Defaults to "neo_pipeline".
+
+        Returns:
+            str: The metrics in Prometheus text format.
+        """
+        metrics = self.to_dict()
+        lines = [
+            f"# TYPE {prefix}_stage_seconds gauge",
+            *(
+                f'{prefix}_stage_seconds{{stage="{name}"}} {seconds}'
+                for name, seconds in sorted(metrics["stages"].items())
+            ),
+        ]
+        for name, value in sorted(metrics["counters"].items()):
+            if value is None:
+                continue
+            lines.append(f"# TYPE {prefix}_{name} gauge")
+            lines.append(f"{prefix}_{name} {float(value)}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, path, metrics_format="json"):
+        """
+        Exports the metrics to a file.
+
+        JSON lines are appended to the file, so it accumulates one line per run,
+        while the Prometheus format atomically replaces the file, as expected by
+        the node exporter textfile collector.
+
+        Args:
+            path (str): The path of the file.
+            metrics_format (str, optional): Either "json" or "prometheus". Defaults to "json".
+
+        Raises:
+            ValueError: If metrics_format is not supported.
+        """
+        if metrics_format == "json":
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(self.to_json_line())
+        elif metrics_format == "prometheus":
+            with atomic_output(path) as temp_path:
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    f.write(self.to_prometheus())
+        else:
+            raise ValueError(
+                f"Unsupported metrics_format {metrics_format!r}, expected 'json' or 'prometheus'."
+            )
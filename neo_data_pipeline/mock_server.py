@@ -0,0 +1,302 @@
+import hashlib
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from neo_data_pipeline.manifest import RunManifest
+
+
+class _MockHttpServer(ThreadingHTTPServer):
+    # The default backlog of 5 drops the connections opened by a burst of new
+    # workers, which then wait a whole second for the SYN to be retried.
+    request_queue_size = 128
+
+
+class MockNasaServer:
+    """
+    A local HTTP stand-in for NASA's NEO API.
+
+    The server answers the /feed, /neo/browse and /neo/{id} endpoints with
+    deterministic synthetic data, tagged with an ETag honored by conditional
+    requests. Browse pages list three approaches per NEO: the feed one, one of
+    Mars and a later one of Earth. The server can add latency to every response,
+    fail a share of the requests with HTTP 500, and enforce a rate limit answered
+    with HTTP 429 and a Retry-After header. It is meant for benchmarks and tests,
+    used as a context manager.
+
+    Attributes:
+        neos_per_day (int): The number of NEOs returned for each date of the feed.
+        latency (float): The delay, in seconds, added to every response.
+        error_rate (float): The share of requests failed with HTTP 500.
+        rate_limit (int): The number of requests allowed per rate_limit_window, or None for no limit.
+        rate_limit_window (float): The length, in seconds, of a rate limit window.
+        browse_dates (tuple): The first and last dates whose NEOs are listed by /neo/browse, or None.
+        request_counts (dict): The number of requests received, by status code.
+        base_url (str): The root URL of the running server.
+    """
+
+    ORBIT_CLASSES = ("APO", "ATE", "AMO", "IEO")
+
+    def __init__(
+        self,
+        neos_per_day=10,
+        latency=0.0,
+        error_rate=0.0,
+        rate_limit=None,
+        rate_limit_window=1.0,
+        seed=0,
+        browse_dates=None,
+    ):
+        """
+        Initialize the MockNasaServer.
+
+        Args:
+            neos_per_day (int, optional): The number of NEOs returned for each date of the feed. Defaults to 10.
+            latency (float, optional): The delay, in seconds, added to every response. Defaults to 0.
+            error_rate (float, optional): The share of requests failed with HTTP 500. Defaults to 0.
+            rate_limit (int, optional): The number of requests allowed per rate_limit_window. Defaults to None,
+                which disables rate limiting.
+            rate_limit_window (float, optional): The length, in seconds, of a rate limit window. Defaults to 1.
+            seed (int, optional): The seed of the random error injection. Defaults to 0.
+            browse_dates (tuple, optional): The first and last dates, in YYYY-MM-DD format, of the NEOs listed
+                by the browse endpoint. Defaults to None, which lists no NEOs.
+        """
+        self.neos_per_day = neos_per_day
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.rate_limit_window = rate_limit_window
+        self.browse_dates = browse_dates
+        self.request_counts = {}
+        self.base_url = None
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._window_requests = 0
+        self._server = None
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def start(self):
+        """
+        Starts serving on a free local port in a background thread.
+        """
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately, so Nagle's algorithm would
+            # hold the body back until the client's delayed ACK on kept-alive sockets.
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                mock._handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = _MockHttpServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={"poll_interval": 0.05},
+            daemon=True,
+        )
+        self._thread.start()
+        self.base_url = f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def stop(self):
+        """
+        Stops the server.
+        """
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def neo(self, neo_id, day):
+        """
+        Builds the synthetic NEO returned for an id.
+
+        Args:
+            neo_id (int): The ID of the near earth object.
+            day (str): The close approach date in YYYY-MM-DD format.
+
+        Returns:
+            dict: The NEO data in the format of the feed endpoint, with its orbital data.
+        """
+        epoch = (
+            int(
+                datetime.strptime(day, "%Y-%m-%d")
+                .replace(tzinfo=timezone.utc)
+                .timestamp()
+                * 1000
+            )
+            + (neo_id * 7919) % 86400000
+        )
+        diameter = 0.005 + (neo_id * 37 % 1000) / 1000
+        return {
+            "id": str(neo_id),
+            "name": f"({neo_id})",
+            "estimated_diameter": {
+                "kilometers": {
+                    "estimated_diameter_min": diameter / 2,
+                    "estimated_diameter_max": diameter,
+                }
+            },
+            "is_potentially_hazardous_asteroid": neo_id % 10 == 0,
+            "close_approach_data": [
+                {
+                    "close_approach_date": day,
+                    "epoch_date_close_approach": epoch,
+                    "relative_velocity": {
+                        "kilometers_per_hour": str(10000 + neo_id * 131 % 90000)
+                    },
+                    "miss_distance": {
+                        "kilometers": str(100000 + neo_id * 104729 % 70000000)
+                    },
+                    "orbiting_body": "Earth",
+                }
+            ],
+            "orbital_data": {
+                "orbit_class": {
+                    "orbit_class_type": self.ORBIT_CLASSES[
+                        neo_id % len(self.ORBIT_CLASSES)
+                    ]
+                }
+            },
+        }
+
+    def _admit(self):
+        with self._lock:
+            if self.rate_limit is None:
+                return 0, None
+            now = time.monotonic()
+            if now - self._window_start >= self.rate_limit_window:
+                self._window_start = now
+                self._window_requests = 0
+            self._window_requests += 1
+            remaining = self.rate_limit - self._window_requests
+            retry_after = self.rate_limit_window - (now - self._window_start)
+            return remaining, retry_after
+
+    def _handle(self, handler):
+        if self.latency:
+            time.sleep(self.latency)
+        remaining, retry_after = self._admit()
+        headers = {}
+        if self.rate_limit is not None:
+            headers["X-RateLimit-Limit"] = str(self.rate_limit)
+            headers["X-RateLimit-Remaining"] = str(max(0, remaining))
+        if remaining < 0:
+            headers["Retry-After"] = f"{retry_after:.3f}"
+            self._respond(handler, 429, {"error": "rate limited"}, headers)
+            return
+        with self._lock:
+            failed = self._random.random() < self.error_rate
+        if failed:
+            self._respond(handler, 500, {"error": "injected failure"}, headers)
+            return
+
+        url = urlparse(handler.path)
+        if url.path.endswith("/feed"):
+            query = parse_qs(url.query)
+            days = RunManifest.date_range(query["start_date"][0], query["end_date"][0])
+            payload = {
+                "near_earth_objects": {
+                    day: [
+                        self._feed_neo(self.neo(self._first_id(day) + i, day))
+                        for i in range(self.neos_per_day)
+                    ]
+                    for day in days
+                }
+            }
+            self._respond(handler, 200, payload, headers)
+        elif url.path.endswith("/neo/browse"):
+            query = parse_qs(url.query)
+            self._respond(
+                handler,
+                200,
+                self._browse_page(
+                    int(query.get("page", ["0"])[0]), int(query.get("size", ["20"])[0])
+                ),
+                headers,
+            )
+        elif "/neo/" in url.path:
+            neo_id = url.path.rsplit("/", 1)[-1]
+            if not neo_id.isdigit():
+                self._respond(handler, 404, {"error": "not found"}, headers)
+                return
+            self._respond(handler, 200, self.neo(int(neo_id), "2024-01-01"), headers)
+        else:
+            self._respond(handler, 404, {"error": "not found"}, headers)
+
+    def _browse_page(self, page, size):
+        days = RunManifest.date_range(*self.browse_dates) if self.browse_dates else []
+        neos = [
+            (self._first_id(day) + i, day)
+            for day in days
+            for i in range(self.neos_per_day)
+        ]
+        return {
+            "page": {
+                "size": size,
+                "total_elements": len(neos),
+                "total_pages": -(-len(neos) // size),
+                "number": page,
+            },
+            "near_earth_objects": [
+                self._with_history(self.neo(neo_id, day))
+                for neo_id, day in neos[page * size : (page + 1) * size]
+            ],
+        }
+
+    @staticmethod
+    def _with_history(neo):
+        approach = neo["close_approach_data"][0]
+        later = datetime.fromtimestamp(
+            approach["epoch_date_close_approach"] / 1000, timezone.utc
+        ) + timedelta(days=400)
+        neo["close_approach_data"] += [
+            dict(approach, orbiting_body="Mars"),
+            dict(
+                approach,
+                close_approach_date=later.strftime("%Y-%m-%d"),
+                epoch_date_close_approach=int(later.timestamp() * 1000),
+            ),
+        ]
+        return neo
+
+    def _first_id(self, day):
+        return datetime.strptime(day, "%Y-%m-%d").toordinal() * self.neos_per_day
+
+    @staticmethod
+    def _feed_neo(neo):
+        return {key: value for key, value in neo.items() if key != "orbital_data"}
+
+    def _respond(self, handler, status, payload, headers):
+        body = json.dumps(payload).encode()
+        if status == 200:
+            headers = dict(headers, ETag=f'"{hashlib.sha1(body).hexdigest()}"')
+            if handler.headers.get("If-None-Match") == headers["ETag"]:
+                status, body = 304, b""
+        with self._lock:
+            self.request_counts[status] = self.request_counts.get(status, 0) + 1
+        handler.send_response(status)
+        if body:
+            handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(body)
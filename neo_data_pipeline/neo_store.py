@@ -0,0 +1,343 @@
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+import threading
+
+from neo_data_pipeline.record import NeoRecord
+
+
+class NeoStore:
+    """
+    A persistent store of processed NEO records, backed by an indexed SQLite database.
+
+    Records are upserted by Id, approach date and orbiting body, so loading
+    overlapping runs keeps a single row per approach. Records without an approach
+    or an orbiting body, the latter being only set when every approach is kept, are
+    stored with an empty value instead, as SQLite keys never match on NULL. The
+    primary key serves the Id filter, and the approach date, hazard flag, orbit type
+    and category columns are indexed, so the filters of `query` are answered without
+    scanning the whole table.
+
+    Attributes:
+        path (str): The path to the SQLite database file.
+    """
+
+    COLUMNS = NeoRecord._fields
+    REAL_COLUMNS = ("diameter_min", "diameter_max", "speed", "distance")
+    INDEXED_COLUMNS = (
+        "approach_date",
+        "hazardous",
+        "orbit_type",
+        "diameter_category",
+        "proximity_category",
+    )
+    KEY_COLUMNS = ("id", "approach_date", "orbiting_body")
+    ORDER_COLUMNS = ("approach_date", "id", "distance", "speed", "diameter_max")
+    SCHEMA = (
+        "id TEXT NOT NULL, "
+        "name TEXT, "
+        "approach_date TEXT NOT NULL DEFAULT '', "
+        "diameter_min REAL, "
+        "diameter_max REAL, "
+        "speed REAL, "
+        "distance REAL, "
+        "diameter_category TEXT, "
+        "proximity_category TEXT, "
+        "hazardous INTEGER, "
+        "orbit_type TEXT, "
+        "orbiting_body TEXT NOT NULL DEFAULT '', "
+        "PRIMARY KEY (id, approach_date, orbiting_body)"
+    )
+
+    def __init__(self, path="neo_store.sqlite3"):
+        """
+        Initialize the NeoStore, creating the database if needed.
+
+        Args:
+            path (str, optional): The path to the SQLite database file. Defaults to "neo_store.sqlite3".
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(f"CREATE TABLE IF NOT EXISTS neos ({self.SCHEMA})")
+        columns = [
+            row[1] for row in self._connection.execute("PRAGMA table_info(neos)")
+        ]
+        if "orbiting_body" not in columns:
+            # Stores created before approaches were keyed by orbiting body are rebuilt, as
+            # SQLite cannot change the primary key of a table.
+            self._connection.executescript(
+                "BEGIN; "
+                "ALTER TABLE neos RENAME TO neos_unkeyed; "
+                f"CREATE TABLE neos ({self.SCHEMA}); "
+                "INSERT INTO neos SELECT *, '' FROM neos_unkeyed; "
+                "DROP TABLE neos_unkeyed; "
+                "COMMIT;"
+            )
+        # Stores created before the primary key was relied upon for Id lookups.
+        self._connection.execute("DROP INDEX IF EXISTS neos_id")
+        for column in self.INDEXED_COLUMNS:
+            self._connection.execute(
+                f"CREATE INDEX IF NOT EXISTS neos_{column} ON neos ({column})"
+            )
+        self._connection.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM neos").fetchone()[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @classmethod
+    def _to_row(cls, record):
+        if not isinstance(record, NeoRecord):
+            record = NeoRecord.from_dict(record)
+        row = []
+        for column, value in zip(cls.COLUMNS, record):
+            if column in cls.KEY_COLUMNS:
+                value = "" if value is None else str(value)
+            elif value == "":
+                value = None
+            elif value is not None and column in cls.REAL_COLUMNS:
+                value = float(value)
+            elif value is not None and column == "hazardous":
+                value = int(value if isinstance(value, bool) else value == "True")
+            elif value is not None:
+                value = str(value)
+            row.append(value)
+        return row
+
+    @classmethod
+    def _to_record(cls, row):
+        hazardous = row[cls.COLUMNS.index("hazardous")]
+        record = NeoRecord._make(row)
+        if hazardous is not None:
+            record = record._replace(hazardous=bool(hazardous))
+        if record.approach_date == "":
+            record = record._replace(approach_date=None)
+        if record.orbiting_body == "":
+            record = record._replace(orbiting_body=None)
+        return record
+
+    def upsert(self, records):
+        """
+        Inserts records, replacing the stored records with the same Id, approach date and orbiting body.
+
+        Every record is written in a single transaction, with one statement
+        executed over the whole stream of records.
+
+        Args:
+            records (iterable): An iterable (e.g., list, generator) of NeoRecords or dictionaries keyed by
+                output header.
+
+        Returns:
+            int: The number of records written.
+        """
+        placeholders = ", ".join("?" for _ in self.COLUMNS)
+        updates = ", ".join(
+            f"{column} = excluded.{column}"
+            for column in self.COLUMNS
+            if column not in self.KEY_COLUMNS
+        )
+        with self._lock:
+            cursor = self._connection.executemany(
+                f"INSERT INTO neos VALUES ({placeholders}) "
+                f"ON CONFLICT ({', '.join(self.KEY_COLUMNS)}) DO UPDATE SET {updates}",
+                (self._to_row(record) for record in records),
+            )
+            self._connection.commit()
+        return cursor.rowcount
+
+    @staticmethod
+    def _where(
+        start_date=None,
+        end_date=None,
+        neo_id=None,
+        hazardous=None,
+        orbit_type=None,
+        diameter_category=None,
+        proximity_category=None,
+        max_distance=None,
+    ):
+        conditions = []
+        params = []
+        for condition, value in (
+            ("approach_date >= ?", start_date),
+            ("approach_date <> '' AND approach_date <= ?", end_date),
+            ("id = ?", None if neo_id is None else str(neo_id)),
+            ("hazardous = ?", None if hazardous is None else int(hazardous)),
+            ("orbit_type = ?", orbit_type),
+            ("diameter_category = ?", diameter_category),
+            ("proximity_category = ?", proximity_category),
+            ("distance < ?", max_distance),
+        ):
+            if value is not None:
+                conditions.append(condition)
+                params.append(value)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        return where, params
+
+    def query(self, order_by="approach_date", limit=None, **filters):
+        """
+        Queries the stored records. Unset filters match every record.
+
+        Args:
+            order_by (str, optional): The column the records are sorted by, one of ORDER_COLUMNS. Ties are
+                broken by approach date and Id. Defaults to "approach_date".
+            limit (int, optional): The maximum number of records returned. Defaults to None, which returns
+                every match.
+            **filters: The filters of the query:
+                start_date (str): The first approach date, in YYYY-MM-DD format.
+                end_date (str): The last approach date, in YYYY-MM-DD format.
+                neo_id (str): The Id of the NEO.
+                hazardous (bool): Whether the NEO is potentially hazardous.
+                orbit_type (str): The orbit class type, e.g. "APO".
+                diameter_category (str): The diameter category, e.g. "Grande".
+                proximity_category (str): The proximity category, e.g. "Próximo".
+                max_distance (float): The distance from Earth, in km, that matching approaches are closer than.
+                    The bound is exclusive, like the bounds of the proximity categories.
+
+        Returns:
+            list of NeoRecord: The matching records.
+
+        Raises:
+            ValueError: If order_by is not supported.
+            TypeError: If an unknown filter is given.
+        """
+        if order_by not in self.ORDER_COLUMNS:
+            raise ValueError(
+                f"Unsupported order_by {order_by!r}, expected one of {self.ORDER_COLUMNS}."
+            )
+        where, params = self._where(**filters)
+        sql = f"SELECT * FROM neos{where} ORDER BY {order_by}, approach_date, id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._connection.execute(sql, params).fetchall()
+        return [self._to_record(row) for row in rows]
+
+    def iter_records(self):
+        """
+        Iterates over every stored record from a cursor, ordered by approach date and Id.
+
+        Records are decoded as they are fetched, so the store is never loaded as a
+        whole. The connection must not be shared while the iteration is running.
+
+        Yields:
+            NeoRecord: The stored records.
+        """
+        cursor = self._connection.execute(
+            "SELECT * FROM neos ORDER BY approach_date, id"
+        )
+        for row in cursor:
+            yield self._to_record(row)
+
+    def count(self, **filters):
+        """
+        Counts the stored records matching filters.
+
+        Args:
+            **filters: The filters of the query, as accepted by `query`.
+
+        Returns:
+            int: The number of matching records.
+        """
+        where, params = self._where(**filters)
+        with self._lock:
+            return self._connection.execute(
+                f"SELECT COUNT(*) FROM neos{where}", params
+            ).fetchone()[0]
+
+    def close(self):
+        """
+        Closes the underlying database connection.
+        """
+        with self._lock:
+            self._connection.close()
+
+
+def build_parser(parser=None):
+    """
+    Builds the command line parser of the store queries.
+
+    Args:
+        parser (argparse.ArgumentParser, optional): The parser to add the arguments to. Defaults to a new parser.
+
+    Returns:
+        argparse.ArgumentParser: The parser.
+    """
+    if parser is None:
+        parser = argparse.ArgumentParser(description="Query a NEO store.")
+    parser.add_argument("store", help="path of the SQLite store")
+    parser.add_argument("--start-date", help="first approach date, YYYY-MM-DD")
+    parser.add_argument("--end-date", help="last approach date, YYYY-MM-DD")
+    parser.add_argument("--id", dest="neo_id")
+    hazard = parser.add_mutually_exclusive_group()
+    hazard.add_argument(
+        "--hazardous", dest="hazardous", action="store_true", default=None
+    )
+    hazard.add_argument("--not-hazardous", dest="hazardous", action="store_false")
+    parser.add_argument("--orbit-type", help="orbit class type, e.g. APO")
+    parser.add_argument("--diameter-category")
+    parser.add_argument("--proximity-category")
+    parser.add_argument(
+        "--max-distance", type=float, help="only approaches closer than this, in km"
+    )
+    parser.add_argument(
+        "--order-by", choices=NeoStore.ORDER_COLUMNS, default="approach_date"
+    )
+    parser.add_argument("--limit", type=int)
+    parser.add_argument("--count", action="store_true", help="print the match count")
+    parser.add_argument("--format", choices=("csv", "json"), default="csv")
+    return parser
+
+
+def main(argv=None, out=None):
+    """
+    Queries a NEO store and prints the matching records as CSV or JSON lines.
+
+    Args:
+        argv (list of str, optional): The command line arguments. Defaults to sys.argv.
+        out (file, optional): The stream the results are written to. Defaults to sys.stdout.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not os.path.exists(args.store):
+        parser.error(f"store {args.store} does not exist")
+    out = out or sys.stdout
+    filters = {
+        "start_date": args.start_date,
+        "end_date": args.end_date,
+        "neo_id": args.neo_id,
+        "hazardous": args.hazardous,
+        "orbit_type": args.orbit_type,
+        "diameter_category": args.diameter_category,
+        "proximity_category": args.proximity_category,
+        "max_distance": args.max_distance,
+    }
+    with NeoStore(args.store) as store:
+        if args.count:
+            out.write(f"{store.count(**filters)}\n")
+            return
+        records = store.query(order_by=args.order_by, limit=args.limit, **filters)
+    if args.format == "json":
+        for record in records:
+            out.write(json.dumps(record.to_dict(), ensure_ascii=False) + "\n")
+    else:
+        writer = csv.writer(out)
+        writer.writerow(NeoRecord.HEADERS)
+        writer.writerows(records)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+import sqlite3
+import threading
+import time
+
+
+class OrbitCache:
+    """
+    A persistent cache mapping NEO ids to their orbit class type.
+
+    Entries are stored in a SQLite database so they are shared across runs, and
+    across the processes of a sharded backfill. Each entry expires after a
+    configurable time-to-live, and the least recently used entries are evicted
+    once the cache holds more than `max_entries` entries. Hits only note their
+    access time in memory; the notes are written in batches of TOUCH_BATCH_SIZE,
+    before any eviction and on close, so a cached run does not write per lookup.
+
+    Attributes:
+        path (str): The path to the SQLite database file.
+        ttl (float): The number of seconds an entry stays valid.
+        max_entries (int): The maximum number of entries kept in the cache.
+        hits (int): The number of lookups answered from the cache.
+        misses (int): The number of lookups not found in the cache or expired.
+        evictions (int): The number of entries removed to respect `max_entries`.
+    """
+
+    DEFAULT_TTL = 30 * 24 * 60 * 60
+    # The number of ids bound to a single query, below SQLite's variable limit.
+    QUERY_CHUNK_SIZE = 500
+    TOUCH_BATCH_SIZE = 1000
+
+    def __init__(self, path="orbit_cache.sqlite3", ttl=DEFAULT_TTL, max_entries=100000):
+        """
+        Initialize the OrbitCache, creating the database if needed.
+
+        Args:
+            path (str, optional): The path to the SQLite database file. Defaults to "orbit_cache.sqlite3".
+            ttl (float, optional): The number of seconds an entry stays valid. Defaults to 30 days.
+            max_entries (int, optional): The maximum number of entries kept in the cache. Defaults to 100000.
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        # The access times of the hits not written yet, keyed by NEO id.
+        self._touches = {}
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS orbit_cache ("
+            "neo_id TEXT PRIMARY KEY, "
+            "orbit_class TEXT NOT NULL, "
+            "stored_at REAL NOT NULL, "
+            "accessed_at REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS orbit_cache_accessed_at "
+            "ON orbit_cache (accessed_at)"
+        )
+        self._connection.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._count()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def get(self, neo_id):
+        """
+        Looks up the orbit class type of a NEO.
+
+        Args:
+            neo_id (str): The ID of the near earth object.
+
+        Returns:
+            str, None: The cached orbit class type, or None if missing or expired.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT orbit_class, stored_at FROM orbit_cache WHERE neo_id = ?",
+                (str(neo_id),),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            orbit_class, stored_at = row
+            if now - stored_at > self.ttl:
+                self._connection.execute(
+                    "DELETE FROM orbit_cache WHERE neo_id = ?", (str(neo_id),)
+                )
+                self._connection.commit()
+                self.misses += 1
+                return None
+            self._touches[str(neo_id)] = now
+            if len(self._touches) >= self.TOUCH_BATCH_SIZE:
+                self._write_touches()
+                self._connection.commit()
+            self.hits += 1
+            return orbit_class
+
+    def _count(self):
+        cursor = self._connection.execute("SELECT COUNT(*) FROM orbit_cache")
+        return cursor.fetchone()[0]
+
+    def _write_touches(self):
+        if self._touches:
+            self._connection.executemany(
+                "UPDATE orbit_cache SET accessed_at = MAX(accessed_at, ?) WHERE neo_id = ?",
+                [
+                    (accessed_at, neo_id)
+                    for neo_id, accessed_at in self._touches.items()
+                ],
+            )
+            self._touches = {}
+
+    def put(self, neo_id, orbit_class):
+        """
+        Stores the orbit class type of a NEO, evicting old entries if the cache is full.
+
+        Args:
+            neo_id (str): The ID of the near earth object.
+            orbit_class (str): The orbit class type of the NEO. None values are not cached.
+        """
+        self.put_many([(neo_id, orbit_class)])
+
+    def put_many(self, items):
+        """
+        Stores the orbit class types of many NEOs in a single transaction.
+
+        The cache size is counted inside the transaction, so processes sharing the
+        file evict exactly the entries beyond `max_entries`.
+
+        Args:
+            items (iterable of tuple): The (neo_id, orbit_class) pairs to store. None orbit classes are
+                not cached.
+        """
+        now = time.time()
+        with self._lock:
+            self._connection.executemany(
+                "INSERT INTO orbit_cache VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (neo_id) DO UPDATE SET orbit_class = excluded.orbit_class, "
+                "stored_at = excluded.stored_at, accessed_at = excluded.accessed_at",
+                [
+                    (str(neo_id), orbit_class, now, now)
+                    for neo_id, orbit_class in items
+                    if orbit_class is not None
+                ],
+            )
+            self._write_touches()
+            excess = self._count() - self.max_entries
+            if excess > 0:
+                self._connection.execute(
+                    "DELETE FROM orbit_cache WHERE neo_id IN ("
+                    "SELECT neo_id FROM orbit_cache ORDER BY accessed_at LIMIT ?)",
+                    (excess,),
+                )
+                self.evictions += excess
+            self._connection.commit()
+
+    def missing(self, neo_ids):
+        """
+        Finds the NEOs without a valid cache entry, without counting hits or misses.
+
+        Args:
+            neo_ids (iterable of str): The IDs of the near earth objects.
+
+        Returns:
+            list of str: The IDs missing from the cache or expired, in the given order.
+        """
+        neo_ids = [str(neo_id) for neo_id in neo_ids]
+        oldest = time.time() - self.ttl
+        cached = set()
+        with self._lock:
+            for start in range(0, len(neo_ids), self.QUERY_CHUNK_SIZE):
+                chunk = neo_ids[start : start + self.QUERY_CHUNK_SIZE]
+                placeholders = ", ".join("?" for _ in chunk)
+                cached.update(
+                    row[0]
+                    for row in self._connection.execute(
+                        f"SELECT neo_id FROM orbit_cache "
+                        f"WHERE neo_id IN ({placeholders}) AND stored_at >= ?",
+                        chunk + [oldest],
+                    )
+                )
+        return [neo_id for neo_id in neo_ids if neo_id not in cached]
+
+    def purge_expired(self):
+        """
+        Removes every expired entry from the cache.
+
+        Returns:
+            int: The number of entries removed.
+        """
+        with self._lock:
+            cursor = self._connection.execute(
+                "DELETE FROM orbit_cache WHERE stored_at < ?", (time.time() - self.ttl,)
+            )
+            self._connection.commit()
+            return cursor.rowcount
+
+    def stats(self):
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict: The number of entries, hits, misses and evictions.
+        """
+        return {
+            "entries": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def close(self):
+        """
+        Writes the pending access times and closes the underlying database connection.
+        """
+        with self._lock:
+            self._write_touches()
+            self._connection.commit()
+            self._connection.close()
@@ -0,0 +1,218 @@
+import os
+from datetime import date
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from neo_data_pipeline.record import NeoRecord
+from neo_data_pipeline.writer import Writer, atomic_output
+
+
+class ParquetWriter(Writer):
+    """
+    A writer storing data in a typed, compressed Parquet file.
+
+    Records are buffered into row groups of `row_group_size` rows, so a generator
+    of records is streamed to disk without being materialized. Numeric, date and
+    boolean fields keep their types, and category fields are dictionary-encoded.
+    `upsert` streams the existing file into the merged one row group at a time.
+
+    Attributes:
+        row_group_size (int): The number of records written per row group.
+        compression (str): The compression codec of the file.
+    """
+
+    extension = ".parquet"
+    CATEGORY = pa.dictionary(pa.int32(), pa.string())
+    COLUMN_TYPES = {
+        "Id": pa.string(),
+        "Nome": pa.string(),
+        "Data de Aproximação": pa.date32(),
+        "Diâmetro Mínimo (km)": pa.float64(),
+        "Diâmetro Máximo (km)": pa.float64(),
+        "Velocidade (m/s)": pa.float64(),
+        "Distância da Terra (km)": pa.float64(),
+        "Categoria Diâmetro": CATEGORY,
+        "Categoria Proximidade": CATEGORY,
+        "Potencialmente Perigoso": pa.bool_(),
+        "Tipo de Órbita": CATEGORY,
+        "Corpo Orbitado": CATEGORY,
+    }
+    # Joins the key fields of a record, which never contain control characters.
+    KEY_SEPARATOR = "\x1f"
+
+    def __init__(self, row_group_size=10000, compression="zstd"):
+        """
+        Initialize the ParquetWriter.
+
+        Args:
+            row_group_size (int, optional): The number of records written per row group. Defaults to 10000.
+            compression (str, optional): The compression codec of the file. Defaults to "zstd".
+        """
+        self.row_group_size = row_group_size
+        self.compression = compression
+
+    def schema(self, fieldnames):
+        """
+        Builds the Arrow schema of the output file.
+
+        Args:
+            fieldnames (list of str): The field names, in output order. Unknown fields are stored as strings.
+
+        Returns:
+            pyarrow.Schema: The schema of the output file.
+        """
+        return pa.schema(
+            [(name, self.COLUMN_TYPES.get(name, pa.string())) for name in fieldnames]
+        )
+
+    @staticmethod
+    def _convert(value, arrow_type):
+        if value is None or value == "":
+            return None
+        if arrow_type == pa.date32():
+            return value if isinstance(value, date) else date.fromisoformat(value)
+        if arrow_type == pa.float64():
+            return float(value)
+        if arrow_type == pa.bool_():
+            return value if isinstance(value, bool) else value == "True"
+        return str(value)
+
+    def _record_batch(self, rows, schema):
+        if tuple(schema.names) == NeoRecord.HEADERS[: len(schema)] and all(
+            isinstance(row, NeoRecord) for row in rows
+        ):
+            columns = zip(*rows)
+        else:
+            columns = ([row.get(name) for row in rows] for name in schema.names)
+        return pa.record_batch(
+            [
+                pa.array(
+                    [self._convert(value, field.type) for value in column],
+                    type=field.type,
+                )
+                for field, column in zip(schema, columns)
+            ],
+            schema=schema,
+        )
+
+    def save(self, data, fieldnames, filename):
+        """
+        Save data to a Parquet file with specified fieldnames.
+
+        Args:
+            data (iterable): An iterable (e.g., list, generator) of NeoRecords or dictionaries containing the
+                data to be written.
+            fieldnames (list of str): A list of strings representing the column names of the file.
+            filename (str): The name of the file to which the data will be written.
+        """
+        schema = self.schema(fieldnames)
+        with atomic_output(filename) as temp_path:
+            with pq.ParquetWriter(
+                temp_path, schema, compression=self.compression
+            ) as parquet_writer:
+                rows = []
+                for row in data:
+                    rows.append(row)
+                    if len(rows) >= self.row_group_size:
+                        parquet_writer.write_batch(self._record_batch(rows, schema))
+                        rows = []
+                if rows:
+                    parquet_writer.write_batch(self._record_batch(rows, schema))
+
+    def read(self, filename):
+        """
+        Reads back the records of a Parquet file.
+
+        Args:
+            filename (str): The name of the Parquet file to read.
+
+        Returns:
+            list of dict: The records of the file.
+        """
+        return pq.read_table(filename).to_pylist()
+
+    def iter_rows(self, filename):
+        """
+        Streams back the records of a Parquet file, one batch of `row_group_size` records at a time.
+
+        Args:
+            filename (str): The name of the Parquet file to read.
+
+        Yields:
+            dict: The records of the file.
+        """
+        with pq.ParquetFile(filename) as parquet_file:
+            for batch in parquet_file.iter_batches(batch_size=self.row_group_size):
+                yield from batch.to_pylist()
+
+    def upsert(self, data, fieldnames, filename, key_fields):
+        """
+        Merges data into a Parquet file, replacing records with the same key.
+
+        Only the merged records are held in memory. The existing file is streamed
+        into the new one batch by batch: batches without a replaced record are
+        copied as Arrow data, with their keys matched on whole columns, and only
+        the others are decoded to replace records in place. New records are
+        appended, and the file is replaced atomically. Files written with other
+        columns fall back to `Writer.upsert`.
+
+        Args:
+            data (iterable): An iterable (e.g., list, generator) of NeoRecords or dictionaries containing the
+                data to be merged.
+            fieldnames (list of str): A list of strings representing the column names of the file.
+            filename (str): The name of the Parquet file to which the data will be merged. It is created if
+                missing.
+            key_fields (tuple of str): The fields identifying a record.
+        """
+        if not os.path.exists(filename):
+            self.save(data, fieldnames, filename)
+            return
+        rows = {self._key(row, key_fields): row for row in data}
+        schema = self.schema(fieldnames)
+        with pq.ParquetFile(filename) as parquet_file:
+            if not parquet_file.schema_arrow.equals(schema):
+                super().upsert(rows.values(), fieldnames, filename, key_fields)
+                return
+            keys = pa.array(list(rows), type=pa.string())
+            with atomic_output(filename) as temp_path:
+                with pq.ParquetWriter(
+                    temp_path, schema, compression=self.compression
+                ) as parquet_writer:
+                    for batch in parquet_file.iter_batches(
+                        batch_size=self.row_group_size
+                    ):
+                        replaced = pc.is_in(
+                            self._batch_keys(batch, key_fields), value_set=keys
+                        )
+                        if not pc.any(replaced).as_py():
+                            parquet_writer.write_batch(batch)
+                            continue
+                        merged = [
+                            rows.pop(self._key(row, key_fields), row)
+                            for row in batch.to_pylist()
+                        ]
+                        parquet_writer.write_batch(self._record_batch(merged, schema))
+                    appended = list(rows.values())
+                    for start in range(0, len(appended), self.row_group_size):
+                        parquet_writer.write_batch(
+                            self._record_batch(
+                                appended[start : start + self.row_group_size], schema
+                            )
+                        )
+
+    @classmethod
+    def _key(cls, row, key_fields):
+        return cls.KEY_SEPARATOR.join(
+            "" if row.get(field) is None else str(row.get(field))
+            for field in key_fields
+        )
+
+    @classmethod
+    def _batch_keys(cls, batch, key_fields):
+        columns = [
+            pc.fill_null(pc.cast(batch.column(field), pa.string()), "")
+            for field in key_fields
+        ]
+        return pc.binary_join_element_wise(*columns, cls.KEY_SEPARATOR)
@@ -1,8 +1,18 @@
-import requests
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import chain
 
-from neo_data_pipeline.api_client import NasaNeoApiClient
+from neo_data_pipeline.aggregator import StreamingAggregator
+from neo_data_pipeline.concurrency_limiter import AdaptiveConcurrencyLimiter
 from neo_data_pipeline.csv_writer import CsvWriter
+from neo_data_pipeline.dead_letters import DeadLetterFile
+from neo_data_pipeline.http_cache import HttpCache
+from neo_data_pipeline.manifest import RunManifest
+from neo_data_pipeline.metrics import PipelineMetrics
+from neo_data_pipeline.orbit_cache import OrbitCache
 from neo_data_pipeline.processor import Processor
+from neo_data_pipeline.record import NeoRecord
+from neo_data_pipeline.rate_limiter import RateLimiter
 
 
 class DataPipeline:
@@ -10,60 +20,631 @@ class DataPipeline:
     A data pipeline for fetching, processing, and saving Near Earth Object (NEO) data.
 
     This class orchestrates the fetching of NEO data from NASA's API, processes the data,
-    and saves the results to a CSV file.
+    and saves the results to a CSV or Parquet file.
 
     Attributes:
-        api_client (NasaNeoApiClient): The client for accessing NASA's NEO API.
+        api_client (NasaNeoApiClient): The client for accessing NASA's NEO API, or a ReplayApiClient when
+            replaying recorded responses.
         data_processor (Processor): The processor for handling and transforming the NEO data.
-        csv_writer (CsvWriter): The writer for saving data to a CSV file.
-        fieldnames (list of str): The list of field names for the CSV file.
+        writer (Writer): The writer for saving data to the output file.
+        feed_workers (int): The maximum number of feed windows fetched concurrently.
+        orbit_cache (OrbitCache): The persistent orbit type cache, or None if disabled.
+        http_cache (HttpCache): The persistent HTTP response cache, or None if disabled.
+        snapshot_store (SnapshotStore): The store of raw API responses, or None if disabled.
+        rate_limiter (RateLimiter): The token bucket shared by every API request of the pipeline.
+        fetch_mode (str): How orbit lookups are performed, either "threads" or "async".
+        async_api_client (AsyncNasaNeoApiClient): The client used in "async" mode, or None.
+        fieldnames (list of str): The list of field names of the output file.
+        key_fields (tuple of str): The fields identifying a row when merging into an existing output.
+        metrics_path (str): The file the metrics of each run are exported to, or None.
+        metrics_format (str): The format of the exported metrics, either "json" or "prometheus".
+        metrics (PipelineMetrics): The metrics of the last run, or None before the first run.
+        stream_feed (bool): Whether feed responses are parsed incrementally as they are downloaded.
+        prefetch_orbits (bool): Whether orbit types are prefetched in bulk from the browse endpoint.
+        prefetch_pages (int): The maximum number of browse pages walked, or None for DEFAULT_PREFETCH_PAGES when
+            prefetching and the whole catalog in catalog mode.
+        summary_top_n (int): The number of closest approaches listed in the run summary, or None if disabled.
+        all_approaches (bool): Whether one row is written per close approach rather than per NEO.
+        catalog (bool): Whether the NEOs come from the browse endpoint instead of the feed.
+        aggregator (StreamingAggregator): The summary of the last run, or None.
+        concurrency_limiter (AdaptiveConcurrencyLimiter): The adaptive limit on the orbit lookup requests in flight, or
+            None for a fixed max_workers.
     """
 
-    def __init__(self, api_key):
+    FIELDNAMES = NeoRecord.HEADERS[:-1]
+    KEY_FIELDS = ("Id", "Data de Aproximação")
+    # A NEO may approach several bodies on the same day, so rows of every approach
+    # also carry and are keyed by the orbiting body.
+    APPROACH_FIELDNAMES = NeoRecord.HEADERS
+    APPROACH_KEY_FIELDS = KEY_FIELDS + ("Corpo Orbitado",)
+    FETCH_MODES = ("threads", "async")
+    OUTPUT_FORMATS = ("csv", "parquet", "sqlite")
+    METRICS_FORMATS = ("json", "prometheus")
+    DEFAULT_PREFETCH_PAGES = 50
+
+    def __init__(
+        self,
+        api_key,
+        feed_workers=4,
+        orbit_cache_path=None,
+        max_workers=10,
+        fetch_mode="threads",
+        async_concurrency=100,
+        ordered=True,
+        window=None,
+        columnar=False,
+        columnar_batch_size=None,
+        output_format="csv",
+        snapshot_dir=None,
+        replay=False,
+        metrics_path=None,
+        metrics_format="json",
+        stream_feed=False,
+        base_url=None,
+        rate_limiter=None,
+        prefetch_orbits=False,
+        prefetch_pages=None,
+        http_cache_path=None,
+        http_cache_max_age=HttpCache.DEFAULT_MAX_AGE,
+        http_cache_max_bytes=HttpCache.DEFAULT_MAX_BYTES,
+        summary_top_n=None,
+        all_approaches=False,
+        orbiting_bodies=("Earth",),
+        catalog=False,
+        concurrency_limiter=None,
+    ):
         """
         Initialize the DataPipeline with the NASA API key.
 
         Args:
             api_key (str): The NASA API key.
+            feed_workers (int, optional): The maximum number of feed windows fetched concurrently. Defaults to 4.
+            orbit_cache_path (str, optional): The path of a persistent orbit type cache shared across runs.
+                Defaults to None, which disables the cache.
+            max_workers (int or str, optional): The number of orbit lookups performed concurrently, or "auto"
+                to adapt it during the run with a default AdaptiveConcurrencyLimiter. The client's connection
+                pool is sized to match the most lookups in flight. Defaults to 10.
+            fetch_mode (str, optional): How orbit lookups are performed, either "threads" for a thread pool or
+                "async" for an asyncio event loop. Defaults to "threads".
+            async_concurrency (int, optional): The maximum number of lookups in flight in "async" mode.
+                Defaults to 100.
+            ordered (bool, optional): Whether rows are written in feed order rather than as orbit lookups
+                complete. Defaults to True.
+            window (int, optional): The maximum number of records waiting for their orbit lookup.
+                Defaults to four times max_workers.
+            columnar (bool, optional): Whether derived fields are computed in bulk on NumPy columns instead of
+                one record at a time. The output is identical. Defaults to False.
+            columnar_batch_size (int, optional): The number of NEOs extracted into columns at once in columnar
+                mode. Defaults to None, which uses the processor window when the feed is streamed or walked
+                from the catalog, so lookups start once the first window of NEOs has arrived, and
+                ColumnarProcessor.DEFAULT_BATCH_SIZE otherwise.
+            output_format (str, optional): The format of the output file, either "csv", "parquet" or "sqlite"
+                for an indexed NeoStore database. Defaults to "csv".
+            snapshot_dir (str, optional): The directory of a snapshot store recording every raw API response.
+                Defaults to None, which disables recording.
+            replay (bool, optional): Whether to run fully offline from the responses recorded in snapshot_dir
+                instead of calling the API. fetch_mode is ignored when replaying. Defaults to False.
+            metrics_path (str, optional): The file the metrics of each run are exported to. Defaults to None,
+                which disables the export.
+            metrics_format (str, optional): The format of the exported metrics, either "json" to append one
+                JSON line per run or "prometheus" to replace the file with the Prometheus text format.
+                Defaults to "json".
+            stream_feed (bool, optional): Whether feed responses are parsed incrementally, so processing and
+                orbit lookups start before the download finishes and the decoded feed is never held in memory
+                as a whole. Feed windows are then fetched one after the other. Defaults to False.
+            base_url (str, optional): The root URL of the API. Defaults to NASA's API.
+            rate_limiter (RateLimiter, optional): The token bucket throttling every request, possibly shared
+                with other pipelines. Defaults to a new RateLimiter sized for NASA's hourly quota.
+            prefetch_orbits (bool, optional): Whether the orbit types are prefetched in bulk from the browse
+                endpoint before the first run, so only NEOs missing from the catalog pages are looked up one
+                by one. The walk is skipped when the orbit cache already covers the feed, and never takes
+                more pages than there are NEOs left to look up. Ignored when replaying. Defaults to False.
+            prefetch_pages (int, optional): The maximum number of browse pages walked. Defaults to None, which
+                prefetches DEFAULT_PREFETCH_PAGES pages, and walks the whole catalog in catalog mode.
+            http_cache_path (str, optional): The path of a persistent cache of API responses, revalidated with
+                conditional requests once older than http_cache_max_age. Defaults to None, which disables it.
+            http_cache_max_age (float, optional): The number of seconds a cached response is reused without
+                revalidation. Defaults to one hour.
+            http_cache_max_bytes (int, optional): The maximum total size of the cached responses, beyond which
+                the least recently used ones are evicted. Defaults to 256 MiB.
+            summary_top_n (int, optional): When set, every run also writes a `<output>.summary.json` with the
+                category counts, hazardous share, velocity range and this many closest approaches of the rows
+                it processed, computed in the same pass, along with per-week aggregates. Incremental runs
+                summarize the whole merged output instead. Defaults to None, which disables the summary.
+            all_approaches (bool, optional): Whether one row is written per close approach listed for a NEO,
+                rather than one row per NEO from its first approach. Approaches are filtered by orbiting_bodies
+                and by the dates of the run, and processed in columnar mode. Rows then carry the orbiting body,
+                which is part of their key in incremental runs. Defaults to False.
+            orbiting_bodies (tuple of str, optional): The bodies whose approaches are kept in all_approaches
+                mode, or None for every body. Defaults to ("Earth",).
+            catalog (bool, optional): Whether the NEOs come from the browse endpoint, which lists the full
+                approach history of every NEO in the catalog, instead of the feed. Requires all_approaches, and
+                prefetch_pages bounds the number of pages walked. Defaults to False.
+            concurrency_limiter (AdaptiveConcurrencyLimiter, optional): An adaptive limit on the orbit lookup
+                requests in flight, which replaces max_workers. It grows while requests stay fast and shrinks on
+                slow requests, retries and transient failures, and its decisions are recorded in the run
+                metrics. Lookups answered by the orbit index or a cache bypass it. The learned limit carries
+                over to the next run. Not used in "async" fetch mode or when replaying. Defaults to None.
+
+        Raises:
+            ValueError: If fetch_mode, output_format or metrics_format is not supported, max_workers is neither
+                a positive integer nor "auto", replay is set without snapshot_dir, or catalog is set without
+                all_approaches or with replay.
         """
-        self.api_client = NasaNeoApiClient(api_key)
-        self.data_processor = Processor()
-        self.csv_writer = CsvWriter()
-        self.fieldnames = [
-            "Id",
-            "Nome",
-            "Data de Aproximação",
-            "Diâmetro Mínimo (km)",
-            "Diâmetro Máximo (km)",
-            "Velocidade (m/s)",
-            "Distância da Terra (km)",
-            "Categoria Diâmetro",
-            "Categoria Proximidade",
-            "Potencialmente Perigoso",
-            "Tipo de Órbita",
-        ]
-
-    def run(self, start_date, end_date, output_filename="neo_data.csv"):
+        if fetch_mode not in self.FETCH_MODES:
+            raise ValueError(
+                f"Unsupported fetch_mode {fetch_mode!r}, expected one of {self.FETCH_MODES}."
+            )
+        if output_format not in self.OUTPUT_FORMATS:
+            raise ValueError(
+                f"Unsupported output_format {output_format!r}, expected one of {self.OUTPUT_FORMATS}."
+            )
+        if metrics_format not in self.METRICS_FORMATS:
+            raise ValueError(
+                f"Unsupported metrics_format {metrics_format!r}, expected one of {self.METRICS_FORMATS}."
+            )
+        if max_workers != "auto" and not (
+            isinstance(max_workers, int) and max_workers > 0
+        ):
+            raise ValueError(
+                f"Unsupported max_workers {max_workers!r}, expected a positive integer or 'auto'."
+            )
+        if replay and not snapshot_dir:
+            raise ValueError("Replaying requires a snapshot_dir.")
+        if catalog and (replay or not all_approaches):
+            raise ValueError(
+                "Catalog runs require all_approaches and are not supported in replay."
+            )
+        self.orbit_cache = OrbitCache(orbit_cache_path) if orbit_cache_path else None
+        self.http_cache = None
+        if http_cache_path and not replay:
+            self.http_cache = HttpCache(
+                http_cache_path,
+                max_age=http_cache_max_age,
+                max_bytes=http_cache_max_bytes,
+            )
+        self.snapshot_store = None
+        if snapshot_dir:
+            from neo_data_pipeline.snapshot_store import SnapshotStore
+
+            self.snapshot_store = SnapshotStore(snapshot_dir)
+        self.rate_limiter = rate_limiter or RateLimiter()
+        if max_workers == "auto" and concurrency_limiter is None:
+            concurrency_limiter = AdaptiveConcurrencyLimiter()
+        if concurrency_limiter is not None:
+            max_workers = concurrency_limiter.max_limit
+        self.concurrency_limiter = concurrency_limiter
+        if replay:
+            from neo_data_pipeline.snapshot_store import ReplayApiClient
+
+            self.api_client = ReplayApiClient(
+                self.snapshot_store, orbit_cache=self.orbit_cache
+            )
+        else:
+            from neo_data_pipeline.api_client import NasaNeoApiClient
+
+            self.api_client = NasaNeoApiClient(
+                api_key,
+                orbit_cache=self.orbit_cache,
+                rate_limiter=self.rate_limiter,
+                pool_size=max(max_workers, feed_workers),
+                snapshot_store=self.snapshot_store,
+                base_url=base_url,
+                http_cache=self.http_cache,
+                concurrency_limiter=concurrency_limiter,
+            )
+        self.feed_workers = feed_workers
+        self.fetch_mode = fetch_mode
+        self.async_concurrency = async_concurrency
+        self.async_api_client = None
+        if fetch_mode == "async" and not replay:
+            from neo_data_pipeline.async_api_client import AsyncNasaNeoApiClient
+
+            self.async_api_client = AsyncNasaNeoApiClient(
+                api_key,
+                orbit_cache=self.orbit_cache,
+                max_connections=async_concurrency,
+                rate_limiter=self.rate_limiter,
+                snapshot_store=self.snapshot_store,
+                base_url=base_url,
+                http_cache=self.http_cache,
+            )
+            self.async_api_client.orbit_index = self.api_client.orbit_index
+        if columnar or all_approaches:
+            from neo_data_pipeline.columnar_processor import ColumnarProcessor
+
+            self.data_processor = ColumnarProcessor(
+                max_workers=max_workers,
+                window=window,
+                ordered=ordered,
+                batch_size=columnar_batch_size or ColumnarProcessor.DEFAULT_BATCH_SIZE,
+                all_approaches=all_approaches,
+                orbiting_bodies=orbiting_bodies,
+            )
+            if columnar_batch_size is None and (stream_feed or catalog):
+                self.data_processor.batch_size = self.data_processor.window
+        else:
+            self.data_processor = Processor(
+                max_workers=max_workers, window=window, ordered=ordered
+            )
+        self.writer = self.create_writer(output_format)
+        if all_approaches:
+            self.fieldnames = list(self.APPROACH_FIELDNAMES)
+            self.key_fields = self.APPROACH_KEY_FIELDS
+        else:
+            self.fieldnames = list(self.FIELDNAMES)
+            self.key_fields = self.KEY_FIELDS
+        self.metrics_path = metrics_path
+        self.metrics_format = metrics_format
+        self.metrics = None
+        self.stream_feed = stream_feed
+        self.prefetch_orbits = prefetch_orbits and not replay
+        self.prefetch_pages = prefetch_pages
+        self.summary_top_n = summary_top_n
+        self.all_approaches = all_approaches
+        self.catalog = catalog
+        self.aggregator = None
+
+    @staticmethod
+    def create_writer(output_format):
+        """
+        Creates the writer of an output format.
+
+        Args:
+            output_format (str): The format of the output file, either "csv", "parquet" or "sqlite".
+
+        Returns:
+            Writer: The writer of the format.
+        """
+        if output_format == "parquet":
+            from neo_data_pipeline.parquet_writer import ParquetWriter
+
+            return ParquetWriter()
+        if output_format == "sqlite":
+            from neo_data_pipeline.sqlite_writer import SqliteWriter
+
+            return SqliteWriter()
+        return CsvWriter()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Releases the pooled connections and the caches held by the pipeline.
+        """
+        self.api_client.close()
+        if self.orbit_cache is not None:
+            self.orbit_cache.close()
+        if self.http_cache is not None:
+            self.http_cache.close()
+        if self.snapshot_store is not None:
+            self.snapshot_store.flush()
+
+    def repair(self, output_filename=None):
+        """
+        Retries the failed orbit lookups of an output and patches their rows in place.
+
+        Only the NEO ids listed in the `<output>.failed.json` dead-letter file are
+        looked up again. Rows whose lookup succeeds get their orbit type, and the
+        ids that fail again stay in the dead-letter file for a later repair.
+
+        Args:
+            output_filename (str, optional): The name of the output file to repair. Defaults to "neo_data" with
+                the extension of the output format.
+
+        Returns:
+            dict: The number of repaired NEO ids and of NEO ids still failing.
+        """
+        if output_filename is None:
+            output_filename = "neo_data" + self.writer.extension
+        dead_letters = DeadLetterFile(output_filename + ".failed.json")
+        orbit_types = {}
+        with ThreadPoolExecutor(
+            max_workers=self.data_processor.max_workers
+        ) as executor:
+            futures = {
+                executor.submit(self.api_client.fetch_neo_orbit_type, neo_id): neo_id
+                for neo_id in dead_letters.failed
+            }
+            for future in as_completed(futures):
+                neo_id = futures[future]
+                try:
+                    orbit_types[neo_id] = future.result()
+                except Exception as e:
+                    dead_letters.add(
+                        [{"id": neo_id, "error": f"{type(e).__name__}: {e}"}]
+                    )
+        if orbit_types:
+            rows = []
+            for row in self.writer.read(output_filename):
+                neo_id = str(row["Id"])
+                if (
+                    neo_id in orbit_types
+                    and row["Tipo de Órbita"] == Processor.PENDING_ORBIT
+                ):
+                    row = dict(row)
+                    row["Tipo de Órbita"] = orbit_types[neo_id]
+                    rows.append(row)
+            self.writer.upsert(rows, self.fieldnames, output_filename, self.key_fields)
+            dead_letters.remove(orbit_types)
+        dead_letters.save()
+        print(
+            f"Repaired {len(orbit_types)} orbit lookups, {len(dead_letters)} still failing"
+        )
+        return {"repaired": len(orbit_types), "failed": len(dead_letters)}
+
+    def _client_counters(self):
+        """
+        Collects the cumulative counters of the clients, rate limiter, cache and processor.
+
+        Returns:
+            dict: The counter values, keyed by metric name.
+        """
+        clients = [self.api_client, self.async_api_client]
+        throttling = self.rate_limiter.metrics()
+        counters = {
+            "requests": sum(getattr(c, "requests_sent", 0) for c in clients),
+            "bytes_downloaded": sum(getattr(c, "bytes_downloaded", 0) for c in clients),
+            "retries": throttling["retries"],
+            "throttled_requests": throttling["throttled_requests"],
+            "throttled_seconds": throttling["throttled_seconds"],
+        }
+        if self.orbit_cache is not None:
+            stats = self.orbit_cache.stats()
+            counters["cache_hits"] = stats["hits"]
+            counters["cache_misses"] = stats["misses"]
+            counters["cache_evictions"] = stats["evictions"]
+        if self.http_cache is not None:
+            stats = self.http_cache.stats()
+            counters["http_cache_hits"] = stats["hits"]
+            counters["http_cache_revalidations"] = stats["revalidations"]
+            counters["http_cache_misses"] = stats["misses"]
+            counters["http_cache_bytes_saved"] = stats["bytes_saved"]
+        return counters
+
+    def _prefetch_orbits(self, metrics, neo_ids=None):
+        """
+        Prefetches the orbit index, falling back to per-NEO lookups if the browse endpoint fails.
+
+        The walk is skipped when every NEO of the feed is already indexed or cached,
+        takes at most one page per NEO left, and stops as soon as every NEO left is
+        indexed. NEOs it does not reach are still looked up one by one, so a feed
+        with n NEOs left costs at most min(n, prefetch_pages) pages on top of at
+        most n lookups.
+
+        Args:
+            metrics (PipelineMetrics): The metrics of the run.
+            neo_ids (iterable of str, optional): The IDs of the NEOs in the feed. Defaults to None, when the
+                feed is streamed and not known yet, which walks prefetch_pages pages.
+        """
+        import requests
+
+        pages = self.prefetch_pages
+        if pages is None:
+            pages = self.DEFAULT_PREFETCH_PAGES
+        uncovered = None
+        if neo_ids is not None:
+            uncovered = [
+                neo_id
+                for neo_id in neo_ids
+                if neo_id not in self.api_client.orbit_index
+            ]
+            if self.orbit_cache is not None:
+                uncovered = self.orbit_cache.missing(uncovered)
+            if not uncovered:
+                metrics.set("prefetched_orbits", 0)
+                return
+            pages = min(pages, len(uncovered))
+        try:
+            with metrics.stage("prefetch"):
+                indexed = self.api_client.prefetch_orbit_types(
+                    pages, self.feed_workers, uncovered
+                )
+        except requests.exceptions.RequestException as e:
+            print(f"Orbit prefetch failed, falling back to per-NEO lookups: {e}")
+            return
+        metrics.set("prefetched_orbits", indexed)
+
+    @staticmethod
+    def _report_error(error):
+        """
+        Prints the error that aborted a run.
+
+        `requests` is only imported once a run has failed, so that replay runs never load it.
+
+        Args:
+            error (Exception): The error raised by the run.
+        """
+        import requests
+
+        if isinstance(error, requests.exceptions.HTTPError):
+            print(f"HTTP error occurred while fetching data from the NASA API: {error}")
+        elif isinstance(error, requests.exceptions.RequestException):
+            print(f"An error occurred while fetching data from the NASA API: {error}")
+        elif isinstance(error, ValueError):
+            print(error)
+        else:
+            print(f"An unexpected error occurred: {error}")
+
+    def _collect_metrics(self, metrics, baseline):
+        for name, value in self._client_counters().items():
+            metrics.set(name, value - baseline.get(name, 0))
+        metrics.set("saved_requests", self.data_processor.saved_requests)
+        metrics.set("lookups", self.data_processor.lookups)
+        metrics.set("max_queue_depth", self.data_processor.max_queue_depth)
+        metrics.set("failed_lookups", len(self.data_processor.dead_letters))
+        metrics.add_stage_time("lookup", self.data_processor.lookup_seconds)
+        if self.concurrency_limiter is not None and self.fetch_mode == "threads":
+            for name, value in self.concurrency_limiter.stats().items():
+                metrics.set(f"concurrency_{name}", value)
+
+    @staticmethod
+    def _count_rows(records, metrics):
+        for record in metrics.time_iterator("process", records):
+            metrics.increment("rows_written")
+            yield record
+
+    def run(self, start_date, end_date, output_filename=None, incremental=False):
         """
         Runs the data pipeline to fetch, process, and save NEO data.
 
+        A failed orbit lookup does not abort the run: the rows of the NEO are written
+        with the `Processor.PENDING_ORBIT` orbit type, and its id and error are kept in
+        a `<output>.failed.json` dead-letter file for `repair` to retry. With
+        `summary_top_n` set, the rows processed by the run are also summarized into
+        `<output>.summary.json` as they are written. Incremental runs instead summarize
+        the whole merged output by streaming it back once written. In catalog runs, the dates bound
+        the approaches kept instead of the feed fetched.
+
+        The wall time of each stage and the request, retry, cache and row counters
+        of the run are recorded in a PipelineMetrics, exported to `metrics_path` when
+        it is set. Processing time includes waiting for orbit lookups, and lookup time
+        is summed over the concurrent workers. When the feed is streamed, its download
+        is part of the processing time.
+
         Args:
             start_date (str): The start date in YYYY-MM-DD format for fetching NEO data.
-            end_date (str): The end date in YYYY-MM-DD format for fetching NEO data.
-            output_filename (str, optional): The name of the file to which the processed data will be saved. Defaults to "neo_data.csv".
+            end_date (str): The end date in YYYY-MM-DD format for fetching NEO data. Ranges longer
+                than 7 days are split into windows fetched concurrently.
+            output_filename (str, optional): The name of the file to which the processed data will be saved.
+                Defaults to "neo_data" with the extension of the output format.
+            incremental (bool, optional): Whether to fetch only the dates missing from the run manifest kept
+                next to the output file, and merge their rows into the existing output by key_fields.
+                Defaults to False, which rewrites the output from scratch.
+
+        Returns:
+            PipelineMetrics: The metrics of the run.
         """
+        if output_filename is None:
+            output_filename = "neo_data" + self.writer.extension
+        metrics = PipelineMetrics()
+        self.metrics = metrics
+        self.aggregator = None
+        baseline = self._client_counters()
+        if self.concurrency_limiter is not None:
+            self.concurrency_limiter.reset_stats()
+        metrics.set("rows_written", 0)
+        metrics.set("succeeded", 0)
         try:
-            neo_data = self.api_client.fetch_neo_data(start_date, end_date)
-            processed_data = self.data_processor.process(neo_data, self.api_client)
-            self.csv_writer.save_to_csv(
-                processed_data, self.fieldnames, output_filename
+            if incremental:
+                manifest = RunManifest(output_filename + ".manifest.json")
+                date_ranges = manifest.missing_ranges(start_date, end_date)
+                if not date_ranges:
+                    print(f"{output_filename} is already up to date")
+                    metrics.set("succeeded", 1)
+                    return metrics
+            else:
+                date_ranges = [(start_date, end_date)]
+            if self.all_approaches:
+                self.data_processor.epoch_window = (
+                    date_ranges[0][0],
+                    date_ranges[-1][1],
+                )
+            prefetch = (
+                self.prefetch_orbits
+                and not self.catalog
+                and not self.api_client.orbit_index
+            )
+            if prefetch and self.stream_feed:
+                self._prefetch_orbits(metrics)
+            if self.catalog:
+                neo_data = self.api_client.stream_browse_neos(
+                    self.prefetch_pages, self.feed_workers
+                )
+            elif self.stream_feed:
+                neo_data = chain.from_iterable(
+                    self.api_client.stream_neo_data_range(range_start, range_end)
+                    for range_start, range_end in date_ranges
+                )
+            else:
+                neo_data = {}
+                with metrics.stage("fetch"):
+                    for range_start, range_end in date_ranges:
+                        neo_data.update(
+                            self.api_client.fetch_neo_data_range(
+                                range_start, range_end, self.feed_workers
+                            )
+                        )
+                if prefetch:
+                    self._prefetch_orbits(
+                        metrics,
+                        {str(neo["id"]) for neo in Processor.iter_neos(neo_data)},
+                    )
+            if self.async_api_client is not None:
+                processed_data = self.data_processor.process_async(
+                    neo_data, self.async_api_client, self.async_concurrency
+                )
+            else:
+                processed_data = self.data_processor.process(neo_data, self.api_client)
+            processed_data = self._count_rows(processed_data, metrics)
+            if self.summary_top_n is not None and not incremental:
+                self.aggregator = StreamingAggregator(self.summary_top_n)
+                processed_data = self.aggregator.wrap(processed_data)
+            write_start = time.perf_counter()
+            if incremental:
+                self.writer.upsert(
+                    processed_data, self.fieldnames, output_filename, self.key_fields
+                )
+                for range_start, range_end in date_ranges:
+                    manifest.add(range_start, range_end)
+                manifest.save()
+                if self.summary_top_n is not None:
+                    # Merged rows may replace earlier ones, so the summary of the whole
+                    # output is recomputed from the file rather than from this run.
+                    with metrics.stage("summary"):
+                        self.aggregator = StreamingAggregator(self.summary_top_n)
+                        self.aggregator.update(self.writer.iter_rows(output_filename))
+            else:
+                self.writer.save(processed_data, self.fieldnames, output_filename)
+            metrics.add_stage_time(
+                "write",
+                time.perf_counter() - write_start - metrics.stages.get("process", 0.0),
             )
+            dead_letters = DeadLetterFile(output_filename + ".failed.json")
+            if not incremental:
+                dead_letters.failed = {}
+            dead_letters.add(self.data_processor.dead_letters)
+            dead_letters.save()
+            if self.aggregator is not None:
+                self.aggregator.save(output_filename + ".summary.json")
+            if self.snapshot_store is not None:
+                self.snapshot_store.flush()
+            metrics.set("succeeded", 1)
             print(f"Data successfully saved to {output_filename}")
-        except requests.exceptions.HTTPError as e:
-            print(f"HTTP error occurred while fetching data from the NASA API: {e}")
-        except requests.exceptions.RequestException as e:
-            print(f"An error occurred while fetching data from the NASA API: {e}")
-        except ValueError as e:
-            print(e)
+            print(
+                f"Skipped {self.data_processor.saved_requests} duplicate orbit lookups"
+            )
+            if self.data_processor.dead_letters:
+                print(
+                    f"{len(self.data_processor.dead_letters)} orbit lookups failed, their rows are marked "
+                    f"{Processor.PENDING_ORBIT}; run repair to retry them ({dead_letters.path})"
+                )
+            throttling = self.rate_limiter.metrics()
+            print(
+                f"Rate limiting: {throttling['throttled_seconds']:.1f}s throttled over "
+                f"{throttling['throttled_requests']} requests, {throttling['retries']} retries"
+            )
+            if self.orbit_cache is not None:
+                stats = self.orbit_cache.stats()
+                print(
+                    f"Orbit cache: {stats['hits']} hits, {stats['misses']} misses, "
+                    f"{stats['evictions']} evictions"
+                )
+            print(
+                "Timings: "
+                + ", ".join(
+                    f"{stage} {seconds:.2f}s"
+                    for stage, seconds in metrics.stages.items()
+                )
+            )
         except Exception as e:
-            print(f"An unexpected error occurred: {e}")
+            self._report_error(e)
+        finally:
+            self._collect_metrics(metrics, baseline)
+            if self.metrics_path:
+                metrics.export(self.metrics_path, self.metrics_format)
+        return metrics
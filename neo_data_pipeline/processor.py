@@ -1,5 +1,12 @@
-from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, ThreadPoolExecutor, wait
 from datetime import datetime
+from functools import partial
+
+from neo_data_pipeline.record import NeoRecord
+from neo_data_pipeline.request_coalescer import RequestCoalescer
 
 
 class Processor:
@@ -8,8 +15,42 @@ class Processor:
 
     This class provides methods to convert speed, categorize diameter and proximity,
     standardize dates, and process NEO data using concurrent execution.
+
+    Attributes:
+        max_workers (int): The number of orbit lookups performed concurrently.
+        window (int): The maximum number of records waiting for their orbit lookup.
+        ordered (bool): Whether records are yielded in feed order rather than as lookups complete.
+        saved_requests (int): The number of duplicate orbit lookups avoided during the last run.
+        lookups (int): The number of orbit lookups performed during the last run.
+        lookup_seconds (float): The time spent in orbit lookups during the last run, summed over workers.
+        max_queue_depth (int): The largest number of records waiting for their orbit lookup during the last run.
+        dead_letters (list of dict): The id and error of every failed orbit lookup during the last run. The
+            records of these NEOs are yielded with the PENDING_ORBIT orbit type.
     """
 
+    PENDING_ORBIT = "PENDENTE"
+
+    def __init__(self, max_workers=10, window=None, ordered=True):
+        """
+        Initialize the Processor.
+
+        Args:
+            max_workers (int, optional): The number of orbit lookups performed concurrently. Defaults to 10.
+            window (int, optional): The maximum number of records waiting for their orbit lookup. Records are
+                only submitted once earlier ones have been yielded. Defaults to four times max_workers.
+            ordered (bool, optional): Whether records are yielded in feed order. When False, records are yielded
+                as soon as their lookup completes. Defaults to True.
+        """
+        self.max_workers = max_workers
+        self.window = window or max_workers * 4
+        self.ordered = ordered
+        self.saved_requests = 0
+        self.lookups = 0
+        self.lookup_seconds = 0.0
+        self.max_queue_depth = 0
+        self.dead_letters = []
+        self._lock = threading.Lock()
+
     @staticmethod
     def convert_kmh_to_ms(speed_kmh):
         """
@@ -74,86 +115,333 @@ class Processor:
             datetime.utcfromtimestamp(float(epoch_approach) / 1000).date().isoformat()
         )
 
+    @staticmethod
+    def iter_neos(neo_data):
+        """
+        Iterates over the NEOs of a feed, whether decoded as a whole or streamed.
+
+        Args:
+            neo_data (dict or iterable): A dictionary containing NEO data keyed by date, or an iterable of
+                (date, neo) pairs.
+
+        Returns:
+            iterator of dict: The NEO data, in feed order.
+        """
+        if isinstance(neo_data, dict):
+            return (neo for date in neo_data for neo in neo_data[date])
+        return (neo for _, neo in neo_data)
+
+    def build_record(self, neo, orbit_type):
+        """
+        Builds the processed record of a single NEO.
+
+        Args:
+            neo (dict): The NEO data as returned by the feed endpoint.
+            orbit_type (str): The orbit class type of the NEO.
+
+        Returns:
+            NeoRecord: The processed NEO information.
+        """
+        name = neo.get("name")
+        approach_data = (
+            neo.get("close_approach_data")[0]
+            if neo.get("close_approach_data")
+            else None
+        )
+
+        if approach_data:
+            approach_date = self.standardize_date(
+                approach_data.get("epoch_date_close_approach")
+            )
+            speed_kmh = (
+                float(
+                    approach_data.get("relative_velocity", {}).get(
+                        "kilometers_per_hour", 0
+                    )
+                )
+                or None
+            )
+            distance = (
+                float(approach_data.get("miss_distance", {}).get("kilometers", 0))
+                or None
+            )
+        else:
+            approach_date = None
+            speed_kmh = None
+            distance = None
+
+        diameter_min = (
+            neo.get("estimated_diameter", {})
+            .get("kilometers", {})
+            .get("estimated_diameter_min")
+        )
+        diameter_max = (
+            neo.get("estimated_diameter", {})
+            .get("kilometers", {})
+            .get("estimated_diameter_max")
+        )
+
+        speed_ms = self.convert_kmh_to_ms(speed_kmh) if speed_kmh else None
+        hazardous = neo.get("is_potentially_hazardous_asteroid")
+        diameter_category = (
+            self.categorize_diameter(diameter_max) if diameter_max else None
+        )
+        proximity_category = self.categorize_proximity(distance) if distance else None
+
+        return NeoRecord(
+            neo.get("id"),
+            name,
+            approach_date,
+            diameter_min,
+            diameter_max,
+            speed_ms,
+            distance,
+            diameter_category,
+            proximity_category,
+            hazardous,
+            orbit_type,
+        )
+
     def process(self, neo_data, api_client):
         """
         Processes NEO data by fetching additional details and categorizing the information.
 
+        Records are submitted for their orbit lookup through a bounded window, so
+        memory stays flat regardless of the size of the feed. Each distinct NEO id
+        is looked up only once per run, even when the NEO approaches on several dates.
+        A failed lookup does not abort the run: it is recorded in `dead_letters` and
+        the records of the NEO are yielded with the PENDING_ORBIT orbit type.
+
         Args:
-            neo_data (dict): A dictionary containing NEO data.
+            neo_data (dict or iterable): A dictionary containing NEO data keyed by date, or an iterable of
+                (date, neo) pairs such as the one streamed by `NasaNeoApiClient.stream_neo_data_range`.
             api_client (NasaNeoApiClient): An instance of NasaNeoApiClient to fetch additional data.
 
         Yields:
-            dict: A dictionary containing processed NEO information.
-        """
-        with ThreadPoolExecutor(max_workers=10) as executor:
-            future_to_neo = {
-                executor.submit(api_client.fetch_neo_orbit_type, neo["id"]): neo
-                for date in neo_data
-                for neo in neo_data[date]
-            }
-            for future in future_to_neo:
-                neo = future_to_neo[future]
-                name = neo.get("name")
-                approach_data = (
-                    neo.get("close_approach_data")[0]
-                    if neo.get("close_approach_data")
-                    else None
-                )
+            NeoRecord: The processed NEO information, in feed order if `ordered`
+                is set, otherwise in lookup completion order.
+        """
+        self._reset_metrics()
+        items = self._prepare(self.iter_neos(neo_data))
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            coalescer = RequestCoalescer(executor)
+            lookup = partial(self._lookup, api_client)
+            try:
+                yield from self._process_window(items, lookup, coalescer, self.window)
+            finally:
+                self.saved_requests = coalescer.saved_requests
+                executor.shutdown(cancel_futures=True)
 
-                if approach_data:
-                    approach_date = self.standardize_date(
-                        approach_data.get("epoch_date_close_approach")
-                    )
-                    speed_kmh = (
-                        float(
-                            approach_data.get("relative_velocity", {}).get(
-                                "kilometers_per_hour", 0
-                            )
-                        )
-                        or None
-                    )
-                    distance = (
-                        float(
-                            approach_data.get("miss_distance", {}).get("kilometers", 0)
-                        )
-                        or None
-                    )
-                else:
-                    approach_date = None
-                    speed_kmh = None
-                    distance = None
-
-                diameter_min = (
-                    neo.get("estimated_diameter", {})
-                    .get("kilometers", {})
-                    .get("estimated_diameter_min")
-                )
-                diameter_max = (
-                    neo.get("estimated_diameter", {})
-                    .get("kilometers", {})
-                    .get("estimated_diameter_max")
-                )
+    def _reset_metrics(self):
+        self.saved_requests = 0
+        self.lookups = 0
+        self.lookup_seconds = 0.0
+        self.max_queue_depth = 0
+        self.dead_letters = []
 
-                speed_ms = self.convert_kmh_to_ms(speed_kmh) if speed_kmh else None
-                hazardous = neo.get("is_potentially_hazardous_asteroid")
-                diameter_category = (
-                    self.categorize_diameter(diameter_max) if diameter_max else None
-                )
-                proximity_category = (
-                    self.categorize_proximity(distance) if distance else None
+    def _fail(self, neo_id, error):
+        """
+        Records a failed orbit lookup in the dead letters.
+
+        Args:
+            neo_id (str): The ID of the near earth object.
+            error (Exception): The error raised by the lookup.
+
+        Returns:
+            str: The PENDING_ORBIT placeholder used as the orbit type of the NEO.
+        """
+        with self._lock:
+            self.dead_letters.append(
+                {"id": str(neo_id), "error": f"{type(error).__name__}: {error}"}
+            )
+        return self.PENDING_ORBIT
+
+    def _lookup(self, api_client, neo_id):
+        start = time.perf_counter()
+        try:
+            return api_client.fetch_neo_orbit_type(neo_id)
+        except Exception as e:
+            return self._fail(neo_id, e)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.lookups += 1
+                self.lookup_seconds += elapsed
+
+    def _prepare(self, neos):
+        """
+        Prepares NEOs for their orbit lookup.
+
+        Args:
+            neos (iterable of dict): The NEO data as returned by the feed endpoint.
+
+        Yields:
+            tuple: The NEO id and the value later passed to `_complete` with its orbit type.
+        """
+        for neo in neos:
+            yield neo["id"], neo
+
+    def _complete(self, prepared, orbit_type):
+        """
+        Completes a prepared NEO with its orbit type.
+
+        Args:
+            prepared: The value yielded by `_prepare` for the NEO.
+            orbit_type (str): The orbit class type of the NEO.
+
+        Returns:
+            NeoRecord: The processed NEO information.
+        """
+        return self.build_record(prepared, orbit_type)
+
+    def _process_window(self, items, lookup, coalescer, window):
+        if self.ordered:
+            return self._process_ordered(items, lookup, coalescer, window)
+        return self._process_unordered(items, lookup, coalescer, window)
+
+    def _process_ordered(self, items, lookup, coalescer, window):
+        pending = deque()
+        for neo_id, prepared in items:
+            pending.append((coalescer.submit(neo_id, lookup, neo_id), prepared))
+            self.max_queue_depth = max(self.max_queue_depth, len(pending))
+            if len(pending) >= window:
+                future, prepared = pending.popleft()
+                yield self._complete(prepared, future.result())
+        while pending:
+            future, prepared = pending.popleft()
+            yield self._complete(prepared, future.result())
+
+    def _process_unordered(self, items, lookup, coalescer, window):
+        waiting = {}
+        in_flight = 0
+        exhausted = False
+        while True:
+            while not exhausted and in_flight < window:
+                item = next(items, None)
+                if item is None:
+                    exhausted = True
+                    break
+                neo_id, prepared = item
+                future = coalescer.submit(neo_id, lookup, neo_id)
+                waiting.setdefault(future, []).append(prepared)
+                in_flight += 1
+                self.max_queue_depth = max(self.max_queue_depth, in_flight)
+            if not waiting:
+                return
+            done, _ = wait(waiting, return_when=FIRST_COMPLETED)
+            for future in done:
+                for prepared in waiting.pop(future):
+                    in_flight -= 1
+                    yield self._complete(prepared, future.result())
+
+    def process_async(self, neo_data, api_client, concurrency=100):
+        """
+        Processes NEO data like `process`, performing the orbit lookups on an asyncio event loop.
+
+        All lookups run on a single event loop thread, with at most `concurrency`
+        requests in flight at once. The feed is consumed incrementally, through a
+        window of `max(window, concurrency)` records waiting for their lookup, so it
+        is never held in memory as a whole. Each distinct NEO id is looked up only
+        once per run, and failed lookups are handled as in `process`.
+
+        Args:
+            neo_data (dict or iterable): A dictionary containing NEO data keyed by date, or an iterable of
+                (date, neo) pairs.
+            api_client (AsyncNasaNeoApiClient): An instance of AsyncNasaNeoApiClient to fetch additional data.
+            concurrency (int, optional): The maximum number of lookups in flight. Defaults to 100.
+
+        Yields:
+            NeoRecord: The processed NEO information, in feed order if `ordered`
+                is set, otherwise in lookup completion order.
+        """
+        import asyncio
+
+        self._reset_metrics()
+        items = self._prepare(self.iter_neos(neo_data))
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        executor = _EventLoopExecutor(loop)
+        try:
+            asyncio.run_coroutine_threadsafe(api_client.__aenter__(), loop).result()
+            coalescer = RequestCoalescer(executor)
+            lookup = partial(
+                self._lookup_async, api_client, asyncio.Semaphore(concurrency)
+            )
+            try:
+                yield from self._process_window(
+                    items, lookup, coalescer, max(self.window, concurrency)
                 )
-                orbit_type = future.result()
-
-                yield {
-                    "Id": neo.get("id"),
-                    "Nome": name,
-                    "Data de Aproximação": approach_date,
-                    "Diâmetro Mínimo (km)": diameter_min,
-                    "Diâmetro Máximo (km)": diameter_max,
-                    "Velocidade (m/s)": speed_ms,
-                    "Distância da Terra (km)": distance,
-                    "Categoria Diâmetro": diameter_category,
-                    "Categoria Proximidade": proximity_category,
-                    "Potencialmente Perigoso": hazardous,
-                    "Tipo de Órbita": orbit_type,
-                }
+            finally:
+                self.saved_requests = coalescer.saved_requests
+                executor.shutdown(cancel_futures=True)
+                asyncio.run_coroutine_threadsafe(
+                    api_client.__aexit__(None, None, None), loop
+                ).result()
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+    async def _lookup_async(self, api_client, semaphore, neo_id):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                return await api_client.fetch_neo_orbit_type(neo_id)
+            except Exception as e:
+                return self._fail(neo_id, e)
+            finally:
+                elapsed = time.perf_counter() - start
+                with self._lock:
+                    self.lookups += 1
+                    self.lookup_seconds += elapsed
+
+
+class _EventLoopExecutor(Executor):
+    """
+    Runs coroutine functions on an event loop running in another thread.
+
+    Attributes:
+        loop (asyncio.AbstractEventLoop): The event loop running the coroutines.
+    """
+
+    def __init__(self, loop):
+        """
+        Initialize the _EventLoopExecutor.
+
+        Args:
+            loop (asyncio.AbstractEventLoop): The event loop running the coroutines.
+        """
+        self.loop = loop
+        self._futures = []
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Schedules the coroutine fn(*args, **kwargs) on the event loop.
+
+        Args:
+            fn (callable): The coroutine function to call.
+            *args: The positional arguments passed to fn.
+            **kwargs: The keyword arguments passed to fn.
+
+        Returns:
+            concurrent.futures.Future: The future of the coroutine result.
+        """
+        import asyncio
+
+        future = asyncio.run_coroutine_threadsafe(fn(*args, **kwargs), self.loop)
+        self._futures.append(future)
+        return future
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        """
+        Optionally cancels the coroutines not finished yet. The event loop itself keeps running.
+
+        Args:
+            wait (bool, optional): Ignored, coroutines are never waited for. Defaults to True.
+            cancel_futures (bool, optional): Whether the coroutines not finished yet are cancelled.
+                Defaults to False.
+        """
+        if cancel_futures:
+            for future in self._futures:
+                future.cancel()
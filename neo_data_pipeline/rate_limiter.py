@@ -0,0 +1,264 @@
+import random
+import threading
+import time
+from datetime import datetime, timezone
+
+
+class RateLimiter:
+    """
+    A token bucket shared by every request of one or more API clients.
+
+    The bucket refills continuously at `rate` tokens per second up to `capacity`
+    tokens, and each request consumes one token. The bucket is kept in sync with
+    the quota reported by the API through the `X-RateLimit-Remaining` header, and
+    can be paused entirely when the API answers with a `Retry-After` header.
+
+    Attributes:
+        rate (float): The number of tokens added per second.
+        capacity (float): The maximum number of tokens in the bucket.
+        throttled_seconds (float): The total time requests spent waiting for a token.
+        throttled_requests (int): The number of requests that had to wait for a token.
+        retries (int): The number of requests retried after a transient failure.
+        remaining (int): The last quota reported by the API, or None if never reported.
+    """
+
+    def __init__(self, rate=1000 / 3600, capacity=1000):
+        """
+        Initialize the RateLimiter.
+
+        Args:
+            rate (float, optional): The number of tokens added per second, or None to only honor pauses.
+                Defaults to NASA's hourly quota of 1000 requests spread over an hour.
+            capacity (float, optional): The maximum number of tokens in the bucket. Defaults to 1000.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.throttled_seconds = 0.0
+        self.throttled_requests = 0
+        self.retries = 0
+        self.remaining = None
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        if self.rate is None:
+            return
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+
+    def reserve(self):
+        """
+        Takes a token from the bucket.
+
+        Returns:
+            float: The number of seconds the caller must wait before sending its request.
+        """
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self._blocked_until - now)
+            if self.rate is not None:
+                self._refill(now)
+                self._tokens -= 1
+                wait = max(wait, -self._tokens / self.rate)
+            if wait > 0:
+                self.throttled_seconds += wait
+                self.throttled_requests += 1
+            return wait
+
+    def acquire(self):
+        """
+        Takes a token from the bucket, sleeping until the request is allowed.
+        """
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def update_from_headers(self, headers):
+        """
+        Synchronizes the bucket with the quota reported by the API.
+
+        Args:
+            headers (Mapping): The headers of an API response.
+        """
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is None:
+            return
+        try:
+            remaining = int(remaining)
+        except (TypeError, ValueError):
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            self.remaining = remaining
+            self._tokens = min(self._tokens, remaining)
+
+    def pause(self, seconds):
+        """
+        Blocks every request for the given number of seconds.
+
+        Args:
+            seconds (float): The number of seconds to wait before the next request.
+        """
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def record_retry(self):
+        """
+        Counts a request retried after a transient failure.
+        """
+        with self._lock:
+            self.retries += 1
+
+    def metrics(self):
+        """
+        Returns the throttling counters.
+
+        Returns:
+            dict: The time spent throttled, the number of throttled and retried requests and the last reported quota.
+        """
+        return {
+            "throttled_seconds": self.throttled_seconds,
+            "throttled_requests": self.throttled_requests,
+            "retries": self.retries,
+            "remaining": self.remaining,
+        }
+
+
+class SharedRateLimiter(RateLimiter):
+    """
+    A RateLimiter whose bucket is shared by every process it is handed to.
+
+    The tokens and pause of the bucket live in shared memory behind a process
+    lock, so pipelines running in a process pool draw from a single request
+    budget. The limiter must reach the worker processes at their creation, e.g.
+    through the initializer of a ProcessPoolExecutor. Throttling counters are
+    kept per process.
+    """
+
+    def __init__(self, rate=1000 / 3600, capacity=1000, context=None):
+        """
+        Initialize the SharedRateLimiter.
+
+        Args:
+            rate (float, optional): The number of tokens added per second, or None to only honor pauses.
+                Defaults to NASA's hourly quota of 1000 requests spread over an hour.
+            capacity (float, optional): The maximum number of tokens in the bucket. Defaults to 1000.
+            context (multiprocessing.context.BaseContext, optional): The multiprocessing context of the
+                worker processes. Defaults to the default context.
+        """
+        import multiprocessing
+
+        context = context or multiprocessing.get_context()
+        self._state = context.Array("d", 3)
+        super().__init__(rate, capacity)
+        self._lock = self._state.get_lock()
+
+    @property
+    def _tokens(self):
+        return self._state[0]
+
+    @_tokens.setter
+    def _tokens(self, value):
+        self._state[0] = value
+
+    @property
+    def _updated_at(self):
+        return self._state[1]
+
+    @_updated_at.setter
+    def _updated_at(self, value):
+        self._state[1] = value
+
+    @property
+    def _blocked_until(self):
+        return self._state[2]
+
+    @_blocked_until.setter
+    def _blocked_until(self, value):
+        self._state[2] = value
+
+
+class RetryPolicy:
+    """
+    Decides whether a failed request is retried and how long to wait before retrying.
+
+    Attributes:
+        max_retries (int): The maximum number of retries of a single request.
+        backoff_factor (float): The base delay, in seconds, of the exponential backoff.
+        max_backoff (float): The maximum delay, in seconds, between two attempts.
+    """
+
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+    def __init__(self, max_retries=5, backoff_factor=0.5, max_backoff=60):
+        """
+        Initialize the RetryPolicy.
+
+        Args:
+            max_retries (int, optional): The maximum number of retries of a single request. Defaults to 5.
+            backoff_factor (float, optional): The base delay, in seconds, of the exponential backoff. Defaults to 0.5.
+            max_backoff (float, optional): The maximum delay, in seconds, between two attempts. Defaults to 60.
+        """
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+
+    def should_retry(self, status_code, attempt):
+        """
+        Tells whether a response status is transient and the request may be retried.
+
+        Args:
+            status_code (int): The HTTP status code of the response, or None if the request failed to connect.
+            attempt (int): The number of attempts already made, starting at 0.
+
+        Returns:
+            bool: True if the request should be retried.
+        """
+        if attempt >= self.max_retries:
+            return False
+        return status_code is None or status_code in self.RETRY_STATUSES
+
+    def backoff(self, attempt):
+        """
+        Computes a jittered exponential backoff delay.
+
+        Args:
+            attempt (int): The number of attempts already made, starting at 0.
+
+        Returns:
+            float: The number of seconds to wait before the next attempt.
+        """
+        return random.uniform(
+            0, min(self.max_backoff, self.backoff_factor * 2**attempt)
+        )
+
+    @staticmethod
+    def parse_retry_after(value):
+        """
+        Parses the value of a Retry-After header.
+
+        Args:
+            value (str): Either a number of seconds or an HTTP date.
+
+        Returns:
+            float, None: The number of seconds to wait, or None if the value is missing or invalid.
+        """
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except (TypeError, ValueError):
+            pass
+        from email.utils import parsedate_to_datetime
+
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,102 @@
+from collections import namedtuple
+
+_NeoRecordFields = namedtuple(
+    "_NeoRecordFields",
+    [
+        "id",
+        "name",
+        "approach_date",
+        "diameter_min",
+        "diameter_max",
+        "speed",
+        "distance",
+        "diameter_category",
+        "proximity_category",
+        "hazardous",
+        "orbit_type",
+        "orbiting_body",
+    ],
+    defaults=(None,),
+)
+
+
+class NeoRecord(_NeoRecordFields):
+    """
+    The processed record of a single NEO.
+
+    Records are named tuples, so they are stored without a per-row dictionary and
+    written positionally by the writers. Fields are available by attribute, by
+    position, or by their output header, e.g. `record["Tipo de Órbita"]`, and
+    `get` and `keys` let records stand in for the dictionaries used elsewhere.
+
+    The orbiting body is only set, and written, when one record is produced per
+    close approach. It comes last, so the other headers are a prefix of HEADERS.
+    """
+
+    __slots__ = ()
+
+    HEADERS = (
+        "Id",
+        "Nome",
+        "Data de Aproximação",
+        "Diâmetro Mínimo (km)",
+        "Diâmetro Máximo (km)",
+        "Velocidade (m/s)",
+        "Distância da Terra (km)",
+        "Categoria Diâmetro",
+        "Categoria Proximidade",
+        "Potencialmente Perigoso",
+        "Tipo de Órbita",
+        "Corpo Orbitado",
+    )
+    _INDEX = {header: index for index, header in enumerate(HEADERS)}
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return tuple.__getitem__(self, self._INDEX[key])
+        return tuple.__getitem__(self, key)
+
+    def get(self, header, default=None):
+        """
+        Returns the value of a field by its output header.
+
+        Args:
+            header (str): The output header of the field.
+            default (optional): The value returned for unknown headers. Defaults to None.
+
+        Returns:
+            The value of the field, or default.
+        """
+        index = self._INDEX.get(header)
+        return default if index is None else tuple.__getitem__(self, index)
+
+    def keys(self):
+        """
+        Returns the output headers of the record.
+
+        Returns:
+            KeysView: The output headers, in field order.
+        """
+        return self._INDEX.keys()
+
+    def to_dict(self):
+        """
+        Converts the record to a dictionary keyed by output header.
+
+        Returns:
+            dict: The fields of the record.
+        """
+        return dict(zip(self.HEADERS, self))
+
+    @classmethod
+    def from_dict(cls, row):
+        """
+        Builds a record from a dictionary keyed by output header.
+
+        Args:
+            row (dict): The fields of the record. Missing fields are set to None.
+
+        Returns:
+            NeoRecord: The record.
+        """
+        return cls._make(row.get(header) for header in cls.HEADERS)
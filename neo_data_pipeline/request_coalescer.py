@@ -0,0 +1,47 @@
+import threading
+
+
+class RequestCoalescer:
+    """
+    Coalesces identical requests submitted to an executor.
+
+    The first submission for a key schedules the call; later submissions for the
+    same key receive the very same future instead of scheduling another call.
+
+    Attributes:
+        executor (concurrent.futures.Executor): The executor running the calls.
+        saved_requests (int): The number of submissions answered by an existing future.
+    """
+
+    def __init__(self, executor):
+        """
+        Initialize the RequestCoalescer.
+
+        Args:
+            executor (concurrent.futures.Executor): The executor running the calls.
+        """
+        self.executor = executor
+        self.saved_requests = 0
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def submit(self, key, fn, *args):
+        """
+        Schedules fn(*args) once per key.
+
+        Args:
+            key (hashable): The key identifying the request.
+            fn (callable): The function to call.
+            *args: The arguments passed to fn.
+
+        Returns:
+            concurrent.futures.Future: The future shared by every submission with this key.
+        """
+        with self._lock:
+            future = self._futures.get(key)
+            if future is None:
+                future = self.executor.submit(fn, *args)
+                self._futures[key] = future
+            else:
+                self.saved_requests += 1
+            return future
@@ -0,0 +1,232 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+
+from neo_data_pipeline.manifest import RunManifest
+from neo_data_pipeline.writer import atomic_output
+
+
+class SnapshotStore:
+    """
+    A compressed, content-addressed store of raw API responses.
+
+    Each payload is serialized canonically, gzip-compressed and stored under the
+    SHA-256 digest of its content, so identical payloads are only stored once. An
+    index maps request keys, such as "feed/2024-06-01" or "neo/3542519", to the
+    digest of their latest payload.
+
+    Attributes:
+        root (str): The directory holding the store.
+    """
+
+    def __init__(self, root):
+        """
+        Initialize the SnapshotStore, creating its directory if needed.
+
+        Args:
+            root (str): The directory holding the store.
+        """
+        self.root = root
+        self._index_path = os.path.join(root, "index.json")
+        self._lock = threading.Lock()
+        self._dirty = False
+        os.makedirs(os.path.join(root, "objects"), exist_ok=True)
+        self._index = {}
+        if os.path.exists(self._index_path):
+            with open(self._index_path, encoding="utf-8") as f:
+                self._index = json.load(f)
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def _object_path(self, digest):
+        return os.path.join(self.root, "objects", digest[:2], digest[2:] + ".json.gz")
+
+    def put(self, key, payload):
+        """
+        Stores a payload under a request key.
+
+        Args:
+            key (str): The request key.
+            payload: The JSON-serializable payload.
+
+        Returns:
+            str: The SHA-256 digest of the payload.
+        """
+        content = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()
+        digest = hashlib.sha256(content).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with atomic_output(path) as temp_path:
+                with gzip.open(temp_path, "wb") as f:
+                    f.write(content)
+        with self._lock:
+            if self._index.get(key) != digest:
+                self._index[key] = digest
+                self._dirty = True
+        return digest
+
+    def get(self, key):
+        """
+        Loads the payload stored under a request key.
+
+        Args:
+            key (str): The request key.
+
+        Returns:
+            The payload.
+
+        Raises:
+            KeyError: If no payload is stored under the key.
+        """
+        with gzip.open(self._object_path(self._index[key]), "rb") as f:
+            return json.loads(f.read())
+
+    def keys(self, prefix=""):
+        """
+        Lists the request keys of the store.
+
+        Args:
+            prefix (str, optional): Only keys starting with this prefix are listed. Defaults to "".
+
+        Returns:
+            list of str: The sorted request keys.
+        """
+        return sorted(key for key in self._index if key.startswith(prefix))
+
+    def flush(self):
+        """
+        Atomically writes the index to disk if it changed.
+        """
+        with self._lock:
+            if not self._dirty:
+                return
+            with atomic_output(self._index_path) as temp_path:
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    json.dump(self._index, f, sort_keys=True, indent=0)
+            self._dirty = False
+
+
+class ReplayApiClient:
+    """
+    An offline stand-in for NasaNeoApiClient answering from a SnapshotStore.
+
+    Attributes:
+        snapshot_store (SnapshotStore): The store holding the recorded responses.
+        orbit_cache (OrbitCache): An optional cache consulted for NEOs without a recorded response.
+        orbit_index (dict): Orbit class types known in advance, keyed by NEO id, consulted first.
+    """
+
+    def __init__(self, snapshot_store, orbit_cache=None):
+        """
+        Initialize the ReplayApiClient.
+
+        Args:
+            snapshot_store (SnapshotStore): The store holding the recorded responses.
+            orbit_cache (OrbitCache, optional): A cache consulted for NEOs without a recorded response.
+                Defaults to None.
+        """
+        self.snapshot_store = snapshot_store
+        self.orbit_cache = orbit_cache
+        self.orbit_index = {}
+
+    def close(self):
+        """
+        Does nothing, as the replay client holds no connection.
+        """
+
+    def fetch_neo_data(self, start_date, end_date):
+        """
+        Loads the recorded feed of a date range.
+
+        Args:
+            start_date (str): The start date in YYYY-MM-DD format.
+            end_date (str): The end date in YYYY-MM-DD format.
+
+        Returns:
+            dict: A dictionary containing data about near earth objects, keyed by date.
+
+        Raises:
+            ValueError: If the feed of any date of the range was not recorded.
+        """
+        neo_data = {}
+        for day in RunManifest.date_range(start_date, end_date):
+            key = f"feed/{day}"
+            if key not in self.snapshot_store:
+                raise ValueError(f"No snapshot of the feed for {day}.")
+            neo_data[day] = self.snapshot_store.get(key)
+        return neo_data
+
+    def fetch_neo_data_range(self, start_date, end_date, max_workers=4):
+        """
+        Loads the recorded feed of a date range.
+
+        Args:
+            start_date (str): The start date in YYYY-MM-DD format.
+            end_date (str): The end date in YYYY-MM-DD format.
+            max_workers (int, optional): Ignored, kept for compatibility with NasaNeoApiClient.
+
+        Returns:
+            dict: A dictionary containing data about near earth objects, keyed by date.
+
+        Raises:
+            ValueError: If the feed of any date of the range was not recorded.
+        """
+        return self.fetch_neo_data(start_date, end_date)
+
+    def stream_neo_data_range(self, start_date, end_date, chunk_size=65536):
+        """
+        Iterates over the recorded feed of a date range.
+
+        Args:
+            start_date (str): The start date in YYYY-MM-DD format.
+            end_date (str): The end date in YYYY-MM-DD format.
+            chunk_size (int, optional): Ignored, kept for compatibility with NasaNeoApiClient.
+
+        Yields:
+            tuple: The date and data of each NEO, in feed order.
+
+        Raises:
+            ValueError: If the feed of any date of the range was not recorded.
+        """
+        for day in RunManifest.date_range(start_date, end_date):
+            key = f"feed/{day}"
+            if key not in self.snapshot_store:
+                raise ValueError(f"No snapshot of the feed for {day}.")
+            for neo in self.snapshot_store.get(key):
+                yield day, neo
+
+    def fetch_neo_orbit_type(self, neo_id):
+        """
+        Loads the orbit type of a NEO from its recorded response.
+
+        Args:
+            neo_id (str): The ID of the near earth object.
+
+        Returns:
+            str, None: The orbit class type of the NEO, or None if its recorded response has none.
+
+        Raises:
+            ValueError: If the orbit type was neither indexed, recorded nor cached, so that its rows are
+                marked for repair instead of silently written without one.
+        """
+        orbit_type = self.orbit_index.get(str(neo_id))
+        if orbit_type is not None:
+            return orbit_type
+        key = f"neo/{neo_id}"
+        if key in self.snapshot_store:
+            # The same extraction as NasaNeoApiClient.extract_orbit_type, without importing requests.
+            return (
+                self.snapshot_store.get(key)
+                .get("orbital_data", {})
+                .get("orbit_class", {})
+                .get("orbit_class_type")
+            )
+        if self.orbit_cache is not None:
+            orbit_type = self.orbit_cache.get(neo_id)
+            if orbit_type is not None:
+                return orbit_type
+        raise ValueError(f"No snapshot of the orbit lookup of NEO {neo_id}.")
@@ -0,0 +1,77 @@
+import os
+
+from neo_data_pipeline.neo_store import NeoStore
+from neo_data_pipeline.writer import Writer, atomic_output
+
+
+class SqliteWriter(Writer):
+    """
+    A writer storing data in an indexed NeoStore database.
+
+    `save` builds a new database under a temporary name and moves it into place,
+    like the other writers, while `upsert` merges records into the existing
+    database in a single transaction instead of rewriting it. The columns of the
+    store are the NeoRecord fields, so the fieldnames are not used.
+    """
+
+    extension = ".sqlite3"
+
+    def save(self, data, fieldnames, filename):
+        """
+        Save data to a new NeoStore database.
+
+        Args:
+            data (iterable): An iterable (e.g., list, generator) of NeoRecords or dictionaries containing the
+                data to be written.
+            fieldnames (list of str): The field names, unused as the store has a fixed schema.
+            filename (str): The name of the database to which the data will be written.
+        """
+        with atomic_output(filename) as temp_path:
+            with NeoStore(temp_path) as store:
+                store.upsert(data)
+
+    def read(self, filename):
+        """
+        Reads back the records of a NeoStore database.
+
+        Args:
+            filename (str): The name of the database to read.
+
+        Returns:
+            list of dict: The records of the database, ordered by approach date and Id.
+        """
+        with NeoStore(filename) as store:
+            return [record.to_dict() for record in store.query()]
+
+    def iter_rows(self, filename):
+        """
+        Streams back the records of a NeoStore database from a cursor.
+
+        Args:
+            filename (str): The name of the database to read.
+
+        Yields:
+            dict: The records of the database, ordered by approach date and Id.
+        """
+        with NeoStore(filename) as store:
+            for record in store.iter_records():
+                yield record.to_dict()
+
+    def upsert(self, data, fieldnames, filename, key_fields):
+        """
+        Merges data into a NeoStore database, replacing records with the same Id, approach date and orbiting body.
+
+        Args:
+            data (iterable): An iterable (e.g., list, generator) of NeoRecords or dictionaries containing the
+                data to be merged.
+            fieldnames (list of str): The field names, unused as the store has a fixed schema.
+            filename (str): The name of the database to which the data will be merged. It is created if
+                missing.
+            key_fields (tuple of str): The fields identifying a record, always Id, approach date and orbiting
+                body in the store. Records without an orbiting body match on Id and approach date alone.
+        """
+        if not os.path.exists(filename):
+            self.save(data, fieldnames, filename)
+            return
+        with NeoStore(filename) as store:
+            store.upsert(data)
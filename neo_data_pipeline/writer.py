@@ -0,0 +1,107 @@
+import os
+import uuid
+from contextlib import contextmanager
+
+
+@contextmanager
+def atomic_output(filename):
+    """
+    Provides a temporary path which replaces filename once fully written.
+
+    The temporary path lies in the directory of filename, and is only moved
+    over it if the block completes, so a crash never leaves a half-written file.
+
+    Args:
+        filename (str): The name of the file to write.
+
+    Yields:
+        str: The temporary path to write to.
+    """
+    directory, name = os.path.split(os.path.abspath(filename))
+    temp_path = os.path.join(directory, f".{name}.{uuid.uuid4().hex}.tmp")
+    try:
+        yield temp_path
+        os.replace(temp_path, filename)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class Writer:
+    """
+    The interface of every output writer used by the DataPipeline.
+
+    Subclasses consume the records produced by the processor and store them
+    under the given filename.
+
+    Attributes:
+        extension (str): The file extension of the files produced by the writer.
+    """
+
+    extension = ""
+
+    def save(self, data, fieldnames, filename):
+        """
+        Save data to a file with specified fieldnames.
+
+        Args:
+            data (iterable): An iterable (e.g., list, generator) of dictionaries containing the data to be written.
+            fieldnames (list of str): A list of strings representing the field names, in output order.
+            filename (str): The name of the file to which the data will be written.
+        """
+        raise NotImplementedError
+
+    def read(self, filename):
+        """
+        Reads back the records of a file written by this writer.
+
+        Args:
+            filename (str): The name of the file to read.
+
+        Returns:
+            iterable of dict: The records of the file.
+        """
+        raise NotImplementedError
+
+    def iter_rows(self, filename):
+        """
+        Streams back the records of a file written by this writer, without loading them all.
+
+        Subclasses override it when their format can be read incrementally.
+
+        Args:
+            filename (str): The name of the file to read.
+
+        Yields:
+            dict: The records of the file, in file order.
+        """
+        yield from self.read(filename)
+
+    def upsert(self, data, fieldnames, filename, key_fields):
+        """
+        Merges data into an existing file, replacing records with the same key.
+
+        Existing records keep their position, and new records are appended. The
+        file is rewritten atomically. Missing key values match empty ones, as
+        formats such as CSV read None back as an empty string.
+
+        Args:
+            data (iterable): An iterable (e.g., list, generator) of dictionaries containing the data to be merged.
+            fieldnames (list of str): A list of strings representing the field names, in output order.
+            filename (str): The name of the file to which the data will be merged.
+            key_fields (tuple of str): The fields identifying a record.
+        """
+
+        def key(row):
+            return tuple(
+                "" if row.get(field) is None else str(row.get(field))
+                for field in key_fields
+            )
+
+        rows = {}
+        if os.path.exists(filename):
+            rows = {key(row): row for row in self.read(filename)}
+        for row in data:
+            rows[key(row)] = row
+        self.save(rows.values(), fieldnames, filename)
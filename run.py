@@ -1,15 +1,13 @@
 import sys
 
-from neo_data_pipeline.pipeline import DataPipeline
+from neo_data_pipeline.cli import COMMANDS, main
 
 if __name__ == "__main__":
-    if len(sys.argv) != 4:
+    args = sys.argv[1:]
+    if args and args[0] in COMMANDS:
+        sys.exit(main(args))
+    if len(args) != 3:
         print("Usage: python run.py <api_key> <start_date> <end_date>")
+        print(f"   or: python run.py {{{','.join(COMMANDS)}}} ...")
         sys.exit(1)
-
-    api_key = sys.argv[1]
-    start_date = sys.argv[2]
-    end_date = sys.argv[3]
-
-    pipeline = DataPipeline(api_key)
-    pipeline.run(start_date, end_date)
+    sys.exit(main(["fetch"] + args))
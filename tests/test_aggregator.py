@@ -0,0 +1,121 @@
+import json
+import os
+import tempfile
+import unittest
+
+from neo_data_pipeline.aggregator import StreamingAggregator
+from neo_data_pipeline.record import NeoRecord
+
+
+def make_record(neo_id, distance, speed, hazardous=False, diameter="Médio"):
+    return NeoRecord(
+        neo_id,
+        f"NEO {neo_id}",
+        "2024-06-01",
+        0.1,
+        0.2,
+        speed,
+        distance,
+        diameter,
+        "Próximo",
+        hazardous,
+        "APO",
+    )
+
+
+class TestStreamingAggregator(unittest.TestCase):
+    def test_summary(self):
+        records = [
+            make_record("1", 500.0, 10.0, hazardous=True),
+            make_record("2", 100.0, 30.0, diameter="Grande"),
+            make_record("3", None, None),
+            make_record("4", 300.0, 20.0, hazardous=True),
+        ]
+        aggregator = StreamingAggregator(top_n=2)
+
+        self.assertEqual(list(aggregator.wrap(records)), records)
+
+        summary = aggregator.summary()
+        self.assertEqual(summary["rows"], 4)
+        self.assertEqual(summary["diameter_categories"], {"Médio": 3, "Grande": 1})
+        self.assertEqual(summary["proximity_categories"], {"Próximo": 4})
+        self.assertEqual(summary["hazardous"], 2)
+        self.assertEqual(summary["hazardous_share"], 0.5)
+        self.assertEqual((summary["min_speed"], summary["max_speed"]), (10.0, 30.0))
+        self.assertEqual([row["Id"] for row in summary["closest"]], ["2", "4"])
+
+    def test_closest_keeps_feed_order_on_ties(self):
+        aggregator = StreamingAggregator(top_n=2)
+        for neo_id in "abc":
+            aggregator.add(make_record(neo_id, 100.0, 1.0))
+
+        self.assertEqual([row["Id"] for row in aggregator.closest()], ["a", "b"])
+
+    def test_windows(self):
+        aggregator = StreamingAggregator(window_days=7)
+        for neo_id, approach_date, speed in [
+            ("1", "2024-06-05", 10.0),
+            ("2", "2024-06-06", 30.0),
+            ("3", "2024-06-13", 20.0),
+        ]:
+            aggregator.add(
+                make_record(neo_id, 100.0, speed, hazardous=neo_id == "1")._replace(
+                    approach_date=approach_date
+                )
+            )
+
+        windows = aggregator.summary()["windows"]
+        # 1970-01-01 was a Thursday, so the windows run from Thursday to Wednesday.
+        self.assertEqual(
+            [(w["start"], w["end"], w["rows"]) for w in windows],
+            [
+                ("2024-05-30", "2024-06-05", 1),
+                ("2024-06-06", "2024-06-12", 1),
+                ("2024-06-13", "2024-06-19", 1),
+            ],
+        )
+        self.assertEqual(windows[0]["hazardous_share"], 1.0)
+        self.assertEqual(
+            (windows[1]["min_speed"], windows[1]["max_speed"]), (30.0, 30.0)
+        )
+
+    def test_rows_read_back_as_strings(self):
+        records = [
+            make_record("1", 500.0, 10.0, hazardous=True),
+            make_record("2", 100.0, 30.0),
+        ]
+        aggregator = StreamingAggregator(top_n=1)
+        aggregator.update(
+            {
+                key: "" if value is None else str(value)
+                for key, value in record.to_dict().items()
+            }
+            for record in records
+        )
+
+        summary = aggregator.summary()
+        self.assertEqual(summary["hazardous"], 1)
+        self.assertEqual((summary["min_speed"], summary["max_speed"]), (10.0, 30.0))
+        self.assertEqual(summary["closest"][0]["Distância da Terra (km)"], 100.0)
+        self.assertIs(summary["closest"][0]["Potencialmente Perigoso"], False)
+
+    def test_empty(self):
+        summary = StreamingAggregator().summary()
+
+        self.assertEqual(summary["rows"], 0)
+        self.assertIsNone(summary["hazardous_share"])
+        self.assertEqual(summary["closest"], [])
+
+    def test_save(self):
+        aggregator = StreamingAggregator()
+        aggregator.add(make_record("1", 500.0, 10.0).to_dict())
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "neo_data.csv.summary.json")
+            aggregator.save(path)
+            with open(path, encoding="utf-8") as f:
+                self.assertEqual(json.load(f), aggregator.summary())
+
+
+if __name__ == "__main__":
+    unittest.main()
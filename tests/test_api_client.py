@@ -1,13 +1,19 @@
+import json
+import tempfile
 import unittest
 from unittest.mock import patch, MagicMock
 
+import requests
 from requests.exceptions import RequestException
 
 from neo_data_pipeline.api_client import NasaNeoApiClient
+from neo_data_pipeline.concurrency_limiter import AdaptiveConcurrencyLimiter
+from neo_data_pipeline.rate_limiter import RateLimiter, RetryPolicy
+from neo_data_pipeline.snapshot_store import ReplayApiClient, SnapshotStore
 
 
 class TestNasaNeoApiClient(unittest.TestCase):
-    @patch("neo_data_pipeline.api_client.requests.get")
+    @patch.object(requests.Session, "get")
     def test_fetch_neo_data_success(self, mock_get):
         mock_response = MagicMock()
         mock_response.json.return_value = {"near_earth_objects": {"2024-05-01": []}}
@@ -25,16 +31,19 @@ class TestNasaNeoApiClient(unittest.TestCase):
                 "end_date": "2024-05-07",
                 "api_key": "test_key",
             },
+            timeout=client.timeout,
+            stream=False,
+            headers=None,
         )
 
-    @patch("neo_data_pipeline.api_client.requests.get")
+    @patch.object(requests.Session, "get")
     def test_fetch_neo_data_failure(self, mock_get):
         mock_get.side_effect = RequestException()
         client = NasaNeoApiClient("invalid_key")
         with self.assertRaises(RequestException):
             client.fetch_neo_data("2024-05-01", "2024-05-07")
 
-    @patch("neo_data_pipeline.api_client.requests.get")
+    @patch.object(requests.Session, "get")
     def test_fetch_neo_orbit_type_success(self, mock_get):
         mock_response = MagicMock()
         mock_response.json.return_value = {
@@ -53,15 +62,292 @@ class TestNasaNeoApiClient(unittest.TestCase):
             params={
                 "api_key": "test_key",
             },
+            timeout=client.timeout,
+            stream=False,
+            headers=None,
         )
 
-    @patch("neo_data_pipeline.api_client.requests.get")
+    @patch.object(requests.Session, "get")
     def test_fetch_neo_orbit_type_failure(self, mock_get):
         mock_get.side_effect = RequestException()
         client = NasaNeoApiClient("invalid_key")
         with self.assertRaises(RequestException):
             client.fetch_neo_orbit_type(1)
 
+    @patch.object(requests.Session, "get")
+    def test_fetch_neo_orbit_type_uses_cache(self, mock_get):
+        mock_cache = MagicMock()
+        mock_cache.get.return_value = "APO"
+
+        client = NasaNeoApiClient("test_key", orbit_cache=mock_cache)
+
+        self.assertEqual(client.fetch_neo_orbit_type("1"), "APO")
+        mock_get.assert_not_called()
+
+    @patch.object(requests.Session, "get")
+    def test_fetch_neo_orbit_type_populates_cache(self, mock_get):
+        mock_response = MagicMock()
+        mock_response.json.return_value = {
+            "orbital_data": {"orbit_class": {"orbit_class_type": "ATE"}}
+        }
+        mock_get.return_value = mock_response
+        mock_cache = MagicMock()
+        mock_cache.get.return_value = None
+
+        client = NasaNeoApiClient("test_key", orbit_cache=mock_cache)
+
+        self.assertEqual(client.fetch_neo_orbit_type("1"), "ATE")
+        mock_cache.put.assert_called_once_with("1", "ATE")
+
+    def test_split_date_range(self):
+        windows = NasaNeoApiClient.split_date_range("2024-05-01", "2024-05-20")
+
+        self.assertEqual(
+            windows,
+            [
+                ("2024-05-01", "2024-05-07"),
+                ("2024-05-08", "2024-05-14"),
+                ("2024-05-15", "2024-05-20"),
+            ],
+        )
+
+    def test_split_date_range_single_day(self):
+        windows = NasaNeoApiClient.split_date_range("2024-05-01", "2024-05-01")
+
+        self.assertEqual(windows, [("2024-05-01", "2024-05-01")])
+
+    def test_split_date_range_invalid(self):
+        with self.assertRaises(ValueError):
+            NasaNeoApiClient.split_date_range("2024-05-10", "2024-05-01")
+
+    @patch.object(NasaNeoApiClient, "fetch_neo_data")
+    def test_fetch_neo_data_range_merges_windows(self, mock_fetch):
+        mock_fetch.side_effect = lambda start, end: {start: [{"id": start}]}
+
+        client = NasaNeoApiClient("test_key")
+        neo_data = client.fetch_neo_data_range("2024-05-01", "2024-05-20")
+
+        self.assertEqual(list(neo_data), ["2024-05-01", "2024-05-08", "2024-05-15"])
+        self.assertEqual(mock_fetch.call_count, 3)
+
+    @patch.object(requests.Session, "get")
+    def test_stream_neo_data(self, mock_get):
+        body = json.dumps(
+            {
+                "element_count": 2,
+                "near_earth_objects": {
+                    "2024-05-01": [{"id": "1"}],
+                    "2024-05-02": [{"id": "2"}],
+                },
+            }
+        ).encode()
+        mock_response = MagicMock(status_code=200, headers={})
+        mock_response.iter_content.return_value = [body[:20], body[20:]]
+        mock_get.return_value = mock_response
+        mock_store = MagicMock()
+
+        client = NasaNeoApiClient("test_key", snapshot_store=mock_store)
+        items = list(client.stream_neo_data("2024-05-01", "2024-05-02"))
+
+        self.assertEqual(
+            items, [("2024-05-01", {"id": "1"}), ("2024-05-02", {"id": "2"})]
+        )
+        self.assertTrue(mock_get.call_args.kwargs["stream"])
+        self.assertEqual(client.bytes_downloaded, len(body))
+        mock_store.put.assert_any_call("feed/2024-05-01", [{"id": "1"}])
+        mock_store.put.assert_any_call("feed/2024-05-02", [{"id": "2"}])
+
+    @patch.object(requests.Session, "get")
+    def test_stream_neo_data_records_empty_dates(self, mock_get):
+        body = json.dumps(
+            {
+                "element_count": 1,
+                "near_earth_objects": {
+                    "2024-01-01": [],
+                    "2024-01-02": [{"id": "2"}],
+                },
+            }
+        ).encode()
+        mock_response = MagicMock(status_code=200, headers={})
+        mock_response.iter_content.return_value = [body]
+        mock_get.return_value = mock_response
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = SnapshotStore(temp_dir)
+            client = NasaNeoApiClient("test_key", snapshot_store=store)
+            items = list(client.stream_neo_data("2024-01-01", "2024-01-02"))
+            replayed = list(
+                ReplayApiClient(store).stream_neo_data_range("2024-01-01", "2024-01-02")
+            )
+
+        self.assertEqual(items, [("2024-01-02", {"id": "2"})])
+        self.assertEqual(replayed, items)
+
+    @patch.object(requests.Session, "get")
+    def test_prefetch_orbit_types(self, mock_get):
+        def browse(url, params, timeout, stream=False, headers=None):
+            self.assertTrue(url.endswith("/neo/browse"))
+            page = params["page"]
+            response = MagicMock(status_code=200, headers={})
+            response.json.return_value = {
+                "page": {"total_pages": 3, "number": page},
+                "near_earth_objects": [
+                    {
+                        "id": str(page),
+                        "orbital_data": {"orbit_class": {"orbit_class_type": "APO"}},
+                    }
+                ],
+            }
+            return response
+
+        mock_get.side_effect = browse
+        mock_cache = MagicMock()
+
+        client = NasaNeoApiClient("test_key", orbit_cache=mock_cache)
+
+        self.assertEqual(client.prefetch_orbit_types(max_pages=2), 2)
+        self.assertEqual(client.orbit_index, {"0": "APO", "1": "APO"})
+        self.assertEqual(mock_get.call_count, 2)
+        mock_cache.put_many.assert_called_once()
+        self.assertEqual(client.fetch_neo_orbit_type(1), "APO")
+        self.assertEqual(mock_get.call_count, 2)
+        mock_cache.get.assert_not_called()
+
+        mock_get.reset_mock()
+        self.assertEqual(client.prefetch_orbit_types(neo_ids=["0"]), 1)
+        self.assertEqual(mock_get.call_count, 1)
+
+    @patch.object(requests.Session, "get")
+    def test_stream_browse_neos(self, mock_get):
+        def browse(url, params, timeout, stream=False, headers=None):
+            page = params["page"]
+            response = MagicMock(status_code=200, headers={})
+            response.json.return_value = {
+                "page": {"total_pages": 5, "number": page},
+                "near_earth_objects": [
+                    {
+                        "id": f"{page}{i}",
+                        "orbital_data": {"orbit_class": {"orbit_class_type": "AMO"}},
+                    }
+                    for i in range(2)
+                ],
+            }
+            return response
+
+        mock_get.side_effect = browse
+        client = NasaNeoApiClient("test_key")
+
+        neos = list(client.stream_browse_neos(max_pages=4, max_workers=2))
+
+        self.assertEqual(
+            [neo["id"] for date, neo in neos],
+            ["00", "01", "10", "11", "20", "21", "30", "31"],
+        )
+        self.assertEqual({date for date, neo in neos}, {None})
+        self.assertEqual(len(client.orbit_index), 8)
+        self.assertEqual(mock_get.call_count, 4)
+
+    @patch("neo_data_pipeline.api_client.time.sleep")
+    @patch.object(requests.Session, "get")
+    def test_retries_after_rate_limit(self, mock_get, mock_sleep):
+        throttled = MagicMock(status_code=429, headers={"Retry-After": "3"})
+        success = MagicMock(status_code=200, headers={})
+        success.json.return_value = {
+            "orbital_data": {"orbit_class": {"orbit_class_type": "APO"}}
+        }
+        mock_get.side_effect = [throttled, success]
+        limiter = RateLimiter()
+
+        client = NasaNeoApiClient("test_key", rate_limiter=limiter)
+
+        self.assertEqual(client.fetch_neo_orbit_type(1), "APO")
+        self.assertEqual(mock_get.call_count, 2)
+        mock_sleep.assert_any_call(3.0)
+        self.assertEqual(limiter.metrics()["retries"], 1)
+
+    @patch("neo_data_pipeline.api_client.time.sleep")
+    @patch.object(requests.Session, "get")
+    def test_retries_connection_errors(self, mock_get, mock_sleep):
+        success = MagicMock(status_code=200, headers={})
+        success.json.return_value = {"near_earth_objects": {"2024-05-01": []}}
+        mock_get.side_effect = [requests.exceptions.ConnectionError(), success]
+
+        client = NasaNeoApiClient("test_key")
+
+        self.assertIn("2024-05-01", client.fetch_neo_data("2024-05-01", "2024-05-01"))
+        self.assertEqual(mock_get.call_count, 2)
+
+    @patch("neo_data_pipeline.api_client.time.sleep")
+    @patch.object(requests.Session, "get")
+    def test_gives_up_after_max_retries(self, mock_get, mock_sleep):
+        unavailable = MagicMock(status_code=503, headers={})
+        unavailable.raise_for_status.side_effect = requests.exceptions.HTTPError()
+        mock_get.return_value = unavailable
+
+        client = NasaNeoApiClient("test_key", retry_policy=RetryPolicy(max_retries=2))
+
+        with self.assertRaises(requests.exceptions.HTTPError):
+            client.fetch_neo_orbit_type(1)
+        self.assertEqual(mock_get.call_count, 3)
+
+    @patch.object(requests.Session, "get")
+    def test_concurrency_limiter_only_samples_requests(self, mock_get):
+        success = MagicMock(status_code=200, headers={})
+        success.json.return_value = {
+            "orbital_data": {"orbit_class": {"orbit_class_type": "APO"}}
+        }
+        mock_get.return_value = success
+        limiter = AdaptiveConcurrencyLimiter(initial=1)
+        client = NasaNeoApiClient("test_key", concurrency_limiter=limiter)
+        client.orbit_index["2"] = "ATE"
+
+        self.assertEqual(client.fetch_neo_orbit_type("2"), "ATE")
+        self.assertIsNone(limiter.latency)
+        client.fetch_neo_data("2024-05-01", "2024-05-01")
+        self.assertIsNone(limiter.latency)
+
+        self.assertEqual(client.fetch_neo_orbit_type("1"), "APO")
+        self.assertIsNotNone(limiter.latency)
+        self.assertEqual(limiter.in_flight, 0)
+        self.assertEqual(limiter.stats()["pushback_decreases"], 0)
+
+    @patch("neo_data_pipeline.api_client.time.sleep")
+    @patch.object(requests.Session, "get")
+    def test_concurrency_limiter_backs_off_on_retries(self, mock_get, mock_sleep):
+        throttled = MagicMock(status_code=429, headers={})
+        success = MagicMock(status_code=200, headers={})
+        success.json.return_value = {}
+        not_found = MagicMock(status_code=404, headers={})
+        not_found.raise_for_status.side_effect = requests.exceptions.HTTPError()
+        mock_get.side_effect = [throttled, success, not_found]
+        # Latency never counts as congestion here, so only pushback moves the limit.
+        limiter = AdaptiveConcurrencyLimiter(
+            initial=8, backoff=0.5, latency_tolerance=float("inf")
+        )
+        client = NasaNeoApiClient("test_key", concurrency_limiter=limiter)
+
+        client.fetch_neo_orbit_type(1)
+        self.assertEqual(limiter.limit, 4)
+        with self.assertRaises(requests.exceptions.HTTPError):
+            client.fetch_neo_orbit_type(2)
+
+        self.assertEqual(limiter.limit, 4)
+        self.assertEqual(limiter.stats()["pushback_decreases"], 1)
+        self.assertEqual(limiter.in_flight, 0)
+
+    def test_session_pool_size(self):
+        client = NasaNeoApiClient("test_key", pool_size=25)
+
+        adapter = client.session.get_adapter(client.BASE_URL)
+        self.assertEqual(adapter._pool_maxsize, 25)
+
+    @patch.object(requests.Session, "close")
+    def test_context_manager_closes_session(self, mock_close):
+        with NasaNeoApiClient("test_key") as client:
+            self.assertIsInstance(client, NasaNeoApiClient)
+
+        mock_close.assert_called_once_with()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,156 @@
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import aiohttp
+
+from neo_data_pipeline.async_api_client import AsyncNasaNeoApiClient
+from neo_data_pipeline.http_cache import HttpCache
+from neo_data_pipeline.processor import Processor
+
+ORBIT_TYPES = {"1": "APO", "2": "ATE"}
+
+
+class StubNeoHandler(BaseHTTPRequestHandler):
+    requests_seen = []
+    throttled_ids = set()
+
+    def do_GET(self):
+        path, _, query = self.path.partition("?")
+        self.requests_seen.append(path)
+        neo_id = path.rsplit("/", 1)[-1]
+        if neo_id in self.throttled_ids:
+            self.throttled_ids.discard(neo_id)
+            self.send_response(429)
+            self.send_header("Retry-After", "0")
+            self.end_headers()
+            return
+        if not path.startswith("/neo/") or neo_id not in ORBIT_TYPES:
+            self.send_response(404)
+            self.end_headers()
+            return
+        body = json.dumps(
+            {"orbital_data": {"orbit_class": {"orbit_class_type": ORBIT_TYPES[neo_id]}}}
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestAsyncNasaNeoApiClient(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubNeoHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        StubNeoHandler.requests_seen = []
+        self.client = AsyncNasaNeoApiClient("test_key", base_url=self.base_url)
+
+    def test_fetch_neo_orbit_type_success(self):
+        async def fetch():
+            async with self.client:
+                return await self.client.fetch_neo_orbit_type("1")
+
+        self.assertEqual(asyncio.run(fetch()), "APO")
+        self.assertEqual(StubNeoHandler.requests_seen, ["/neo/1"])
+
+    def test_fetch_neo_orbit_type_failure(self):
+        async def fetch():
+            async with self.client:
+                return await self.client.fetch_neo_orbit_type("404")
+
+        with self.assertRaises(aiohttp.ClientResponseError):
+            asyncio.run(fetch())
+
+    def test_fetch_neo_orbit_type_uses_http_cache(self):
+        async def fetch(client):
+            async with client:
+                return await client.fetch_neo_orbit_type("1")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "http_cache.sqlite3")
+            with HttpCache(path) as cache:
+                first = AsyncNasaNeoApiClient(
+                    "test_key", base_url=self.base_url, http_cache=cache
+                )
+                self.assertEqual(asyncio.run(fetch(first)), "APO")
+                second = AsyncNasaNeoApiClient(
+                    "test_key", base_url=self.base_url, http_cache=cache
+                )
+                self.assertEqual(asyncio.run(fetch(second)), "APO")
+
+                self.assertEqual(StubNeoHandler.requests_seen, ["/neo/1"])
+                self.assertEqual(cache.stats()["hits"], 1)
+
+    def test_orbit_cache_is_accessed_off_the_event_loop(self):
+        threads = []
+
+        class Cache:
+            def get(self, neo_id):
+                threads.append(threading.get_ident())
+                return None
+
+            def put(self, neo_id, orbit_type):
+                threads.append(threading.get_ident())
+
+        async def fetch():
+            async with client:
+                loop_thread = threading.get_ident()
+                return await client.fetch_neo_orbit_type("1"), loop_thread
+
+        client = AsyncNasaNeoApiClient(
+            "test_key", base_url=self.base_url, orbit_cache=Cache()
+        )
+        orbit_type, loop_thread = asyncio.run(fetch())
+
+        self.assertEqual(orbit_type, "APO")
+        self.assertEqual(len(threads), 2)
+        self.assertNotIn(loop_thread, threads)
+
+    def test_fetch_neo_orbit_type_retries_rate_limit(self):
+        StubNeoHandler.throttled_ids = {"2"}
+
+        async def fetch():
+            async with self.client:
+                return await self.client.fetch_neo_orbit_type("2")
+
+        self.assertEqual(asyncio.run(fetch()), "ATE")
+        self.assertEqual(StubNeoHandler.requests_seen, ["/neo/2", "/neo/2"])
+        self.assertEqual(self.client.rate_limiter.metrics()["retries"], 1)
+
+    def test_process_async_matches_process_output(self):
+        neo_data = {
+            "2024-06-01": [{"id": "1", "name": "First"}, {"id": "2", "name": "Second"}],
+            "2024-06-02": [{"id": "1", "name": "First"}],
+        }
+        processor = Processor()
+
+        results = list(processor.process_async(neo_data, self.client, concurrency=2))
+
+        self.assertEqual(
+            [(result["Id"], result["Tipo de Órbita"]) for result in results],
+            [("1", "APO"), ("2", "ATE"), ("1", "APO")],
+        )
+        self.assertEqual(sorted(StubNeoHandler.requests_seen), ["/neo/1", "/neo/2"])
+        self.assertEqual(processor.saved_requests, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from neo_data_pipeline.backfill import BackfillCheckpoint, ShardedBackfill
+from neo_data_pipeline.csv_writer import CsvWriter
+from neo_data_pipeline.mock_server import MockNasaServer
+from neo_data_pipeline.pipeline import DataPipeline
+
+
+@patch("builtins.print")
+class TestShardedBackfill(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockNasaServer(neos_per_day=2)
+        self.server.start()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.temp_dir.name, "neo_data.csv")
+        self.snapshot_dir = os.path.join(self.temp_dir.name, "snapshots")
+
+    def tearDown(self):
+        self.server.stop()
+        self.temp_dir.cleanup()
+
+    def record(self, start_date, end_date):
+        with DataPipeline(
+            "test-key", base_url=self.server.base_url, snapshot_dir=self.snapshot_dir
+        ) as data_pipeline:
+            data_pipeline.run(
+                start_date, end_date, os.path.join(self.temp_dir.name, "recorded.csv")
+            )
+
+    def test_split_shards(self, mock_print):
+        backfill = ShardedBackfill("test-key", shard_days=3)
+
+        self.assertEqual(
+            backfill.split_shards("2024-06-01", "2024-06-07"),
+            [
+                ("2024-06-01", "2024-06-03"),
+                ("2024-06-04", "2024-06-06"),
+                ("2024-06-07", "2024-06-07"),
+            ],
+        )
+
+    def test_snapshot_recording_not_supported(self, mock_print):
+        with self.assertRaises(ValueError):
+            ShardedBackfill("test-key", snapshot_dir=self.snapshot_dir)
+
+    def test_run_merges_sorted_output(self, mock_print):
+        backfill = ShardedBackfill(
+            "test-key", processes=2, shard_days=3, base_url=self.server.base_url
+        )
+
+        results = backfill.run("2024-06-01", "2024-06-08", self.output)
+
+        self.assertEqual(results["failed"], [])
+        self.assertEqual(len(results["shards"]), 3)
+        rows = CsvWriter().read(self.output)
+        self.assertEqual(len(rows), 16)
+        keys = [(row["Data de Aproximação"], row["Id"]) for row in rows]
+        self.assertEqual(keys, sorted(keys))
+        self.assertFalse(os.path.exists(self.output + ".parts"))
+
+        single_output = os.path.join(self.temp_dir.name, "single.csv")
+        with DataPipeline("test-key", base_url=self.server.base_url) as data_pipeline:
+            data_pipeline.run("2024-06-01", "2024-06-08", single_output)
+        single_rows = CsvWriter().read(single_output)
+        self.assertEqual(sorted(rows, key=str), sorted(single_rows, key=str))
+
+    def test_merge_streams_sorted_parts(self, mock_print):
+        backfill = ShardedBackfill("test-key")
+        fieldnames = list(DataPipeline.FIELDNAMES)
+        parts = []
+        for part_index, (day, ids) in enumerate(
+            [("2024-06-01", ["3", "1"]), ("2024-06-02", ["2", "10"])]
+        ):
+            part = os.path.join(self.temp_dir.name, f"part{part_index}.csv")
+            backfill.writer.save(
+                [{"Id": neo_id, "Data de Aproximação": day} for neo_id in ids],
+                fieldnames,
+                part,
+            )
+            ShardedBackfill.sort_part(backfill.writer, part)
+            parts.append(part)
+
+        with patch.object(CsvWriter, "read", side_effect=AssertionError):
+            backfill.merge(parts, self.output)
+
+        with open(self.output, encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(
+            [(row["Data de Aproximação"], row["Id"]) for row in rows],
+            [
+                ("2024-06-01", "1"),
+                ("2024-06-01", "3"),
+                ("2024-06-02", "10"),
+                ("2024-06-02", "2"),
+            ],
+        )
+
+    def test_run_keeps_failed_lookups_for_repair(self, mock_print):
+        self.record("2024-06-01", "2024-06-06")
+        index_path = os.path.join(self.snapshot_dir, "index.json")
+        with open(index_path, encoding="utf-8") as f:
+            index = json.load(f)
+        broken = [key for key in index if key.startswith("neo/")][:2]
+        for key in broken:
+            # Points the snapshot at a missing object, so loading it raises.
+            index[key] = "0" * 64
+        with open(index_path, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        backfill = ShardedBackfill(
+            "test-key",
+            processes=2,
+            shard_days=3,
+            snapshot_dir=self.snapshot_dir,
+            replay=True,
+        )
+
+        results = backfill.run("2024-06-01", "2024-06-06", self.output)
+
+        self.assertEqual(results["failed"], [])
+        failed_ids = {key.split("/")[1] for key in broken}
+        rows = CsvWriter().read(self.output)
+        self.assertEqual(
+            {row["Id"] for row in rows if row["Tipo de Órbita"] == "PENDENTE"},
+            failed_ids,
+        )
+        with open(self.output + ".failed.json", encoding="utf-8") as f:
+            self.assertEqual(
+                {letter["id"] for letter in json.load(f)["failed"]}, failed_ids
+            )
+
+    def test_rerun_only_runs_failed_shards(self, mock_print):
+        self.record("2024-06-01", "2024-06-03")
+        backfill = ShardedBackfill(
+            "test-key",
+            processes=2,
+            shard_days=3,
+            snapshot_dir=self.snapshot_dir,
+            replay=True,
+        )
+
+        results = backfill.run("2024-06-01", "2024-06-06", self.output)
+
+        self.assertEqual(results["failed"], ["2024-06-04/2024-06-06"])
+        self.assertFalse(os.path.exists(self.output))
+        checkpoint = BackfillCheckpoint(
+            os.path.join(self.output + ".parts", "checkpoint.json")
+        )
+        self.assertTrue(checkpoint.is_done("2024-06-01", "2024-06-03"))
+
+        self.record("2024-06-04", "2024-06-06")
+        results = backfill.run("2024-06-01", "2024-06-06", self.output)
+
+        self.assertEqual(results["failed"], [])
+        self.assertEqual(list(results["shards"]), ["2024-06-04/2024-06-06"])
+        self.assertEqual(len(CsvWriter().read(self.output)), 12)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import io
+import json
+import unittest
+
+import requests
+
+from neo_data_pipeline.benchmark import main, percentile, run_scenario
+from neo_data_pipeline.mock_server import MockNasaServer
+
+
+class TestMockNasaServer(unittest.TestCase):
+    def test_feed_and_neo_endpoints(self):
+        with MockNasaServer(neos_per_day=3) as server:
+            feed = requests.get(
+                f"{server.base_url}/feed",
+                params={"start_date": "2024-01-01", "end_date": "2024-01-02"},
+            ).json()["near_earth_objects"]
+            neo_id = feed["2024-01-01"][0]["id"]
+            neo = requests.get(f"{server.base_url}/neo/{neo_id}").json()
+
+        self.assertEqual([len(neos) for neos in feed.values()], [3, 3])
+        self.assertNotIn("orbital_data", feed["2024-01-01"][0])
+        self.assertIn(
+            neo["orbital_data"]["orbit_class"]["orbit_class_type"],
+            MockNasaServer.ORBIT_CLASSES,
+        )
+
+    def test_rate_limit(self):
+        with MockNasaServer(rate_limit=2, rate_limit_window=60) as server:
+            responses = [requests.get(f"{server.base_url}/neo/1") for _ in range(3)]
+
+        self.assertEqual([r.status_code for r in responses], [200, 200, 429])
+        self.assertEqual(responses[1].headers["X-RateLimit-Remaining"], "0")
+        self.assertIn("Retry-After", responses[2].headers)
+
+    def test_error_rate(self):
+        with MockNasaServer(error_rate=1) as server:
+            response = requests.get(f"{server.base_url}/neo/1")
+
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(server.request_counts, {500: 1})
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_percentile(self):
+        values = list(range(1, 101))
+
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([3], 99), 3)
+        self.assertIsNone(percentile([], 50))
+
+    def test_run_scenario(self):
+        result = run_scenario(feed_size=20, max_workers=4, error_rate=0.1)
+
+        self.assertTrue(result["succeeded"])
+        self.assertEqual(result["rows"], 20)
+        self.assertGreater(result["rows_per_second"], 0)
+        self.assertLessEqual(result["lookup_p50_ms"], result["lookup_p99_ms"])
+        self.assertGreater(result["peak_memory_bytes"], 0)
+        self.assertIn("fetch", result["stages"])
+
+    def test_zero_latency_lookups_do_not_stall(self):
+        result = run_scenario(feed_size=20, max_workers=1)
+
+        # A delayed-ACK stall of the mock socket would add about 40 ms per lookup.
+        self.assertLess(result["lookup_p50_ms"], 20)
+
+    def test_run_scenario_output_format(self):
+        result = run_scenario(feed_size=5, max_workers="auto", output_format="sqlite")
+
+        self.assertTrue(result["succeeded"])
+        self.assertEqual(result["rows"], 5)
+        self.assertIn("write", result["stages"])
+        self.assertIn("concurrency", result)
+
+    def test_main_writes_json_lines(self):
+        out = io.StringIO()
+
+        main(["--feed-sizes", "5", "--workers", "1", "2", "--latency", "0"], out)
+
+        results = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([r["max_workers"] for r in results], [1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
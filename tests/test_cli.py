@@ -0,0 +1,189 @@
+import csv
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from neo_data_pipeline.cli import build_parser, main
+from neo_data_pipeline.mock_server import MockNasaServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("requests", "asyncio", "numpy", "pyarrow", "sqlite3")
+
+
+def run_python(*args):
+    return subprocess.run(
+        [sys.executable, *args], cwd=ROOT, capture_output=True, text=True
+    )
+
+
+class TestCliStartup(unittest.TestCase):
+    def _loaded_modules(self, statement):
+        result = run_python(
+            "-c",
+            f"import sys\n{statement}\n"
+            "print(' '.join(m for m in sys.modules if '.' not in m))",
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        return set(result.stdout.split())
+
+    def test_cli_import_loads_no_heavy_module(self):
+        loaded = self._loaded_modules("import neo_data_pipeline.cli")
+
+        self.assertFalse(loaded.intersection(HEAVY_MODULES))
+        self.assertNotIn("neo_data_pipeline.pipeline", loaded)
+
+    def test_pipeline_import_defers_network_modules(self):
+        loaded = self._loaded_modules("import neo_data_pipeline.pipeline")
+
+        self.assertNotIn("requests", loaded)
+        self.assertNotIn("asyncio", loaded)
+
+    def test_cli_import_time_budget(self):
+        result = run_python("-X", "importtime", "-c", "import neo_data_pipeline.cli")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        # Lines read "import time: <self us> | <cumulative us> | <module>".
+        cumulative = {
+            line.rsplit("|", 1)[1].strip(): int(line.split("|")[1])
+            for line in result.stderr.splitlines()
+            if line.startswith("import time:") and "cumulative" not in line
+        }
+
+        # Only argparse and the package itself are loaded, well within the budget.
+        self.assertLess(cumulative["neo_data_pipeline.cli"], 100_000)
+
+    def test_help_exits_without_error(self):
+        result = run_python("-m", "neo_data_pipeline", "--help")
+
+        self.assertEqual(result.returncode, 0)
+        for command in ("fetch", "replay", "repair", "benchmark", "query", "daemon"):
+            self.assertIn(command, result.stdout)
+
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.temp_dir.name, "neo_data.csv")
+        self.server = MockNasaServer(neos_per_day=2)
+        self.server.start()
+        patcher = patch("builtins.print")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.server.stop()
+        self.temp_dir.cleanup()
+
+    def _rows(self, path):
+        with open(path, encoding="utf-8", newline="") as f:
+            return list(csv.DictReader(f))
+
+    def test_parser(self):
+        args = build_parser().parse_args(
+            ["fetch", "key", "2024-06-01", "2024-06-02", "--workers", "4"]
+        )
+
+        self.assertEqual(args.command, "fetch")
+        self.assertEqual(args.api_key, "key")
+        self.assertEqual((args.start_date, args.end_date), ("2024-06-01", "2024-06-02"))
+        self.assertEqual(args.workers, 4)
+        self.assertEqual(args.output_format, "csv")
+        self.assertIsNone(args.prefetch_pages)
+        self.assertEqual(
+            build_parser()
+            .parse_args(
+                ["fetch", "key", "2024-06-01", "2024-06-01", "--prefetch-pages", "5"]
+            )
+            .prefetch_pages,
+            5,
+        )
+        self.assertEqual(
+            build_parser().parse_args(["repair", "key", "--workers", "auto"]).workers,
+            "auto",
+        )
+
+    def test_unknown_argument(self):
+        with patch("sys.stderr", new_callable=io.StringIO):
+            with self.assertRaises(SystemExit) as error:
+                main(["fetch", "key", "2024-06-01", "2024-06-01", "--bogus"])
+
+        self.assertEqual(error.exception.code, 2)
+
+    def test_fetch_then_replay(self):
+        snapshots = os.path.join(self.temp_dir.name, "snapshots")
+        replayed = os.path.join(self.temp_dir.name, "replayed.csv")
+
+        status = main(
+            [
+                "fetch",
+                "key",
+                "2024-06-01",
+                "2024-06-02",
+                "--output",
+                self.output,
+                "--snapshot-dir",
+                snapshots,
+                "--base-url",
+                self.server.base_url,
+            ]
+        )
+        self.assertEqual(status, 0)
+        self.assertEqual(len(self._rows(self.output)), 4)
+
+        status = main(
+            ["replay", snapshots, "2024-06-01", "2024-06-02", "--output", replayed]
+        )
+        self.assertEqual(status, 0)
+        self.assertEqual(self._rows(replayed), self._rows(self.output))
+
+    def test_replay_failure_status(self):
+        status = main(
+            [
+                "replay",
+                os.path.join(self.temp_dir.name, "missing"),
+                "2024-06-01",
+                "2024-06-01",
+                "--output",
+                self.output,
+            ]
+        )
+
+        self.assertEqual(status, 1)
+
+    def test_forwards_query(self):
+        store = os.path.join(self.temp_dir.name, "neo_data.sqlite3")
+        main(
+            [
+                "fetch",
+                "key",
+                "2024-06-01",
+                "2024-06-01",
+                "--output",
+                store,
+                "--output-format",
+                "sqlite",
+                "--base-url",
+                self.server.base_url,
+            ]
+        )
+
+        with patch("sys.stdout", new_callable=io.StringIO) as out:
+            status = main(["query", store, "--count"])
+
+        self.assertEqual(status, 0)
+        self.assertEqual(out.getvalue(), "2\n")
+
+    def test_run_py_usage(self):
+        result = run_python("run.py", "key")
+
+        self.assertEqual(result.returncode, 1)
+        self.assertIn(
+            "Usage: python run.py <api_key> <start_date> <end_date>", result.stdout
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
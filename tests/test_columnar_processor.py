@@ -0,0 +1,189 @@
+import os
+import random
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from neo_data_pipeline.columnar_processor import ColumnarProcessor
+from neo_data_pipeline.csv_writer import CsvWriter
+from neo_data_pipeline.pipeline import DataPipeline
+from neo_data_pipeline.processor import Processor
+
+
+def make_neo(rng, neo_id):
+    neo = {
+        "id": str(neo_id),
+        "name": f"({neo_id})",
+        "estimated_diameter": {
+            "kilometers": {
+                "estimated_diameter_min": rng.uniform(0.001, 1),
+                "estimated_diameter_max": rng.choice(
+                    [rng.uniform(0.001, 2), 0.1, 0.5, 0, None]
+                ),
+            }
+        },
+        "is_potentially_hazardous_asteroid": rng.choice([True, False]),
+    }
+    if rng.random() < 0.9:
+        neo["close_approach_data"] = [
+            {
+                "epoch_date_close_approach": rng.randint(-(10**11), 4 * 10**12),
+                "relative_velocity": {
+                    "kilometers_per_hour": rng.choice(
+                        [str(rng.uniform(1000, 150000)), "0"]
+                    )
+                },
+                "miss_distance": {
+                    "kilometers": rng.choice(
+                        [str(rng.uniform(1e4, 8e7)), "1000000", "5000000"]
+                    )
+                },
+            }
+        ]
+    return neo
+
+
+class TestColumnarProcessor(unittest.TestCase):
+    def setUp(self):
+        self.api_client = MagicMock()
+        self.api_client.fetch_neo_orbit_type.side_effect = lambda neo_id: f"O{neo_id}"
+
+    def test_categorize(self):
+        values = np.array([0.09, 0.1, 0.4, 0.5, 0.6])
+
+        labels = ColumnarProcessor.categorize(
+            values, ColumnarProcessor.DIAMETER_BINS, ColumnarProcessor.DIAMETER_LABELS
+        )
+
+        self.assertEqual(
+            labels.tolist(), ["Pequeno", "Médio", "Médio", "Grande", "Grande"]
+        )
+
+    def test_standardize_dates(self):
+        epochs = np.array([1717175726000, "NaT"], dtype="datetime64[ms]")
+
+        self.assertEqual(
+            ColumnarProcessor.standardize_dates(epochs).tolist(), ["2024-05-31", None]
+        )
+
+    def test_process_matches_processor(self):
+        rng = random.Random(42)
+        neo_data = {
+            "2024-06-01": [make_neo(rng, i) for i in range(60)],
+            "2024-06-02": [make_neo(rng, i) for i in range(40, 120)],
+        }
+
+        expected = list(Processor().process(neo_data, self.api_client))
+        results = list(
+            ColumnarProcessor(batch_size=7).process(neo_data, self.api_client)
+        )
+
+        self.assertEqual(results, expected)
+
+    def test_streamed_feed_is_read_one_batch_ahead(self):
+        rng = random.Random(7)
+        consumed = []
+
+        def stream():
+            for i in range(100):
+                consumed.append(i)
+                yield "2024-06-01", make_neo(rng, i)
+
+        records = ColumnarProcessor(batch_size=8, window=8).process(
+            stream(), self.api_client
+        )
+        next(records)
+
+        self.assertLessEqual(len(consumed), 16)
+
+    def test_all_approaches_matches_processor_on_single_approaches(self):
+        rng = random.Random(3)
+        neo_data = {"2024-06-01": [make_neo(rng, i) for i in range(100)]}
+
+        expected = [
+            record
+            for record, neo in zip(
+                Processor().process(neo_data, self.api_client), neo_data["2024-06-01"]
+            )
+            if neo.get("close_approach_data")
+        ]
+        results = list(
+            ColumnarProcessor(
+                batch_size=9, all_approaches=True, orbiting_bodies=None
+            ).process(neo_data, self.api_client)
+        )
+
+        self.assertEqual(results, expected)
+
+    def test_all_approaches_filters_body_and_window(self):
+        def approach(day, body, distance="1000"):
+            epoch = int(np.datetime64(day, "ms").astype(np.int64)) + 3600000
+            return {
+                "epoch_date_close_approach": epoch,
+                "relative_velocity": {"kilometers_per_hour": "36000"},
+                "miss_distance": {"kilometers": distance},
+                "orbiting_body": body,
+            }
+
+        neos = [
+            {
+                "id": "1",
+                "close_approach_data": [
+                    approach("1999-12-31", "Earth"),
+                    approach("2000-01-01", "Earth", "2000"),
+                    approach("2000-06-01", "Mars"),
+                    approach("2000-12-31", "Earth", "3000"),
+                    approach("2001-01-01", "Earth"),
+                ],
+            },
+            {"id": "2"},
+            {"id": "3", "close_approach_data": [approach("2000-02-02", "Venus")]},
+        ]
+        processor = ColumnarProcessor(
+            all_approaches=True, epoch_window=("2000-01-01", "2000-12-31")
+        )
+
+        records = processor.build_approach_records(neos)
+
+        self.assertEqual(
+            [(r.id, r.approach_date, r.distance, r.speed) for r in records],
+            [
+                ("1", "2000-01-01", 2000.0, 10000.0),
+                ("1", "2000-12-31", 3000.0, 10000.0),
+            ],
+        )
+        processor.orbiting_bodies = ("Earth", "Venus")
+        self.assertEqual(
+            [(r.id, r.orbiting_body) for r in processor.build_approach_records(neos)],
+            [("1", "Earth"), ("1", "Earth"), ("3", "Venus")],
+        )
+
+    def test_csv_output_is_byte_identical(self):
+        rng = random.Random(7)
+        neo_data = {"2024-06-01": [make_neo(rng, i) for i in range(200)]}
+        fieldnames = DataPipeline("test-key").fieldnames
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            expected_path = os.path.join(temp_dir, "expected.csv")
+            result_path = os.path.join(temp_dir, "result.csv")
+            CsvWriter.save_to_csv(
+                Processor().process(neo_data, self.api_client),
+                fieldnames,
+                expected_path,
+            )
+            CsvWriter.save_to_csv(
+                ColumnarProcessor().process(neo_data, self.api_client),
+                fieldnames,
+                result_path,
+            )
+
+            with open(expected_path, "rb") as expected, open(
+                result_path, "rb"
+            ) as result:
+                self.assertEqual(result.read(), expected.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
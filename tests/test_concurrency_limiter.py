@@ -0,0 +1,166 @@
+import argparse
+import threading
+import unittest
+
+from neo_data_pipeline.concurrency_limiter import (
+    AdaptiveConcurrencyLimiter,
+    parse_workers,
+)
+
+
+def run_saturated(limiter, completions, latency=0.01):
+    """Completes lookups one at a time while keeping every slot of the limiter busy."""
+    tickets = [limiter.acquire() for _ in range(limiter.limit)]
+    for _ in range(completions):
+        limiter.release(tickets.pop(0), latency)
+        while limiter.in_flight < limiter.limit:
+            tickets.append(limiter.acquire())
+    # Frees the remaining slots without reporting them as completed lookups.
+    limiter.in_flight -= len(tickets)
+
+
+class TestAdaptiveConcurrencyLimiter(unittest.TestCase):
+    def test_invalid_limits(self):
+        with self.assertRaises(ValueError):
+            AdaptiveConcurrencyLimiter(initial=8, max_limit=4)
+        with self.assertRaises(ValueError):
+            AdaptiveConcurrencyLimiter(min_limit=0)
+        with self.assertRaises(ValueError):
+            AdaptiveConcurrencyLimiter(backoff=1)
+
+    def test_slow_start_doubles_each_round(self):
+        limiter = AdaptiveConcurrencyLimiter(initial=2)
+
+        run_saturated(limiter, 2)
+        self.assertEqual(limiter.limit, 4)
+        run_saturated(limiter, 4)
+        self.assertEqual(limiter.limit, 8)
+
+    def test_increases_additively_after_a_decrease(self):
+        limiter = AdaptiveConcurrencyLimiter(initial=8, backoff=0.5)
+        limiter.release(limiter.acquire(), 0.01, pushback=True)
+        self.assertEqual(limiter.limit, 4)
+
+        run_saturated(limiter, 4)
+        self.assertEqual(limiter.limit, 5)
+        run_saturated(limiter, 5)
+        self.assertEqual(limiter.limit, 6)
+
+    def test_does_not_grow_unless_saturated(self):
+        limiter = AdaptiveConcurrencyLimiter(initial=4)
+
+        for _ in range(20):
+            limiter.release(limiter.acquire(), 0.01)
+
+        self.assertEqual(limiter.limit, 4)
+
+    def test_stays_within_bounds(self):
+        limiter = AdaptiveConcurrencyLimiter(initial=2, min_limit=2, max_limit=5)
+
+        run_saturated(limiter, 50)
+        self.assertEqual(limiter.limit, 5)
+        for _ in range(5):
+            limiter.release(limiter.acquire(), 0.01, pushback=True)
+        self.assertEqual(limiter.limit, 2)
+
+    def test_one_decrease_per_congestion_episode(self):
+        limiter = AdaptiveConcurrencyLimiter(initial=8, backoff=0.5)
+        tickets = [limiter.acquire() for _ in range(8)]
+
+        # Every lookup in flight sees the same 429, but only the first one counts.
+        for ticket in tickets[:4]:
+            limiter.release(ticket, 0.01, pushback=True)
+        self.assertEqual(limiter.limit, 4)
+        for ticket in tickets[4:]:
+            limiter.release(ticket, 0.01, pushback=True)
+        self.assertEqual(limiter.limit, 4)
+
+        limiter.release(limiter.acquire(), 0.01, pushback=True)
+        self.assertEqual(limiter.limit, 2)
+        self.assertEqual(limiter.stats()["pushback_decreases"], 2)
+
+    def test_decreases_when_latency_rises(self):
+        limiter = AdaptiveConcurrencyLimiter(initial=4, max_limit=4)
+        run_saturated(limiter, 20, latency=0.01)
+
+        limiter.release(limiter.acquire(), 1.0)
+
+        self.assertEqual(limiter.limit, 2)
+        self.assertEqual(limiter.stats()["latency_decreases"], 1)
+
+    def test_holds_while_latency_rises_within_tolerance(self):
+        limiter = AdaptiveConcurrencyLimiter(initial=4)
+        run_saturated(limiter, 4, latency=0.01)
+        self.assertEqual(limiter.limit, 8)
+
+        # Slower but not congested requests neither grow nor shrink the limit,
+        # and end the slow start.
+        run_saturated(limiter, 8, latency=0.014)
+        self.assertEqual(limiter.limit, 8)
+        self.assertEqual(limiter.stats()["latency_decreases"], 0)
+
+        run_saturated(limiter, 8, latency=0.01)
+        self.assertEqual(limiter.limit, 9)
+
+    def test_baseline_follows_faster_requests(self):
+        limiter = AdaptiveConcurrencyLimiter()
+        limiter.release(limiter.acquire(), 1.0)
+        for _ in range(20):
+            limiter.release(limiter.acquire(), 0.01)
+
+        self.assertLess(limiter.baseline_latency, 0.02)
+
+    def test_stats_and_history(self):
+        limiter = AdaptiveConcurrencyLimiter(initial=2)
+        run_saturated(limiter, 2)
+        limiter.release(limiter.acquire(), 0.01, pushback=True)
+
+        self.assertEqual(
+            limiter.stats(),
+            {
+                "limit": 2,
+                "lowest": 2,
+                "highest": 4,
+                "increases": 1,
+                "latency_decreases": 0,
+                "pushback_decreases": 1,
+            },
+        )
+        self.assertEqual(
+            [(limit, reason) for _, limit, reason in limiter.history],
+            [(4, "increase"), (2, "pushback")],
+        )
+
+        limiter.reset_stats()
+        self.assertEqual(limiter.stats()["highest"], 2)
+        self.assertEqual(limiter.stats()["pushback_decreases"], 0)
+        self.assertEqual(limiter.limit, 2)
+
+    def test_acquire_waits_for_a_free_slot(self):
+        limiter = AdaptiveConcurrencyLimiter(initial=1)
+        ticket = limiter.acquire()
+        acquired = threading.Event()
+
+        def acquire():
+            limiter.acquire()
+            acquired.set()
+
+        thread = threading.Thread(target=acquire)
+        thread.start()
+        self.assertFalse(acquired.wait(0.05))
+        limiter.release(ticket, 0.01)
+        self.assertTrue(acquired.wait(5))
+        thread.join()
+
+
+class TestParseWorkers(unittest.TestCase):
+    def test_parse_workers(self):
+        self.assertEqual(parse_workers("auto"), "auto")
+        self.assertEqual(parse_workers("12"), 12)
+        for value in ("0", "-3", "many"):
+            with self.assertRaises(argparse.ArgumentTypeError):
+                parse_workers(value)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,10 @@
 import csv
+import io
 import os
 import unittest
 
 from neo_data_pipeline.csv_writer import CsvWriter
+from neo_data_pipeline.record import NeoRecord
 
 
 class TestCsvWriter(unittest.TestCase):
@@ -52,6 +54,97 @@ class TestCsvWriter(unittest.TestCase):
             self.assertEqual(len(rows), 1)
             self.assertEqual(rows[0]["Nome"], "Test NEO")
 
+    def test_save_records_matches_dict_writer(self):
+        records = [
+            NeoRecord.from_dict(self.test_data[0]),
+            NeoRecord(
+                "2", "Other NEO", None, 1.5, 3.0, None, None, "Grande", None, True, None
+            ),
+        ]
+        expected = io.StringIO(newline="")
+        dict_writer = csv.DictWriter(
+            expected, fieldnames=self.fieldnames, extrasaction="ignore"
+        )
+        dict_writer.writeheader()
+        dict_writer.writerows(record.to_dict() for record in records)
+
+        self.csv_writer.save_to_csv(
+            [records[0], records[1].to_dict()], self.fieldnames, self.test_file
+        )
+
+        with open(self.test_file, newline="", encoding="utf-8") as file:
+            self.assertEqual(file.read(), expected.getvalue())
+
+    def test_save_records_with_custom_fieldnames(self):
+        fieldnames = self.fieldnames[::-1]
+        self.csv_writer.save_to_csv(
+            [NeoRecord.from_dict(self.test_data[0])], fieldnames, self.test_file
+        )
+
+        with open(self.test_file, encoding="utf-8") as file:
+            rows = list(csv.DictReader(file))
+        self.assertEqual(list(rows[0]), fieldnames)
+        self.assertEqual(rows[0]["Nome"], "Test NEO")
+
+    def test_save_to_csv_is_atomic(self):
+        self.csv_writer.save_to_csv(self.test_data, self.fieldnames, self.test_file)
+
+        def failing_rows():
+            yield self.test_data[0]
+            raise RuntimeError("interrupted")
+
+        with self.assertRaises(RuntimeError):
+            self.csv_writer.save_to_csv(failing_rows(), self.fieldnames, self.test_file)
+
+        self.assertEqual(len(self.csv_writer.read(self.test_file)), 1)
+        self.assertFalse(
+            [name for name in os.listdir(".") if name.startswith(".test_neo_data")]
+        )
+
+    def test_iter_rows(self):
+        self.csv_writer.save_to_csv(self.test_data, self.fieldnames, self.test_file)
+
+        rows = self.csv_writer.iter_rows(self.test_file)
+
+        self.assertNotIsInstance(rows, list)
+        self.assertEqual(list(rows), self.csv_writer.read(self.test_file))
+
+    def test_upsert(self):
+        self.csv_writer.save_to_csv(self.test_data, self.fieldnames, self.test_file)
+        updated = dict(self.test_data[0], **{"Tipo de Órbita": "ATE"})
+        added = dict(self.test_data[0], Id=2)
+
+        self.csv_writer.upsert(
+            [updated, added],
+            self.fieldnames,
+            self.test_file,
+            ("Id", "Data de Aproximação"),
+        )
+
+        rows = self.csv_writer.read(self.test_file)
+        self.assertEqual([row["Id"] for row in rows], ["1", "2"])
+        self.assertEqual(rows[0]["Tipo de Órbita"], "ATE")
+
+    def test_upsert_replaces_record_without_approach(self):
+        undated = dict(self.test_data[0], **{"Data de Aproximação": None})
+        self.csv_writer.save_to_csv([undated], self.fieldnames, self.test_file)
+
+        self.csv_writer.upsert(
+            [dict(undated, **{"Tipo de Órbita": "ATE"})],
+            self.fieldnames,
+            self.test_file,
+            ("Id", "Data de Aproximação"),
+        )
+
+        rows = self.csv_writer.read(self.test_file)
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["Tipo de Órbita"], "ATE")
+
+    def test_upsert_missing_file(self):
+        self.csv_writer.upsert(self.test_data, self.fieldnames, self.test_file, ("Id",))
+
+        self.assertEqual(len(self.csv_writer.read(self.test_file)), 1)
+
 
 if __name__ == "__main__":
     unittest.main()
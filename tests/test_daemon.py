@@ -0,0 +1,94 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from datetime import date
+from unittest.mock import patch
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from neo_data_pipeline.daemon import PipelineDaemon
+from neo_data_pipeline.mock_server import MockNasaServer
+from neo_data_pipeline.pipeline import DataPipeline
+
+
+class TestPipelineDaemon(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.temp_dir.name, "neo_data.csv")
+        self.server = MockNasaServer(neos_per_day=2)
+        self.server.start()
+        patcher = patch("builtins.print")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.server.stop()
+        self.temp_dir.cleanup()
+
+    def _daemon(self, **kwargs):
+        pipeline = DataPipeline("test-key", base_url=self.server.base_url)
+        return PipelineDaemon(pipeline, self.output, port=0, **kwargs)
+
+    def _wait_for_runs(self, daemon, runs):
+        deadline = time.monotonic() + 10
+        while daemon.status()["runs"] < runs:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+    def _call(self, daemon, method, path):
+        request = Request(daemon.base_url + path, method=method)
+        with urlopen(request) as response:
+            return response.status, json.load(response)
+
+    def test_default_range(self):
+        daemon = self._daemon(lookback_days=2)
+        start, end = daemon.default_range()
+        daemon.pipeline.close()
+
+        self.assertEqual((date.fromisoformat(end) - date.fromisoformat(start)).days, 2)
+
+    def test_runs_on_start_and_on_request(self):
+        with self._daemon(interval=3600) as daemon:
+            self._wait_for_runs(daemon, 1)
+
+            status, payload = self._call(
+                daemon, "POST", "/run?start_date=2024-06-01&end_date=2024-06-02"
+            )
+            self.assertEqual(status, 202)
+            self._wait_for_runs(daemon, 2)
+
+            status, payload = self._call(daemon, "GET", "/status")
+            self.assertEqual(status, 200)
+            self.assertEqual(payload["state"], "idle")
+            self.assertEqual(payload["failures"], 0)
+            self.assertEqual(payload["last_range"], ["2024-06-01", "2024-06-02"])
+            self.assertEqual(payload["last_metrics"]["counters"]["rows_written"], 4)
+
+        with open(self.output + ".manifest.json", encoding="utf-8") as f:
+            self.assertIn("2024-06-01", f.read())
+
+    def test_reuses_pipeline_across_runs(self):
+        with self._daemon(interval=3600) as daemon:
+            self._wait_for_runs(daemon, 1)
+            session = daemon.pipeline.api_client.session
+            daemon.run_once("2024-06-01", "2024-06-01")
+
+            self.assertIs(daemon.pipeline.api_client.session, session)
+            self.assertEqual(daemon.status()["runs"], 2)
+
+    def test_rejects_invalid_requests(self):
+        with self._daemon(interval=3600) as daemon:
+            for method, path, code in (
+                ("POST", "/run?start_date=June", 400),
+                ("GET", "/missing", 404),
+            ):
+                with self.assertRaises(HTTPError) as context:
+                    self._call(daemon, method, path)
+                self.assertEqual(context.exception.code, code)
+                context.exception.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
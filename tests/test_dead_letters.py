@@ -0,0 +1,43 @@
+import json
+import os
+import tempfile
+import unittest
+
+from neo_data_pipeline.dead_letters import DeadLetterFile
+
+
+class TestDeadLetterFile(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "neo_data.csv.failed.json")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_save_and_load(self):
+        dead_letters = DeadLetterFile(self.path)
+        dead_letters.add([{"id": 2, "error": "old"}, {"id": "1", "error": "a"}])
+        dead_letters.add([{"id": "2", "error": "b"}])
+        dead_letters.save()
+
+        with open(self.path, encoding="utf-8") as f:
+            self.assertEqual(
+                json.load(f),
+                {"failed": [{"id": "1", "error": "a"}, {"id": "2", "error": "b"}]},
+            )
+        self.assertEqual(DeadLetterFile(self.path).failed, {"1": "a", "2": "b"})
+
+    def test_save_removes_empty_file(self):
+        dead_letters = DeadLetterFile(self.path)
+        dead_letters.add([{"id": "1", "error": "a"}])
+        dead_letters.save()
+
+        dead_letters.remove([1])
+        dead_letters.save()
+
+        self.assertEqual(len(dead_letters), 0)
+        self.assertFalse(os.path.exists(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import json
+import unittest
+
+from neo_data_pipeline.feed_parser import FeedStreamParser, iter_feed
+
+
+class TestFeedStreamParser(unittest.TestCase):
+
+    def setUp(self):
+        self.payload = {
+            "links": {"next": "https://api.nasa.gov/near_earth_objects"},
+            "element_count": 3,
+            "near_earth_objects": {
+                "2024-06-01": [
+                    {"id": "1", "name": "Ñandú", "close_approach_data": [{"a": [1]}]},
+                    {"id": "2", "name": "Test NEO"},
+                ],
+                "2024-06-02": [],
+                "2024-06-03": [{"id": "3", "name": "Other NEO"}],
+            },
+        }
+        self.expected = [
+            (date, neo)
+            for date, neos in self.payload["near_earth_objects"].items()
+            for neo in neos
+        ]
+
+    def chunks(self, body, size):
+        return [body[i : i + size] for i in range(0, len(body), size)]
+
+    def test_iter_feed_any_chunk_size(self):
+        for indent in (None, 2):
+            body = json.dumps(self.payload, indent=indent).encode()
+            for size in (1, 5, 64, len(body)):
+                with self.subTest(indent=indent, size=size):
+                    self.assertEqual(
+                        list(iter_feed(self.chunks(body, size))), self.expected
+                    )
+
+    def test_feed_yields_before_the_end(self):
+        body = json.dumps(self.payload).encode()
+        parser = FeedStreamParser()
+
+        items = parser.feed(body[: body.index(b'{"id": "2"')])
+
+        self.assertEqual(items, self.expected[:1])
+
+    def test_truncated_response(self):
+        body = json.dumps(self.payload).encode()
+        with self.assertRaises(ValueError):
+            list(iter_feed([body[: len(body) // 2]]))
+
+    def test_malformed_response(self):
+        with self.assertRaises(ValueError):
+            list(iter_feed([b'{"near_earth_objects": ["2024-06-01"]}']))
+
+    def test_missing_feed_key(self):
+        self.assertEqual(list(iter_feed([b'{"element_count": 0}'])), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from neo_data_pipeline.http_cache import HttpCache
+
+
+class TestHttpCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "http_cache.sqlite3")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_key_ignores_api_key_and_parameter_order(self):
+        self.assertEqual(
+            HttpCache.key("http://x/feed", {"api_key": "a", "b": 1, "a": 2}),
+            HttpCache.key("http://x/feed", {"a": 2, "b": 1, "api_key": "other"}),
+        )
+
+    def test_get_and_put(self):
+        with HttpCache(self.path) as cache:
+            self.assertIsNone(cache.get("k"))
+            cache.put("k", b"body", etag='"1"')
+
+            cached = cache.get("k")
+            self.assertEqual(cached.body, b"body")
+            self.assertEqual(cached.etag, '"1"')
+            self.assertTrue(cached.fresh)
+            self.assertEqual(cache.stats()["hits"], 1)
+            self.assertEqual(cache.stats()["misses"], 1)
+            self.assertEqual(cache.stats()["bytes_saved"], 4)
+
+    def test_stale_response_is_revalidated(self):
+        with HttpCache(self.path, max_age=60) as cache:
+            with patch("time.time", return_value=1000):
+                cache.put("k", b"body", etag='"1"', last_modified="yesterday")
+            with patch("time.time", return_value=2000):
+                cached = cache.get("k")
+                self.assertFalse(cached.fresh)
+                self.assertEqual(
+                    HttpCache.conditional_headers(cached),
+                    {"If-None-Match": '"1"', "If-Modified-Since": "yesterday"},
+                )
+                cache.revalidate("k", cached)
+                self.assertTrue(cache.get("k").fresh)
+            self.assertEqual(cache.stats()["revalidations"], 1)
+
+    def test_persists_across_instances(self):
+        with HttpCache(self.path) as cache:
+            cache.put("k", b"body")
+
+        with HttpCache(self.path) as cache:
+            self.assertEqual(len(cache), 1)
+            self.assertEqual(cache.stats()["bytes"], 4)
+            self.assertEqual(cache.get("k").body, b"body")
+
+    def test_evicts_least_recently_used(self):
+        with HttpCache(self.path, max_bytes=8) as cache:
+            with patch("time.time", return_value=1):
+                cache.put("a", b"1234")
+            with patch("time.time", return_value=2):
+                cache.put("b", b"1234")
+            with patch("time.time", return_value=3):
+                cache.get("a")
+            with patch("time.time", return_value=4):
+                cache.put("c", b"1234")
+
+            self.assertIsNone(cache.get("b"))
+            self.assertIsNotNone(cache.get("a"))
+            self.assertEqual(cache.stats()["evictions"], 1)
+            self.assertEqual(cache.stats()["bytes"], 8)
+
+    def test_get_does_not_write_until_batch_is_full(self):
+        with HttpCache(self.path) as cache:
+            cache.put("k", b"body")
+            changes = cache._connection.total_changes
+            for _ in range(10):
+                cache.get("k")
+            self.assertEqual(cache._connection.total_changes, changes)
+
+    def test_eviction_sees_entries_from_other_instances(self):
+        with HttpCache(self.path, max_bytes=8) as first, HttpCache(
+            self.path, max_bytes=8
+        ) as second:
+            with patch("time.time", return_value=1):
+                first.put("a", b"1234")
+            with patch("time.time", return_value=2):
+                second.put("b", b"1234")
+            with patch("time.time", return_value=3):
+                first.put("c", b"1234")
+
+            self.assertIsNone(second.get("a"))
+            self.assertEqual(first.stats()["bytes"], 8)
+            self.assertEqual(len(second), 2)
+
+    def test_oversized_body_is_not_cached(self):
+        with HttpCache(self.path, max_bytes=2) as cache:
+            cache.put("k", b"body")
+            self.assertEqual(len(cache), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
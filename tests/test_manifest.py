@@ -0,0 +1,48 @@
+import os
+import tempfile
+import unittest
+
+from neo_data_pipeline.manifest import RunManifest
+
+
+class TestRunManifest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "neo_data.csv.manifest.json")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_date_range(self):
+        self.assertEqual(
+            RunManifest.date_range("2024-02-28", "2024-03-01"),
+            ["2024-02-28", "2024-02-29", "2024-03-01"],
+        )
+
+    def test_missing_ranges(self):
+        manifest = RunManifest(self.path)
+        manifest.add("2024-06-03", "2024-06-04")
+        manifest.add("2024-06-07", "2024-06-07")
+
+        self.assertEqual(
+            manifest.missing_ranges("2024-06-01", "2024-06-09"),
+            [
+                ("2024-06-01", "2024-06-02"),
+                ("2024-06-05", "2024-06-06"),
+                ("2024-06-08", "2024-06-09"),
+            ],
+        )
+
+    def test_save_and_load(self):
+        manifest = RunManifest(self.path)
+        manifest.add("2024-06-01", "2024-06-02")
+        manifest.save()
+
+        reloaded = RunManifest(self.path)
+        self.assertEqual(reloaded.dates, {"2024-06-01", "2024-06-02"})
+        self.assertEqual(reloaded.missing_ranges("2024-06-01", "2024-06-02"), [])
+        self.assertEqual(os.listdir(self.temp_dir.name), [os.path.basename(self.path)])
+
+
+if __name__ == "__main__":
+    unittest.main()
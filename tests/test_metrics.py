@@ -0,0 +1,70 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from neo_data_pipeline.metrics import PipelineMetrics
+
+
+class TestPipelineMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.metrics = PipelineMetrics()
+
+    @patch("neo_data_pipeline.metrics.time.perf_counter")
+    def test_stage_accumulates_time(self, mock_perf_counter):
+        mock_perf_counter.side_effect = [0.0, 1.5, 10.0, 10.5]
+
+        with self.metrics.stage("fetch"):
+            pass
+        with self.metrics.stage("fetch"):
+            pass
+
+        self.assertEqual(self.metrics.stages, {"fetch": 2.0})
+
+    @patch("neo_data_pipeline.metrics.time.perf_counter")
+    def test_time_iterator(self, mock_perf_counter):
+        mock_perf_counter.side_effect = [0.0, 1.0, 5.0, 7.0, 8.0, 8.5]
+
+        items = list(self.metrics.time_iterator("process", ["a", "b"]))
+
+        self.assertEqual(items, ["a", "b"])
+        self.assertEqual(self.metrics.stages, {"process": 3.5})
+
+    def test_counters(self):
+        self.metrics.increment("requests")
+        self.metrics.increment("requests", 2)
+        self.metrics.set("max_queue_depth", 40)
+
+        self.assertEqual(self.metrics.counters, {"requests": 3, "max_queue_depth": 40})
+
+    def test_to_prometheus(self):
+        self.metrics.add_stage_time("fetch", 1.25)
+        self.metrics.set("rows_written", 7)
+
+        text = self.metrics.to_prometheus()
+
+        self.assertIn('neo_pipeline_stage_seconds{stage="fetch"} 1.25', text)
+        self.assertIn("# TYPE neo_pipeline_rows_written gauge", text)
+        self.assertIn("neo_pipeline_rows_written 7.0", text)
+
+    def test_export_json_appends_lines(self):
+        self.metrics.set("rows_written", 7)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "metrics.jsonl")
+            self.metrics.export(path)
+            self.metrics.export(path)
+            with open(path, encoding="utf-8") as f:
+                lines = f.readlines()
+
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(json.loads(lines[0])["counters"], {"rows_written": 7})
+
+    def test_export_invalid_format(self):
+        with self.assertRaises(ValueError):
+            self.metrics.export("metrics.txt", "xml")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,254 @@
+import io
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from neo_data_pipeline.neo_store import NeoStore, main
+from neo_data_pipeline.record import NeoRecord
+from neo_data_pipeline.sqlite_writer import SqliteWriter
+
+
+class TestNeoStore(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "neo_store.sqlite3")
+        self.records = [
+            NeoRecord(
+                "1",
+                "Apollo",
+                "2023-05-01",
+                0.1,
+                0.2,
+                10000.0,
+                500000.0,
+                "Médio",
+                "Muito Próximo",
+                True,
+                "APO",
+            ),
+            NeoRecord(
+                "2",
+                "Aten",
+                "2023-06-01",
+                0.01,
+                0.02,
+                20000.0,
+                5000000.0,
+                "Pequeno",
+                "Distante",
+                False,
+                "ATE",
+            ),
+            NeoRecord(
+                "3",
+                "Far Apollo",
+                "2024-01-01",
+                1.0,
+                2.0,
+                30000.0,
+                800000.0,
+                "Grande",
+                "Muito Próximo",
+                True,
+                "APO",
+            ),
+        ]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_upsert_and_query(self):
+        with NeoStore(self.path) as store:
+            self.assertEqual(store.upsert(self.records), 3)
+
+            self.assertEqual(store.query(), self.records)
+            self.assertEqual(
+                store.query(
+                    start_date="2023-01-01",
+                    end_date="2023-12-31",
+                    hazardous=True,
+                    orbit_type="APO",
+                    max_distance=1000000,
+                ),
+                [self.records[0]],
+            )
+            self.assertEqual(store.count(hazardous=False), 1)
+            self.assertEqual(
+                [record.id for record in store.query(order_by="speed", limit=2)],
+                ["1", "2"],
+            )
+
+    def test_upsert_replaces_same_approach(self):
+        with NeoStore(self.path) as store:
+            store.upsert(self.records)
+            store.upsert([self.records[0]._replace(orbit_type="AMO")])
+
+            self.assertEqual(len(store), 3)
+            self.assertEqual(store.query(neo_id=1)[0].orbit_type, "AMO")
+
+    def test_upsert_replaces_record_without_approach(self):
+        record = NeoRecord(
+            "4", "Lost", None, 0.1, 0.2, None, None, "Médio", None, False, "APO"
+        )
+        row = {header: "" for header in NeoRecord.HEADERS}
+        row.update({"Id": "4", "Nome": "Lost", "Tipo de Órbita": "AMO"})
+
+        with NeoStore(self.path) as store:
+            store.upsert([record])
+            store.upsert([record])
+            store.upsert([row])
+
+            self.assertEqual(len(store), 1)
+            self.assertIsNone(store.query()[0].approach_date)
+            self.assertEqual(store.query()[0].orbit_type, "AMO")
+            self.assertEqual(store.query(end_date="2024-12-31"), [])
+
+    def test_upsert_keeps_approaches_to_other_bodies(self):
+        earth = self.records[0]._replace(orbiting_body="Earth")
+        mars = earth._replace(orbiting_body="Mars", distance=900000.0)
+
+        with NeoStore(self.path) as store:
+            store.upsert([earth, mars])
+            store.upsert([earth._replace(orbit_type="AMO")])
+
+            self.assertEqual(
+                [(r.orbiting_body, r.orbit_type) for r in store.query(neo_id=1)],
+                [("Earth", "AMO"), ("Mars", "APO")],
+            )
+
+    def test_migrates_stores_without_orbiting_body(self):
+        connection = sqlite3.connect(self.path)
+        connection.execute(
+            "CREATE TABLE neos (id TEXT NOT NULL, name TEXT, "
+            "approach_date TEXT NOT NULL DEFAULT '', diameter_min REAL, "
+            "diameter_max REAL, speed REAL, distance REAL, diameter_category TEXT, "
+            "proximity_category TEXT, hazardous INTEGER, orbit_type TEXT, "
+            "PRIMARY KEY (id, approach_date))"
+        )
+        connection.execute("CREATE INDEX neos_id ON neos (id)")
+        connection.execute(
+            "INSERT INTO neos VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            NeoStore._to_row(self.records[0])[:-1],
+        )
+        connection.commit()
+        connection.close()
+
+        with NeoStore(self.path) as store:
+            self.assertEqual(store.query(), [self.records[0]])
+            store.upsert([self.records[0]._replace(orbit_type="AMO")])
+            self.assertEqual(len(store), 1)
+
+    def test_upsert_converts_csv_rows(self):
+        row = {
+            header: "" if value is None else str(value)
+            for header, value in self.records[1].to_dict().items()
+        }
+
+        with NeoStore(self.path) as store:
+            store.upsert([row])
+
+            self.assertEqual(store.query(), [self.records[1]])
+
+    def test_filters_use_indexes(self):
+        with NeoStore(self.path) as store:
+            plan = store._connection.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM neos WHERE orbit_type = ?", ("APO",)
+            ).fetchall()
+
+        self.assertIn("neos_orbit_type", str(plan))
+
+    def test_id_filter_uses_primary_key(self):
+        with NeoStore(self.path) as store:
+            plan = store._connection.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM neos WHERE id = ?", ("1",)
+            ).fetchall()
+            indexes = store._connection.execute("PRAGMA index_list(neos)").fetchall()
+
+        self.assertIn("sqlite_autoindex_neos_1", str(plan))
+        self.assertNotIn("neos_id", [index[1] for index in indexes])
+
+    def test_max_distance_is_exclusive(self):
+        with NeoStore(self.path) as store:
+            store.upsert(self.records)
+
+            self.assertEqual(
+                [record.id for record in store.query(max_distance=800000.0)], ["1"]
+            )
+
+    def test_invalid_order_by(self):
+        with NeoStore(self.path) as store:
+            with self.assertRaises(ValueError):
+                store.query(order_by="name; DROP TABLE neos")
+
+    def test_main(self):
+        with NeoStore(self.path) as store:
+            store.upsert(self.records)
+
+        out = io.StringIO()
+        main([self.path, "--hazardous", "--orbit-type", "APO"], out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(lines[0], ",".join(NeoRecord.HEADERS))
+        self.assertEqual([line.split(",")[0] for line in lines[1:]], ["1", "3"])
+
+        out = io.StringIO()
+        main([self.path, "--not-hazardous", "--count"], out)
+        self.assertEqual(out.getvalue(), "1\n")
+
+
+class TestSqliteWriter(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "neo_data.sqlite3")
+        self.record = NeoRecord(
+            "1",
+            "Test NEO",
+            "2024-05-01",
+            0.1,
+            0.2,
+            10000.0,
+            1000000.0,
+            "Médio",
+            "Próximo",
+            False,
+            "APO",
+        )
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_save_and_read(self):
+        writer = SqliteWriter()
+        writer.save([self.record], list(NeoRecord.HEADERS), self.path)
+
+        self.assertEqual(writer.read(self.path), [self.record.to_dict()])
+        self.assertEqual(os.listdir(self.temp_dir.name), ["neo_data.sqlite3"])
+
+    def test_iter_rows(self):
+        writer = SqliteWriter()
+        records = [self.record._replace(id="2"), self.record]
+        writer.save(records, list(NeoRecord.HEADERS), self.path)
+
+        self.assertEqual(
+            list(writer.iter_rows(self.path)),
+            [self.record.to_dict(), records[0].to_dict()],
+        )
+
+    def test_upsert(self):
+        writer = SqliteWriter()
+        fieldnames = list(NeoRecord.HEADERS)
+        writer.upsert([self.record], fieldnames, self.path, ("Id",))
+        writer.upsert(
+            [self.record._replace(orbit_type="ATE"), self.record._replace(id="2")],
+            fieldnames,
+            self.path,
+            ("Id",),
+        )
+
+        rows = writer.read(self.path)
+        self.assertEqual([row["Id"] for row in rows], ["1", "2"])
+        self.assertEqual(rows[0]["Tipo de Órbita"], "ATE")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from neo_data_pipeline.orbit_cache import OrbitCache
+
+
+class TestOrbitCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "orbit_cache.sqlite3")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_get_and_put(self):
+        with OrbitCache(self.path) as cache:
+            self.assertIsNone(cache.get("1"))
+            cache.put("1", "APO")
+            self.assertEqual(cache.get("1"), "APO")
+            self.assertEqual(cache.stats()["hits"], 1)
+            self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_persists_across_instances(self):
+        with OrbitCache(self.path) as cache:
+            cache.put(1, "ATE")
+
+        with OrbitCache(self.path) as cache:
+            self.assertEqual(len(cache), 1)
+            self.assertEqual(cache.get(1), "ATE")
+
+    def test_put_many(self):
+        with OrbitCache(self.path, max_entries=2) as cache:
+            cache.put_many([("1", "APO"), ("2", None), ("3", "ATE"), ("4", "AMO")])
+
+            self.assertEqual(len(cache), 2)
+            self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_none_is_not_cached(self):
+        with OrbitCache(self.path) as cache:
+            cache.put("1", None)
+            self.assertEqual(len(cache), 0)
+
+    def test_expired_entries_are_misses(self):
+        with OrbitCache(self.path, ttl=60) as cache:
+            with patch("neo_data_pipeline.orbit_cache.time.time", return_value=1000):
+                cache.put("1", "APO")
+            with patch("neo_data_pipeline.orbit_cache.time.time", return_value=1061):
+                self.assertIsNone(cache.get("1"))
+            self.assertEqual(len(cache), 0)
+            self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_missing(self):
+        with OrbitCache(self.path, ttl=60) as cache:
+            with patch("neo_data_pipeline.orbit_cache.time.time", return_value=1000):
+                cache.put("1", "APO")
+            cache.put("2", "ATE")
+
+            self.assertEqual(cache.missing(["3", 2, "1"]), ["3", "1"])
+            self.assertEqual(cache.stats()["hits"], 0)
+            self.assertEqual(cache.stats()["misses"], 0)
+
+    def test_purge_expired(self):
+        with OrbitCache(self.path, ttl=60) as cache:
+            with patch("neo_data_pipeline.orbit_cache.time.time", return_value=1000):
+                cache.put("1", "APO")
+            cache.put("2", "ATE")
+            self.assertEqual(cache.purge_expired(), 1)
+            self.assertEqual(len(cache), 1)
+
+    def test_evicts_least_recently_used(self):
+        with OrbitCache(self.path, max_entries=2) as cache:
+            with patch("neo_data_pipeline.orbit_cache.time.time", return_value=1):
+                cache.put("1", "APO")
+            with patch("neo_data_pipeline.orbit_cache.time.time", return_value=2):
+                cache.put("2", "ATE")
+            with patch("neo_data_pipeline.orbit_cache.time.time", return_value=3):
+                cache.get("1")
+            with patch("neo_data_pipeline.orbit_cache.time.time", return_value=4):
+                cache.put("3", "AMO")
+
+            self.assertEqual(len(cache), 2)
+            self.assertEqual(cache.stats()["evictions"], 1)
+            with patch("neo_data_pipeline.orbit_cache.time.time", return_value=5):
+                self.assertIsNone(cache.get("2"))
+                self.assertEqual(cache.get("1"), "APO")
+
+    def test_hits_do_not_write_each_access(self):
+        with OrbitCache(self.path) as cache:
+            with patch("neo_data_pipeline.orbit_cache.time.time", return_value=1):
+                cache.put("1", "APO")
+            changes = cache._connection.total_changes
+            with patch("neo_data_pipeline.orbit_cache.time.time", return_value=5):
+                for _ in range(10):
+                    self.assertEqual(cache.get("1"), "APO")
+
+            self.assertEqual(cache._connection.total_changes, changes)
+
+        # The last access is written on close.
+        with OrbitCache(self.path) as cache:
+            accessed_at = cache._connection.execute(
+                "SELECT accessed_at FROM orbit_cache"
+            ).fetchone()[0]
+        self.assertEqual(accessed_at, 5)
+
+    def test_instances_sharing_a_file(self):
+        with OrbitCache(self.path, max_entries=3) as first, OrbitCache(
+            self.path, max_entries=3
+        ) as second:
+            first.put_many([("1", "APO"), ("2", "ATE")])
+            second.put_many([("2", "AMO"), ("3", "APO"), ("4", "IEO")])
+
+            self.assertEqual(len(first), 3)
+            self.assertEqual(second.stats()["evictions"], 1)
+            self.assertEqual(first.get("2"), "AMO")
+
+
+if __name__ == "__main__":
+    unittest.main()
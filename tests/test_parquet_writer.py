@@ -0,0 +1,162 @@
+import os
+import tempfile
+import unittest
+from datetime import date
+from unittest.mock import patch
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from neo_data_pipeline.parquet_writer import ParquetWriter
+
+
+class TestParquetWriter(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.test_file = os.path.join(self.temp_dir.name, "test_neo_data.parquet")
+        self.fieldnames = [
+            "Id",
+            "Nome",
+            "Data de Aproximação",
+            "Diâmetro Mínimo (km)",
+            "Diâmetro Máximo (km)",
+            "Velocidade (m/s)",
+            "Distância da Terra (km)",
+            "Categoria Diâmetro",
+            "Categoria Proximidade",
+            "Potencialmente Perigoso",
+            "Tipo de Órbita",
+        ]
+        self.record = {
+            "Id": 1,
+            "Nome": "Test NEO",
+            "Data de Aproximação": "2024-05-01",
+            "Diâmetro Mínimo (km)": 0.1,
+            "Diâmetro Máximo (km)": 0.2,
+            "Velocidade (m/s)": 10000,
+            "Distância da Terra (km)": 1000000,
+            "Categoria Diâmetro": "Médio",
+            "Categoria Proximidade": "Próximo",
+            "Potencialmente Perigoso": False,
+            "Tipo de Órbita": "APO",
+        }
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_save_typed_columns(self):
+        ParquetWriter().save([self.record], self.fieldnames, self.test_file)
+
+        table = pq.read_table(self.test_file)
+        self.assertEqual(table.column_names, self.fieldnames)
+        self.assertEqual(table.schema.field("Data de Aproximação").type, pa.date32())
+        self.assertEqual(table.schema.field("Velocidade (m/s)").type, pa.float64())
+        self.assertEqual(table.schema.field("Potencialmente Perigoso").type, pa.bool_())
+        self.assertTrue(
+            pa.types.is_dictionary(table.schema.field("Categoria Diâmetro").type)
+        )
+        row = table.to_pylist()[0]
+        self.assertEqual(row["Id"], "1")
+        self.assertEqual(row["Data de Aproximação"], date(2024, 5, 1))
+        self.assertEqual(row["Velocidade (m/s)"], 10000.0)
+        self.assertEqual(row["Categoria Diâmetro"], "Médio")
+
+    def test_save_streams_row_groups(self):
+        records = (
+            dict(self.record, Id=i, **{"Tipo de Órbita": None}) for i in range(25)
+        )
+
+        ParquetWriter(row_group_size=10).save(records, self.fieldnames, self.test_file)
+
+        parquet_file = pq.ParquetFile(self.test_file)
+        self.assertEqual(parquet_file.metadata.num_rows, 25)
+        self.assertEqual(parquet_file.metadata.num_row_groups, 3)
+        self.assertIsNone(parquet_file.read().to_pylist()[0]["Tipo de Órbita"])
+
+    def test_save_empty(self):
+        ParquetWriter().save([], self.fieldnames, self.test_file)
+
+        self.assertEqual(pq.read_table(self.test_file).num_rows, 0)
+
+    def test_iter_rows(self):
+        writer = ParquetWriter(row_group_size=2)
+        records = [dict(self.record, Id=neo_id) for neo_id in range(5)]
+        writer.save(records, self.fieldnames, self.test_file)
+
+        rows = writer.iter_rows(self.test_file)
+
+        self.assertNotIsInstance(rows, list)
+        self.assertEqual(list(rows), writer.read(self.test_file))
+
+    def test_upsert(self):
+        writer = ParquetWriter()
+        writer.save([self.record], self.fieldnames, self.test_file)
+        updated = dict(self.record, **{"Tipo de Órbita": "ATE"})
+        added = dict(self.record, Id=2)
+
+        writer.upsert(
+            [updated, added],
+            self.fieldnames,
+            self.test_file,
+            ("Id", "Data de Aproximação"),
+        )
+
+        rows = writer.read(self.test_file)
+        self.assertEqual([row["Id"] for row in rows], ["1", "2"])
+        self.assertEqual(rows[0]["Tipo de Órbita"], "ATE")
+
+    def test_upsert_copies_untouched_batches(self):
+        writer = ParquetWriter(row_group_size=10)
+        writer.save(
+            [dict(self.record, Id=i) for i in range(25)],
+            self.fieldnames,
+            self.test_file,
+        )
+        updated = dict(self.record, Id=12, **{"Tipo de Órbita": "ATE"})
+        added = dict(self.record, Id=30)
+
+        with patch.object(
+            writer, "_record_batch", wraps=writer._record_batch
+        ) as record_batch:
+            writer.upsert(
+                [updated, added],
+                self.fieldnames,
+                self.test_file,
+                ("Id", "Data de Aproximação"),
+            )
+
+        rows = writer.read(self.test_file)
+        self.assertEqual(
+            [row["Id"] for row in rows], [str(i) for i in range(25)] + ["30"]
+        )
+        self.assertEqual(rows[12]["Tipo de Órbita"], "ATE")
+        self.assertEqual(rows[12]["Data de Aproximação"], date(2024, 5, 1))
+        # Only the batch holding Id 12 and the appended records are rebuilt.
+        self.assertEqual(record_batch.call_count, 2)
+
+    def test_upsert_keys_approaches_by_orbiting_body(self):
+        writer = ParquetWriter()
+        fieldnames = self.fieldnames + ["Corpo Orbitado"]
+        key_fields = ("Id", "Data de Aproximação", "Corpo Orbitado")
+        earth = dict(self.record, **{"Corpo Orbitado": "Earth"})
+        writer.save([earth], fieldnames, self.test_file)
+
+        writer.upsert(
+            [
+                dict(earth, **{"Tipo de Órbita": "ATE"}),
+                dict(self.record, **{"Corpo Orbitado": "Mars"}),
+            ],
+            fieldnames,
+            self.test_file,
+            key_fields,
+        )
+
+        rows = writer.read(self.test_file)
+        self.assertEqual(
+            [(row["Corpo Orbitado"], row["Tipo de Órbita"]) for row in rows],
+            [("Earth", "ATE"), ("Mars", "APO")],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,8 @@
+import json
+import os
+import tempfile
 import unittest
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import requests
 
@@ -8,19 +11,21 @@ from neo_data_pipeline.pipeline import DataPipeline
 
 class TestDataPipeline(unittest.TestCase):
 
-    @patch("neo_data_pipeline.pipeline.NasaNeoApiClient")
+    @patch("neo_data_pipeline.api_client.NasaNeoApiClient")
     @patch("neo_data_pipeline.pipeline.Processor")
     @patch("neo_data_pipeline.pipeline.CsvWriter")
     def setUp(self, MockCsvWriter, MockProcessor, MockNasaNeoApiClient):
         self.mock_api_client = MockNasaNeoApiClient.return_value
         self.mock_processor = MockProcessor.return_value
         self.mock_csv_writer = MockCsvWriter.return_value
+        self.mock_csv_writer.extension = ".csv"
+        self.mock_processor.dead_letters = []
 
         self.data_pipeline = DataPipeline(api_key="test-key")
 
     def test_run_success(self):
         mock_neo_data = {"2024-06-01": [{"id": "1", "name": "Test NEO"}]}
-        self.mock_api_client.fetch_neo_data.return_value = mock_neo_data
+        self.mock_api_client.fetch_neo_data_range.return_value = mock_neo_data
 
         mock_processed_data = [
             {
@@ -43,8 +48,8 @@ class TestDataPipeline(unittest.TestCase):
         )
 
         # Assert the API client was called correctly
-        self.mock_api_client.fetch_neo_data.assert_called_once_with(
-            "2024-06-01", "2024-06-02"
+        self.mock_api_client.fetch_neo_data_range.assert_called_once_with(
+            "2024-06-01", "2024-06-02", self.data_pipeline.feed_workers
         )
 
         # Assert the processor was called correctly
@@ -53,15 +58,17 @@ class TestDataPipeline(unittest.TestCase):
         )
 
         # Assert the CSV writer was called correctly
-        self.mock_csv_writer.save_to_csv.assert_called_once_with(
-            mock_processed_data, self.data_pipeline.fieldnames, "test_output.csv"
-        )
+        self.mock_csv_writer.save.assert_called_once()
+        data, fieldnames, filename = self.mock_csv_writer.save.call_args.args
+        self.assertEqual(list(data), mock_processed_data)
+        self.assertEqual(fieldnames, self.data_pipeline.fieldnames)
+        self.assertEqual(filename, "test_output.csv")
 
     @patch("builtins.print")
     def test_run_http_error(self, mock_print):
         # Setup mock to raise HTTPError
-        self.mock_api_client.fetch_neo_data.side_effect = requests.exceptions.HTTPError(
-            "HTTP Error"
+        self.mock_api_client.fetch_neo_data_range.side_effect = (
+            requests.exceptions.HTTPError("HTTP Error")
         )
 
         self.data_pipeline.run("2024-06-01", "2024-06-02")
@@ -73,7 +80,7 @@ class TestDataPipeline(unittest.TestCase):
     @patch("builtins.print")
     def test_run_request_exception(self, mock_print):
         # Setup mock to raise RequestException
-        self.mock_api_client.fetch_neo_data.side_effect = (
+        self.mock_api_client.fetch_neo_data_range.side_effect = (
             requests.exceptions.RequestException("Request Exception")
         )
 
@@ -87,7 +94,7 @@ class TestDataPipeline(unittest.TestCase):
     def test_run_value_error(self, mock_print):
         # Setup mock to raise ValueError
         e = ValueError("Value Error")
-        self.mock_api_client.fetch_neo_data.side_effect = e
+        self.mock_api_client.fetch_neo_data_range.side_effect = e
 
         self.data_pipeline.run("2024-06-01", "2024-06-02")
 
@@ -96,12 +103,492 @@ class TestDataPipeline(unittest.TestCase):
     @patch("builtins.print")
     def test_run_unexpected_exception(self, mock_print):
         # Setup mock to raise a generic exception
-        self.mock_api_client.fetch_neo_data.side_effect = Exception("Unexpected Error")
+        self.mock_api_client.fetch_neo_data_range.side_effect = Exception(
+            "Unexpected Error"
+        )
 
         self.data_pipeline.run("2024-06-01", "2024-06-02")
 
         mock_print.assert_called_with("An unexpected error occurred: Unexpected Error")
 
+    def test_invalid_fetch_mode(self):
+        with self.assertRaises(ValueError):
+            DataPipeline(api_key="test-key", fetch_mode="processes")
+
+    @patch("builtins.print")
+    def test_run_incremental_fetches_missing_dates(self, mock_print):
+        self.mock_api_client.fetch_neo_data_range.return_value = {}
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output = os.path.join(temp_dir, "neo_data.csv")
+            self.data_pipeline.run("2024-06-01", "2024-06-02", output, incremental=True)
+            self.data_pipeline.run("2024-06-01", "2024-06-04", output, incremental=True)
+            self.data_pipeline.run("2024-06-02", "2024-06-03", output, incremental=True)
+
+        self.assertEqual(
+            [c.args[:2] for c in self.mock_api_client.fetch_neo_data_range.mock_calls],
+            [("2024-06-01", "2024-06-02"), ("2024-06-03", "2024-06-04")],
+        )
+        self.assertEqual(self.mock_csv_writer.upsert.call_count, 2)
+        self.mock_csv_writer.save.assert_not_called()
+        mock_print.assert_called_with(f"{output} is already up to date")
+
+    @patch("builtins.print")
+    @patch.object(requests.Session, "get")
+    def test_replay_matches_recorded_run(self, mock_get, mock_print):
+        def respond(url, params, timeout, stream=False, headers=None):
+            response = MagicMock(status_code=200, headers={})
+            if url.endswith("/feed"):
+                response.json.return_value = {
+                    "near_earth_objects": {
+                        "2024-06-01": [{"id": "1", "name": "Test NEO"}],
+                        "2024-06-02": [{"id": "2", "name": "Other NEO"}],
+                    }
+                }
+            else:
+                response.json.return_value = {
+                    "orbital_data": {"orbit_class": {"orbit_class_type": "APO"}}
+                }
+            return response
+
+        mock_get.side_effect = respond
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            snapshot_dir = os.path.join(temp_dir, "snapshots")
+            recorded = os.path.join(temp_dir, "recorded.csv")
+            replayed = os.path.join(temp_dir, "replayed.csv")
+            with DataPipeline("test-key", snapshot_dir=snapshot_dir) as data_pipeline:
+                data_pipeline.run("2024-06-01", "2024-06-02", recorded)
+            mock_get.reset_mock()
+            with DataPipeline(
+                "test-key", snapshot_dir=snapshot_dir, replay=True
+            ) as data_pipeline:
+                data_pipeline.run("2024-06-01", "2024-06-02", replayed)
+
+            mock_get.assert_not_called()
+            with open(recorded, "rb") as f1, open(replayed, "rb") as f2:
+                self.assertEqual(f1.read(), f2.read())
+
+    def test_replay_requires_snapshot_dir(self):
+        with self.assertRaises(ValueError):
+            DataPipeline(api_key="test-key", replay=True)
+
+    def test_invalid_output_format(self):
+        with self.assertRaises(ValueError):
+            DataPipeline(api_key="test-key", output_format="xlsx")
+
+    @patch("builtins.print")
+    @patch("neo_data_pipeline.parquet_writer.ParquetWriter")
+    def test_run_parquet_output(self, MockParquetWriter, mock_print):
+        MockParquetWriter.return_value.extension = ".parquet"
+        data_pipeline = DataPipeline(api_key="test-key", output_format="parquet")
+        data_pipeline.api_client = self.mock_api_client
+        data_pipeline.data_processor = self.mock_processor
+
+        self.mock_processor.process.return_value = [{"Id": "1"}]
+        data_pipeline.run("2024-06-01", "2024-06-02")
+
+        MockParquetWriter.return_value.save.assert_called_once()
+        data, fieldnames, filename = MockParquetWriter.return_value.save.call_args.args
+        self.assertEqual(list(data), [{"Id": "1"}])
+        self.assertEqual(fieldnames, data_pipeline.fieldnames)
+        self.assertEqual(filename, "neo_data.parquet")
+
+    def test_columnar_processor(self):
+        from neo_data_pipeline.columnar_processor import ColumnarProcessor
+
+        data_pipeline = DataPipeline(api_key="test-key", columnar=True)
+
+        self.assertIsInstance(data_pipeline.data_processor, ColumnarProcessor)
+
+    def test_all_approaches_rows_are_keyed_by_orbiting_body(self):
+        default = DataPipeline(api_key="test-key")
+        approaches = DataPipeline(api_key="test-key", all_approaches=True)
+
+        self.assertNotIn("Corpo Orbitado", default.fieldnames)
+        self.assertEqual(default.key_fields, DataPipeline.KEY_FIELDS)
+        self.assertEqual(approaches.fieldnames[-1], "Corpo Orbitado")
+        self.assertEqual(
+            approaches.key_fields, ("Id", "Data de Aproximação", "Corpo Orbitado")
+        )
+
+    def test_columnar_batch_size(self):
+        from neo_data_pipeline.columnar_processor import ColumnarProcessor
+
+        batched = DataPipeline(api_key="test-key", columnar=True)
+        streamed = DataPipeline(
+            api_key="test-key", columnar=True, stream_feed=True, window=16
+        )
+        explicit = DataPipeline(
+            api_key="test-key", columnar=True, stream_feed=True, columnar_batch_size=50
+        )
+
+        self.assertEqual(
+            batched.data_processor.batch_size, ColumnarProcessor.DEFAULT_BATCH_SIZE
+        )
+        self.assertEqual(streamed.data_processor.batch_size, 16)
+        self.assertEqual(explicit.data_processor.batch_size, 50)
+
+    @patch("neo_data_pipeline.async_api_client.AsyncNasaNeoApiClient")
+    @patch("neo_data_pipeline.api_client.NasaNeoApiClient")
+    @patch("neo_data_pipeline.pipeline.Processor")
+    @patch("neo_data_pipeline.pipeline.CsvWriter")
+    def test_run_async_mode(
+        self, MockCsvWriter, MockProcessor, MockNasaNeoApiClient, MockAsyncClient
+    ):
+        MockCsvWriter.return_value.extension = ".csv"
+        MockProcessor.return_value.dead_letters = []
+        data_pipeline = DataPipeline(
+            api_key="test-key", fetch_mode="async", async_concurrency=50
+        )
+        mock_neo_data = {"2024-06-01": [{"id": "1"}]}
+        MockNasaNeoApiClient.return_value.fetch_neo_data_range.return_value = (
+            mock_neo_data
+        )
+
+        data_pipeline.run("2024-06-01", "2024-06-02")
+
+        MockProcessor.return_value.process_async.assert_called_once_with(
+            mock_neo_data, MockAsyncClient.return_value, 50
+        )
+        MockProcessor.return_value.process.assert_not_called()
+
+    @patch("builtins.print")
+    def test_run_returns_metrics(self, mock_print):
+        self.mock_api_client.fetch_neo_data_range.return_value = {"2024-06-01": []}
+        self.mock_processor.process.return_value = [{"Id": "1"}, {"Id": "2"}]
+        self.mock_csv_writer.save.side_effect = lambda data, *args: list(data)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            metrics_path = os.path.join(temp_dir, "metrics.prom")
+            self.data_pipeline.metrics_path = metrics_path
+            self.data_pipeline.metrics_format = "prometheus"
+            metrics = self.data_pipeline.run("2024-06-01", "2024-06-02")
+            with open(metrics_path, encoding="utf-8") as f:
+                exported = f.read()
+
+        self.assertIs(metrics, self.data_pipeline.metrics)
+        self.assertEqual(metrics.counters["rows_written"], 2)
+        self.assertEqual(metrics.counters["succeeded"], 1)
+        self.assertIn("fetch", metrics.stages)
+        self.assertIn("write", metrics.stages)
+        self.assertIn("neo_pipeline_rows_written 2.0", exported)
+
+    @patch("builtins.print")
+    def test_run_failure_metrics(self, mock_print):
+        self.mock_api_client.fetch_neo_data_range.side_effect = ValueError("bad")
+
+        metrics = self.data_pipeline.run("2024-06-01", "2024-06-02")
+
+        self.assertEqual(metrics.counters["succeeded"], 0)
+        self.assertEqual(metrics.counters["rows_written"], 0)
+
+    @patch("builtins.print")
+    def test_stream_feed_matches_decoded_feed(self, mock_print):
+        from neo_data_pipeline.mock_server import MockNasaServer
+
+        with MockNasaServer(
+            neos_per_day=3
+        ) as server, tempfile.TemporaryDirectory() as temp_dir:
+            outputs = []
+            for stream_feed in (False, True):
+                output = os.path.join(temp_dir, f"{stream_feed}.csv")
+                with DataPipeline("test-key", stream_feed=stream_feed) as data_pipeline:
+                    data_pipeline.api_client.base_url = server.base_url
+                    metrics = data_pipeline.run("2024-06-01", "2024-06-09", output)
+                self.assertEqual(metrics.counters["rows_written"], 27)
+                with open(output, "rb") as f:
+                    outputs.append(f.read())
+
+        self.assertEqual(outputs[0], outputs[1])
+
+    @patch("builtins.print")
+    def test_prefetch_orbits_replaces_per_neo_lookups(self, mock_print):
+        from neo_data_pipeline.mock_server import MockNasaServer
+
+        with MockNasaServer(
+            neos_per_day=30, browse_dates=("2024-06-01", "2024-06-02")
+        ) as server, tempfile.TemporaryDirectory() as temp_dir:
+            outputs = []
+            for prefetch_orbits in (False, True):
+                output = os.path.join(temp_dir, f"{prefetch_orbits}.csv")
+                with DataPipeline(
+                    "test-key",
+                    base_url=server.base_url,
+                    prefetch_orbits=prefetch_orbits,
+                ) as data_pipeline:
+                    metrics = data_pipeline.run("2024-06-01", "2024-06-02", output)
+                with open(output, "rb") as f:
+                    outputs.append(f.read())
+
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertEqual(metrics.counters["prefetched_orbits"], 60)
+        self.assertEqual(metrics.counters["requests"], 4)
+
+    @patch("builtins.print")
+    def test_prefetch_orbits_skipped_when_cache_covers_feed(self, mock_print):
+        from neo_data_pipeline.mock_server import MockNasaServer
+
+        with MockNasaServer(
+            neos_per_day=30, browse_dates=("2024-06-01", "2024-06-02")
+        ) as server, tempfile.TemporaryDirectory() as temp_dir:
+            orbit_cache_path = os.path.join(temp_dir, "orbit_cache.sqlite3")
+            for start_date in ("2024-06-01", "2024-06-02"):
+                with DataPipeline(
+                    "test-key",
+                    base_url=server.base_url,
+                    prefetch_orbits=True,
+                    orbit_cache_path=orbit_cache_path,
+                ) as data_pipeline:
+                    metrics = data_pipeline.run(
+                        start_date,
+                        "2024-06-02",
+                        os.path.join(temp_dir, f"{start_date}.csv"),
+                    )
+
+        # The first walk cached both days, so the second run only fetches its feed.
+        self.assertEqual(metrics.counters["prefetched_orbits"], 0)
+        self.assertEqual(metrics.counters["requests"], 1)
+
+    @patch("builtins.print")
+    def test_prefetch_stops_once_feed_is_indexed(self, mock_print):
+        from neo_data_pipeline.mock_server import MockNasaServer
+
+        with MockNasaServer(
+            neos_per_day=2, browse_dates=("2024-06-01", "2024-06-30")
+        ) as server, tempfile.TemporaryDirectory() as temp_dir:
+            with DataPipeline(
+                "test-key", base_url=server.base_url, prefetch_orbits=True
+            ) as data_pipeline:
+                self.assertEqual(data_pipeline.prefetch_pages, None)
+                metrics = data_pipeline.run(
+                    "2024-06-01", "2024-06-01", os.path.join(temp_dir, "neo.csv")
+                )
+
+        # Both NEOs of the feed are on the first catalog page, so the walk stops there.
+        self.assertEqual(metrics.counters["prefetched_orbits"], 20)
+        self.assertEqual(metrics.counters["requests"], 2)
+
+    @patch("builtins.print")
+    def test_prefetch_pages_bounded_by_uncovered_neos(self, mock_print):
+        from neo_data_pipeline.mock_server import MockNasaServer
+
+        with MockNasaServer(
+            neos_per_day=2, browse_dates=("2024-06-01", "2024-06-30")
+        ) as server, tempfile.TemporaryDirectory() as temp_dir:
+            with DataPipeline(
+                "test-key", base_url=server.base_url, prefetch_orbits=True
+            ) as data_pipeline:
+                metrics = data_pipeline.run(
+                    "2024-06-30", "2024-06-30", os.path.join(temp_dir, "neo.csv")
+                )
+
+        # Two NEOs on the last catalog page walk two of the three pages and
+        # are then looked up one by one.
+        self.assertEqual(metrics.counters["prefetched_orbits"], 40)
+        self.assertEqual(metrics.counters["requests"], 5)
+
+    @patch("builtins.print")
+    def test_http_cache_revalidates_responses(self, mock_print):
+        from neo_data_pipeline.mock_server import MockNasaServer
+
+        with MockNasaServer(
+            neos_per_day=3
+        ) as server, tempfile.TemporaryDirectory() as temp_dir:
+            outputs = []
+            for run in range(2):
+                output = os.path.join(temp_dir, f"{run}.csv")
+                with DataPipeline(
+                    "test-key",
+                    base_url=server.base_url,
+                    http_cache_path=os.path.join(temp_dir, "http_cache.sqlite3"),
+                    http_cache_max_age=0,
+                ) as data_pipeline:
+                    metrics = data_pipeline.run("2024-06-01", "2024-06-02", output)
+                with open(output, "rb") as f:
+                    outputs.append(f.read())
+
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertEqual(server.request_counts[304], 7)
+        self.assertEqual(metrics.counters["http_cache_revalidations"], 7)
+        self.assertGreater(metrics.counters["http_cache_bytes_saved"], 0)
+
+    @patch("builtins.print")
+    def test_sqlite_output_accumulates_incremental_runs(self, mock_print):
+        from neo_data_pipeline.mock_server import MockNasaServer
+        from neo_data_pipeline.neo_store import NeoStore
+
+        with MockNasaServer(
+            neos_per_day=3
+        ) as server, tempfile.TemporaryDirectory() as temp_dir:
+            output = os.path.join(temp_dir, "neo_data.sqlite3")
+            with DataPipeline(
+                "test-key", base_url=server.base_url, output_format="sqlite"
+            ) as data_pipeline:
+                data_pipeline.run("2024-06-01", "2024-06-02", output, incremental=True)
+                data_pipeline.run("2024-06-02", "2024-06-04", output, incremental=True)
+
+            with NeoStore(output) as store:
+                self.assertEqual(len(store), 12)
+                self.assertEqual(store.count(start_date="2024-06-03"), 6)
+
+    @patch("builtins.print")
+    def test_failed_lookups_are_pending_until_repaired(self, mock_print):
+        from neo_data_pipeline.mock_server import MockNasaServer
+
+        with MockNasaServer(
+            neos_per_day=3
+        ) as server, tempfile.TemporaryDirectory() as temp_dir:
+            expected = os.path.join(temp_dir, "expected.csv")
+            output = os.path.join(temp_dir, "neo_data.csv")
+            with DataPipeline("test-key", base_url=server.base_url) as data_pipeline:
+                data_pipeline.run("2024-06-01", "2024-06-02", expected)
+                fetch_neo_orbit_type = data_pipeline.api_client.fetch_neo_orbit_type
+                failing = {"2217114", "2217118"}
+
+                def flaky_fetch(neo_id):
+                    if neo_id in failing:
+                        raise requests.exceptions.ConnectionError("reset")
+                    return fetch_neo_orbit_type(neo_id)
+
+                data_pipeline.api_client.fetch_neo_orbit_type = flaky_fetch
+                metrics = data_pipeline.run("2024-06-01", "2024-06-02", output)
+
+                self.assertEqual(metrics.counters["succeeded"], 1)
+                self.assertEqual(metrics.counters["rows_written"], 6)
+                self.assertEqual(metrics.counters["failed_lookups"], 2)
+                rows = data_pipeline.writer.read(output)
+                self.assertEqual(
+                    {row["Id"] for row in rows if row["Tipo de Órbita"] == "PENDENTE"},
+                    failing,
+                )
+
+                failing.discard("2217114")
+                self.assertEqual(
+                    data_pipeline.repair(output), {"repaired": 1, "failed": 1}
+                )
+                self.assertTrue(os.path.exists(output + ".failed.json"))
+                failing.clear()
+                self.assertEqual(
+                    data_pipeline.repair(output), {"repaired": 1, "failed": 0}
+                )
+
+            self.assertFalse(os.path.exists(output + ".failed.json"))
+            with open(expected, "rb") as f, open(output, "rb") as g:
+                self.assertEqual(f.read(), g.read())
+
+    @patch("builtins.print")
+    def test_run_writes_summary(self, mock_print):
+        from neo_data_pipeline.mock_server import MockNasaServer
+
+        with MockNasaServer(
+            neos_per_day=5
+        ) as server, tempfile.TemporaryDirectory() as temp_dir:
+            output = os.path.join(temp_dir, "neo_data.csv")
+            with DataPipeline(
+                "test-key", base_url=server.base_url, summary_top_n=3
+            ) as data_pipeline:
+                data_pipeline.run("2024-06-01", "2024-06-02", output)
+                rows = data_pipeline.writer.read(output)
+            with open(output + ".summary.json", encoding="utf-8") as f:
+                summary = json.load(f)
+
+        distances = sorted(float(row["Distância da Terra (km)"]) for row in rows)
+        self.assertEqual(summary["rows"], 10)
+        self.assertEqual(sum(summary["diameter_categories"].values()), 10)
+        self.assertEqual(
+            [row["Distância da Terra (km)"] for row in summary["closest"]],
+            distances[:3],
+        )
+
+    @patch("builtins.print")
+    def test_incremental_summary_covers_whole_output(self, mock_print):
+        from neo_data_pipeline.mock_server import MockNasaServer
+
+        with MockNasaServer(
+            neos_per_day=5
+        ) as server, tempfile.TemporaryDirectory() as temp_dir:
+            output = os.path.join(temp_dir, "neo_data.csv")
+            with DataPipeline(
+                "test-key", base_url=server.base_url, summary_top_n=3
+            ) as data_pipeline:
+                data_pipeline.run("2024-06-01", "2024-06-02", output, incremental=True)
+                data_pipeline.run("2024-06-01", "2024-06-04", output, incremental=True)
+                rows = data_pipeline.writer.read(output)
+            with open(output + ".summary.json", encoding="utf-8") as f:
+                summary = json.load(f)
+
+        distances = sorted(float(row["Distância da Terra (km)"]) for row in rows)
+        self.assertEqual(summary["rows"], 20)
+        self.assertEqual(
+            [row["Distância da Terra (km)"] for row in summary["closest"]],
+            distances[:3],
+        )
+        self.assertEqual(sum(window["rows"] for window in summary["windows"]), 20)
+
+    @patch("builtins.print")
+    def test_catalog_writes_one_row_per_approach(self, mock_print):
+        from neo_data_pipeline.mock_server import MockNasaServer
+
+        with MockNasaServer(
+            neos_per_day=3, browse_dates=("2024-06-01", "2024-06-02")
+        ) as server, tempfile.TemporaryDirectory() as temp_dir:
+            output = os.path.join(temp_dir, "neo_data.csv")
+            with DataPipeline(
+                "test-key", base_url=server.base_url, all_approaches=True, catalog=True
+            ) as data_pipeline:
+                metrics = data_pipeline.run("2024-06-01", "2024-06-02", output)
+                self.assertEqual(metrics.counters["rows_written"], 6)
+                self.assertEqual(metrics.counters["requests"], 1)
+
+                metrics = data_pipeline.run("2024-06-01", "2025-12-31", output)
+                rows = data_pipeline.writer.read(output)
+
+        self.assertEqual(metrics.counters["rows_written"], 12)
+        self.assertEqual(
+            len({(row["Id"], row["Data de Aproximação"]) for row in rows}), 12
+        )
+        self.assertNotIn("None", {row["Tipo de Órbita"] for row in rows})
+
+    def test_catalog_requires_all_approaches(self):
+        with self.assertRaises(ValueError):
+            DataPipeline(api_key="test-key", catalog=True)
+
+    @patch("builtins.print")
+    def test_auto_workers_record_concurrency_decisions(self, mock_print):
+        from neo_data_pipeline.mock_server import MockNasaServer
+
+        with MockNasaServer(
+            neos_per_day=20
+        ) as server, tempfile.TemporaryDirectory() as temp_dir:
+            output = os.path.join(temp_dir, "neo_data.csv")
+            with DataPipeline(
+                "test-key", base_url=server.base_url, max_workers="auto"
+            ) as data_pipeline:
+                metrics = data_pipeline.run("2024-06-01", "2024-06-02", output)
+                limiter = data_pipeline.concurrency_limiter
+
+        self.assertEqual(metrics.counters["rows_written"], 40)
+        self.assertEqual(data_pipeline.data_processor.max_workers, limiter.max_limit)
+        self.assertEqual(metrics.counters["concurrency_limit"], limiter.limit)
+        for name in (
+            "concurrency_lowest",
+            "concurrency_highest",
+            "concurrency_increases",
+            "concurrency_latency_decreases",
+            "concurrency_pushback_decreases",
+        ):
+            self.assertIn(name, metrics.counters)
+
+    def test_invalid_max_workers(self):
+        for max_workers in (0, "many"):
+            with self.assertRaises(ValueError):
+                DataPipeline(api_key="test-key", max_workers=max_workers)
+
+    def test_invalid_metrics_format(self):
+        with self.assertRaises(ValueError):
+            DataPipeline(api_key="test-key", metrics_format="xml")
+
 
 if __name__ == "__main__":
     unittest.main()
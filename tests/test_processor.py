@@ -1,3 +1,5 @@
+import asyncio
+import threading
 import unittest
 from concurrent.futures import Future
 from unittest.mock import MagicMock
@@ -75,6 +77,166 @@ class TestNeoDataProcessor(unittest.TestCase):
         self.assertTrue(result["Potencialmente Perigoso"])
         self.assertEqual(result["Tipo de Órbita"], "Orbit Type")
 
+    def test_process_deduplicates_orbit_lookups(self):
+        mock_api_client = MagicMock()
+        mock_api_client.fetch_neo_orbit_type.return_value = "APO"
+
+        neo_data = {
+            "2024-06-01": [{"id": "1", "name": "Test NEO"}],
+            "2024-06-02": [{"id": "1", "name": "Test NEO"}, {"id": "2"}],
+        }
+
+        results = list(self.processor.process(neo_data, mock_api_client))
+
+        self.assertEqual(len(results), 3)
+        self.assertEqual([result["Id"] for result in results], ["1", "1", "2"])
+        self.assertEqual(mock_api_client.fetch_neo_orbit_type.call_count, 2)
+        self.assertEqual(self.processor.saved_requests, 1)
+        self.assertEqual(self.processor.lookups, 2)
+        self.assertEqual(self.processor.max_queue_depth, 3)
+
+    def test_process_bounds_submission_window(self):
+        submitted = []
+        yielded = []
+
+        def fetch_neo_orbit_type(neo_id):
+            submitted.append(neo_id)
+            self.assertLessEqual(len(submitted) - len(yielded), 2)
+            return "APO"
+
+        mock_api_client = MagicMock()
+        mock_api_client.fetch_neo_orbit_type.side_effect = fetch_neo_orbit_type
+        neo_data = {"2024-06-01": [{"id": str(i)} for i in range(10)]}
+        processor = Processor(max_workers=2, window=2)
+
+        for result in processor.process(neo_data, mock_api_client):
+            yielded.append(result["Id"])
+
+        self.assertEqual(yielded, [str(i) for i in range(10)])
+
+    def test_process_isolates_failed_lookups(self):
+        def fetch_neo_orbit_type(neo_id):
+            if neo_id == "2":
+                raise ValueError("bad payload")
+            return "APO"
+
+        mock_api_client = MagicMock()
+        mock_api_client.fetch_neo_orbit_type.side_effect = fetch_neo_orbit_type
+        neo_data = {"2024-06-01": [{"id": "1"}, {"id": "2"}, {"id": "2"}]}
+
+        results = list(self.processor.process(neo_data, mock_api_client))
+
+        self.assertEqual(
+            [result["Tipo de Órbita"] for result in results],
+            ["APO", Processor.PENDING_ORBIT, Processor.PENDING_ORBIT],
+        )
+        self.assertEqual(
+            self.processor.dead_letters,
+            [{"id": "2", "error": "ValueError: bad payload"}],
+        )
+
+    def test_process_async_isolates_failed_lookups(self):
+        class FlakyClient:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *args):
+                pass
+
+            async def fetch_neo_orbit_type(self, neo_id):
+                if neo_id == "2":
+                    raise ValueError("bad payload")
+                return "APO"
+
+        neo_data = {"2024-06-01": [{"id": "1"}, {"id": "2"}]}
+
+        results = list(self.processor.process_async(neo_data, FlakyClient()))
+
+        self.assertEqual(
+            [result["Tipo de Órbita"] for result in results],
+            ["APO", Processor.PENDING_ORBIT],
+        )
+        self.assertEqual(len(self.processor.dead_letters), 1)
+
+    def test_process_async_consumes_feed_incrementally(self):
+        consumed = []
+
+        class Client:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *args):
+                pass
+
+            async def fetch_neo_orbit_type(self, neo_id):
+                return "APO"
+
+        def stream():
+            for i in range(1000):
+                consumed.append(i)
+                yield "2024-06-01", {"id": str(i)}
+
+        processor = Processor(window=8)
+        records = processor.process_async(stream(), Client(), concurrency=4)
+        self.assertEqual(next(records)["Id"], "0")
+        self.assertLessEqual(len(consumed), 9)
+        records.close()
+
+        self.assertLess(len(consumed), 1000)
+        self.assertLessEqual(processor.max_queue_depth, 8)
+
+    def test_process_async_limits_lookups_in_flight(self):
+        in_flight = 0
+        peak = 0
+
+        class Client:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *args):
+                pass
+
+            async def fetch_neo_orbit_type(self, neo_id):
+                nonlocal in_flight, peak
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.001)
+                in_flight -= 1
+                return "APO"
+
+        neo_data = {"2024-06-01": [{"id": str(i)} for i in range(50)]}
+        processor = Processor(window=20, ordered=False)
+
+        results = list(processor.process_async(neo_data, Client(), concurrency=3))
+
+        self.assertEqual(len(results), 50)
+        self.assertLessEqual(peak, 3)
+        self.assertEqual(processor.lookups, 50)
+
+    def test_process_unordered_yields_in_completion_order(self):
+        release_slow = threading.Event()
+
+        def fetch_neo_orbit_type(neo_id):
+            if neo_id == "slow":
+                release_slow.wait(timeout=5)
+            return neo_id
+
+        mock_api_client = MagicMock()
+        mock_api_client.fetch_neo_orbit_type.side_effect = fetch_neo_orbit_type
+        neo_data = {"2024-06-01": [{"id": "slow"}, {"id": "fast"}, {"id": "fast"}]}
+        processor = Processor(max_workers=2, ordered=False)
+
+        results = processor.process(neo_data, mock_api_client)
+        first = next(results)
+        second = next(results)
+        release_slow.set()
+        rest = list(results)
+
+        self.assertEqual(first["Id"], "fast")
+        self.assertEqual(second["Id"], "fast")
+        self.assertEqual([result["Id"] for result in rest], ["slow"])
+        self.assertEqual(processor.saved_requests, 1)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,133 @@
+import multiprocessing
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from unittest.mock import patch
+
+from neo_data_pipeline.rate_limiter import RateLimiter, RetryPolicy, SharedRateLimiter
+
+_shared_limiter = None
+
+
+def _init_limiter(limiter):
+    global _shared_limiter
+    _shared_limiter = limiter
+
+
+def _reserve_tokens(count):
+    return [_shared_limiter.reserve() for _ in range(count)]
+
+
+class TestRateLimiter(unittest.TestCase):
+    @patch("neo_data_pipeline.rate_limiter.time.monotonic", return_value=100.0)
+    def test_reserve_within_capacity(self, mock_monotonic):
+        limiter = RateLimiter(rate=1, capacity=2)
+
+        self.assertEqual(limiter.reserve(), 0)
+        self.assertEqual(limiter.reserve(), 0)
+        self.assertEqual(limiter.metrics()["throttled_requests"], 0)
+
+    @patch("neo_data_pipeline.rate_limiter.time.monotonic", return_value=100.0)
+    def test_reserve_waits_when_empty(self, mock_monotonic):
+        limiter = RateLimiter(rate=2, capacity=1)
+
+        limiter.reserve()
+        self.assertAlmostEqual(limiter.reserve(), 0.5)
+        self.assertAlmostEqual(limiter.reserve(), 1.0)
+        self.assertAlmostEqual(limiter.metrics()["throttled_seconds"], 1.5)
+        self.assertEqual(limiter.metrics()["throttled_requests"], 2)
+
+    @patch("neo_data_pipeline.rate_limiter.time.monotonic")
+    def test_bucket_refills(self, mock_monotonic):
+        mock_monotonic.return_value = 100.0
+        limiter = RateLimiter(rate=1, capacity=1)
+        limiter.reserve()
+
+        mock_monotonic.return_value = 101.0
+        self.assertEqual(limiter.reserve(), 0)
+
+    @patch("neo_data_pipeline.rate_limiter.time.monotonic", return_value=100.0)
+    def test_update_from_headers(self, mock_monotonic):
+        limiter = RateLimiter(rate=1, capacity=10)
+
+        limiter.update_from_headers({"X-RateLimit-Remaining": "0"})
+
+        self.assertEqual(limiter.metrics()["remaining"], 0)
+        self.assertAlmostEqual(limiter.reserve(), 1.0)
+
+    @patch("neo_data_pipeline.rate_limiter.time.monotonic", return_value=100.0)
+    def test_update_from_headers_ignores_invalid_values(self, mock_monotonic):
+        limiter = RateLimiter(rate=1, capacity=10)
+
+        limiter.update_from_headers({"X-RateLimit-Remaining": "unknown"})
+        limiter.update_from_headers({})
+
+        self.assertIsNone(limiter.metrics()["remaining"])
+
+    @patch("neo_data_pipeline.rate_limiter.time.monotonic", return_value=100.0)
+    def test_pause(self, mock_monotonic):
+        limiter = RateLimiter(rate=1, capacity=10)
+
+        limiter.pause(30)
+
+        self.assertAlmostEqual(limiter.reserve(), 30)
+
+
+class TestSharedRateLimiter(unittest.TestCase):
+    def test_budget_is_shared_across_processes(self):
+        context = multiprocessing.get_context("spawn")
+        limiter = SharedRateLimiter(rate=0.01, capacity=4, context=context)
+
+        with ProcessPoolExecutor(
+            max_workers=2,
+            mp_context=context,
+            initializer=_init_limiter,
+            initargs=(limiter,),
+        ) as executor:
+            waits = [
+                wait
+                for waits in executor.map(_reserve_tokens, [3, 3])
+                for wait in waits
+            ]
+
+        self.assertEqual(sum(wait == 0 for wait in waits), 4)
+        self.assertLess(limiter._tokens, 0)
+
+    @patch("neo_data_pipeline.rate_limiter.time.monotonic", return_value=0.0)
+    def test_pause(self, mock_monotonic):
+        limiter = SharedRateLimiter(rate=None)
+
+        limiter.pause(5)
+
+        self.assertEqual(limiter.reserve(), 5)
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_should_retry(self):
+        policy = RetryPolicy(max_retries=2)
+
+        self.assertTrue(policy.should_retry(429, 0))
+        self.assertTrue(policy.should_retry(503, 1))
+        self.assertTrue(policy.should_retry(None, 0))
+        self.assertFalse(policy.should_retry(404, 0))
+        self.assertFalse(policy.should_retry(200, 0))
+        self.assertFalse(policy.should_retry(503, 2))
+
+    def test_backoff_is_bounded(self):
+        policy = RetryPolicy(backoff_factor=1, max_backoff=5)
+
+        for attempt in range(10):
+            delay = policy.backoff(attempt)
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, min(5, 2**attempt))
+
+    def test_parse_retry_after(self):
+        self.assertEqual(RetryPolicy.parse_retry_after("12"), 12)
+        self.assertEqual(
+            RetryPolicy.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0
+        )
+        self.assertIsNone(RetryPolicy.parse_retry_after("soon"))
+        self.assertIsNone(RetryPolicy.parse_retry_after(None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import pickle
+import unittest
+
+from neo_data_pipeline.record import NeoRecord
+
+
+class TestNeoRecord(unittest.TestCase):
+
+    def setUp(self):
+        self.record = NeoRecord(
+            "1",
+            "Test NEO",
+            "2024-06-01",
+            0.1,
+            0.2,
+            10.0,
+            500000.0,
+            "Médio",
+            "Muito Próximo",
+            False,
+            "APO",
+        )
+
+    def test_access_by_header_attribute_and_position(self):
+        self.assertEqual(self.record["Tipo de Órbita"], "APO")
+        self.assertEqual(self.record.orbit_type, "APO")
+        self.assertEqual(self.record[0], "1")
+        self.assertEqual(self.record[:2], ("1", "Test NEO"))
+        with self.assertRaises(KeyError):
+            self.record["Unknown"]
+
+    def test_get(self):
+        self.assertEqual(self.record.get("Nome"), "Test NEO")
+        self.assertEqual(self.record.get("Unknown", "-"), "-")
+
+    def test_dict_round_trip(self):
+        as_dict = self.record.to_dict()
+
+        self.assertEqual(list(as_dict), list(NeoRecord.HEADERS))
+        self.assertEqual(NeoRecord.from_dict(as_dict), self.record)
+        self.assertEqual(NeoRecord.from_dict({"Id": "2"}).name, None)
+
+    def test_has_no_instance_dict(self):
+        self.assertFalse(hasattr(self.record, "__dict__"))
+
+    def test_pickle(self):
+        restored = pickle.loads(pickle.dumps(self.record))
+
+        self.assertIsInstance(restored, NeoRecord)
+        self.assertEqual(restored, self.record)
+
+
+if __name__ == "__main__":
+    unittest.main()
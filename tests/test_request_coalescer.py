@@ -0,0 +1,26 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+from neo_data_pipeline.request_coalescer import RequestCoalescer
+
+
+class TestRequestCoalescer(unittest.TestCase):
+    def test_submit_shares_future_per_key(self):
+        fn = MagicMock(side_effect=lambda neo_id: f"orbit-{neo_id}")
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            coalescer = RequestCoalescer(executor)
+            first = coalescer.submit("1", fn, "1")
+            second = coalescer.submit("1", fn, "1")
+            other = coalescer.submit("2", fn, "2")
+
+        self.assertIs(first, second)
+        self.assertEqual(first.result(), "orbit-1")
+        self.assertEqual(other.result(), "orbit-2")
+        self.assertEqual(fn.call_count, 2)
+        self.assertEqual(coalescer.saved_requests, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
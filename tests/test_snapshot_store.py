@@ -0,0 +1,109 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from neo_data_pipeline.api_client import NasaNeoApiClient
+from neo_data_pipeline.snapshot_store import ReplayApiClient, SnapshotStore
+
+
+class TestSnapshotStore(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store = SnapshotStore(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def count_objects(self):
+        return sum(
+            len(files)
+            for _, _, files in os.walk(os.path.join(self.temp_dir.name, "objects"))
+        )
+
+    def test_put_and_get(self):
+        payload = {
+            "id": "1",
+            "orbital_data": {"orbit_class": {"orbit_class_type": "APO"}},
+        }
+
+        self.store.put("neo/1", payload)
+
+        self.assertIn("neo/1", self.store)
+        self.assertEqual(self.store.get("neo/1"), payload)
+
+    def test_identical_payloads_are_stored_once(self):
+        first = self.store.put("feed/2024-06-01", [{"id": "1", "name": "a"}])
+        second = self.store.put("feed/2024-06-02", [{"name": "a", "id": "1"}])
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.count_objects(), 1)
+
+    def test_get_missing_key(self):
+        with self.assertRaises(KeyError):
+            self.store.get("neo/404")
+
+    def test_flush_persists_index(self):
+        self.store.put("feed/2024-06-01", [])
+        self.store.put("neo/1", {})
+        self.store.flush()
+
+        reloaded = SnapshotStore(self.temp_dir.name)
+        self.assertEqual(reloaded.keys("feed/"), ["feed/2024-06-01"])
+        self.assertEqual(reloaded.get("feed/2024-06-01"), [])
+
+
+class TestReplayApiClient(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store = SnapshotStore(self.temp_dir.name)
+        self.store.put("feed/2024-06-01", [{"id": "1"}])
+        self.store.put("feed/2024-06-02", [])
+        self.store.put(
+            "neo/1", {"orbital_data": {"orbit_class": {"orbit_class_type": "APO"}}}
+        )
+        self.client = ReplayApiClient(self.store)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_fetch_neo_data_range(self):
+        self.assertEqual(
+            self.client.fetch_neo_data_range("2024-06-01", "2024-06-02"),
+            {"2024-06-01": [{"id": "1"}], "2024-06-02": []},
+        )
+
+    def test_fetch_neo_data_missing_date(self):
+        with self.assertRaises(ValueError):
+            self.client.fetch_neo_data("2024-06-01", "2024-06-03")
+
+    def test_fetch_neo_orbit_type(self):
+        self.assertEqual(self.client.fetch_neo_orbit_type("1"), "APO")
+        with self.assertRaises(ValueError):
+            self.client.fetch_neo_orbit_type("2")
+
+    def test_fetch_neo_orbit_type_from_index(self):
+        self.client.orbit_index["2"] = "ATE"
+
+        self.assertEqual(self.client.fetch_neo_orbit_type(2), "ATE")
+
+    def test_replays_orbit_types_resolved_without_a_request(self):
+        orbit_cache = MagicMock()
+        orbit_cache.get.return_value = "AMO"
+        recorder = NasaNeoApiClient(
+            "test_key", orbit_cache=orbit_cache, snapshot_store=self.store
+        )
+        recorder.orbit_index["3"] = "ATE"
+
+        self.assertEqual(recorder.fetch_neo_orbit_type("3"), "ATE")
+        self.assertEqual(recorder.fetch_neo_orbit_type("4"), "AMO")
+        self.assertEqual(recorder.fetch_neo_orbit_type("1"), "AMO")
+
+        self.assertEqual(self.client.fetch_neo_orbit_type("3"), "ATE")
+        self.assertEqual(self.client.fetch_neo_orbit_type("4"), "AMO")
+        # The recorded lookup response is kept.
+        self.assertEqual(self.client.fetch_neo_orbit_type("1"), "APO")
+
+
+if __name__ == "__main__":
+    unittest.main()